@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: sanitize_text vs the original per-character version.
+
+Run from the repository root:
+    PYTHONPATH=core python benchmarks/bench_sanitize.py
+"""
+
+import timeit
+import unicodedata
+
+from aim_utils import MAX_INPUT_CHARS, sanitize_text
+
+
+def reference_sanitize(text: str) -> str:
+    """The original character-by-character sanitize_text."""
+    t = unicodedata.normalize("NFC", text)
+    cleaned = []
+    for ch in t:
+        if ch.isprintable() or ch in ("\n", "\t", " "):
+            cleaned.append(ch)
+    return "".join(cleaned)[:MAX_INPUT_CHARS]
+
+
+CASES = {
+    "ascii short": "I am thinking about a plan for tomorrow",
+    "ascii 4000": "x" * 4000,
+    "ascii controls": "hello\x01 world\x07 " * 200,
+    "ascii 4 MB paste": "lorem ipsum " * 350_000,
+    "unicode short": "héllo wörld ✓ " * 20,
+    "unicode NFD": "héllo " * 40,
+    "unicode 4 MB paste": "héllo wörld ✓ " * 300_000,
+}
+
+
+def main() -> None:
+    print(f"{'case':<20}{'original':>14}{'fast':>14}{'speedup':>10}")
+    for name, text in CASES.items():
+        assert sanitize_text(text) == reference_sanitize(text)
+        number = 5 if len(text) > 100_000 else 2000
+        old = min(timeit.repeat(lambda: reference_sanitize(text), number=number, repeat=3))
+        new = min(timeit.repeat(lambda: sanitize_text(text), number=number, repeat=3))
+        old_us, new_us = old / number * 1e6, new / number * 1e6
+        print(f"{name:<20}{old_us:>12.1f}us{new_us:>12.1f}us{old_us / new_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
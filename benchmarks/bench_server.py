@@ -0,0 +1,127 @@
+"""
+Load test for aim_server: many concurrent clients, one request at a time each.
+
+Starts a server in-process on a temporary directory unless --host/--port
+or --unix point at a running one. Reports requests/sec and latency
+percentiles for the "turn" requests.
+
+Run from the repository root:
+    PYTHONPATH=core python benchmarks/bench_server.py --clients 200 --turns 20
+    PYTHONPATH=core python benchmarks/bench_server.py --port 8765 --clients 500
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from aim_server import AimServer
+
+MESSAGES = [
+    "I have a plan for tomorrow",
+    "feeling a bit tired today",
+    "new idea for the project?",
+    "just a note about the lane",
+    "what should I do next?",
+]
+
+
+async def run_client(i: int, turns: int, connect, latencies: List[float]) -> int:
+    reader, writer = await connect()
+    errors = 0
+
+    async def call(req: dict) -> dict:
+        writer.write((json.dumps(req) + "\n").encode("utf-8"))
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    await call({"op": "hello", "client": f"load-{i}"})
+    for t in range(turns):
+        start = time.perf_counter()
+        resp = await call({"op": "turn", "text": MESSAGES[(i + t) % len(MESSAGES)]})
+        latencies.append(time.perf_counter() - start)
+        errors += not resp.get("ok")
+    await call({"op": "quit"})
+    writer.close()
+    return errors
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.999999) - 1))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server: Optional[AimServer] = None
+    tmp = None
+    host, port, unix_path = args.host, args.port, args.unix
+    if not (args.port or args.unix):
+        tmp = tempfile.TemporaryDirectory()
+        server = AimServer(tmp.name, {"storage": args.storage, "max_sessions": 50})
+        listener = await server.start("127.0.0.1", 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+
+    if unix_path:
+        def connect():
+            return asyncio.open_unix_connection(unix_path)
+    else:
+        def connect():
+            return asyncio.open_connection(host, port)
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(run_client(i, args.turns, connect, latencies) for i in range(args.clients))
+    )
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+        tmp.cleanup()
+
+    ordered = sorted(latencies)
+    return {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1e3, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1e3, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1e3, 2),
+        "max_ms": round(ordered[-1] * 1e3, 2) if ordered else 0.0,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Load test for the SSM-AIM Mini server")
+    p.add_argument("--clients", type=int, default=200, help="concurrent connections")
+    p.add_argument("--turns", type=int, default=20, help="turn requests per client")
+    p.add_argument("--host", default="127.0.0.1", help="server host (with --port)")
+    p.add_argument("--port", type=int, default=0, help="target a running server on this port")
+    p.add_argument("--unix", metavar="PATH", help="target a running server on a Unix socket")
+    p.add_argument("--storage", choices=("json", "journal"), default="journal",
+                   help="storage mode of the in-process server (default: journal)")
+    p.add_argument("--json", action="store_true", help="print the result as JSON")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['clients']} clients | {result['requests']} requests | "
+              f"{result['errors']} errors | {result['elapsed_s']}s")
+        print(f"{result['requests_per_s']} req/s | p50 {result['p50_ms']} ms | "
+              f"p95 {result['p95_ms']} ms | p99 {result['p99_ms']} ms | max {result['max_ms']} ms")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Benchmark suite: per-turn pipeline and storage paths.
+
+Times each step of a console turn across input lengths
+(sanitize_text, compute_alignment_simple, generate_reply) and each
+storage path across history sizes (append_session_entry, save_memory,
+load_memory, load_memory_lazy, file_sha256). Standard library only.
+
+Run from the repository root:
+    PYTHONPATH=core python benchmarks/bench_turn.py --out bench.json
+    PYTHONPATH=core python benchmarks/bench_turn.py --compare bench.json
+
+--compare exits with status 1 if any case is slower than the baseline
+by more than --threshold (default 20%). Baselines are machine specific,
+so compare only runs made on the same machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from typing import Callable, Dict, List
+
+from aim_utils import (
+    append_session_entry,
+    compute_alignment_simple,
+    file_sha256,
+    load_memory,
+    sanitize_text,
+    save_memory,
+)
+from aim_lazy import load_memory_lazy
+from aim_core import generate_reply
+
+DEFAULT_SIZES = [50, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_LENGTHS = [1, 80, 1_000, 4_000]
+QUICK_SIZES = [50, 1_000]
+QUICK_LENGTHS = [1, 80, 4_000]
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MIN_DELTA_US = 1.0  # smaller absolute changes are timer noise
+
+TEXT_SEED = "I have a plan for tomorrow, maybe an idea. Stress ü ✓ note? "
+
+
+def sample_text(length: int) -> str:
+    """Deterministic text of the given length (mixed ASCII + Unicode)."""
+    reps = length // len(TEXT_SEED) + 1
+    return (TEXT_SEED * reps)[:length]
+
+
+def build_memory(size: int) -> dict:
+    """A hash-chained memory with size entries."""
+    memory = {"sessions": [], "last_hash": ""}
+    for i in range(size):
+        append_session_entry(
+            memory, f"message {i} about a plan", f"reply {i % 9}",
+            ((i * 37) % 200 - 100) / 100.0, "2025-01-01T00:00:00Z", 0,
+        )
+    return memory
+
+
+def measure(fn: Callable[[], object], repeat: int, budget: float = 0.05) -> dict:
+    """
+    Best-of-repeat time per call in microseconds. The loop count is
+    picked so one repetition takes about budget seconds.
+    """
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    number = max(1, int(budget / once)) if once > 0 else 1000
+    times = timeit.repeat(fn, number=number, repeat=repeat)
+    return {"us": round(min(times) / number * 1e6, 3), "number": number}
+
+
+def run_turn_cases(lengths: List[int], repeat: int) -> Dict[str, dict]:
+    results = {}
+    for length in lengths:
+        text = sample_text(length)
+        clean = sanitize_text(text)
+        results[f"sanitize_text[len={length}]"] = measure(lambda: sanitize_text(text), repeat)
+        results[f"compute_alignment_simple[len={length}]"] = measure(
+            lambda: compute_alignment_simple(clean, 7), repeat
+        )
+        results[f"generate_reply[len={length}]"] = measure(
+            lambda: generate_reply(clean, 0.1), repeat
+        )
+    return results
+
+
+def run_storage_cases(sizes: List[int], repeat: int, workdir: str) -> Dict[str, dict]:
+    results = {}
+    path = os.path.join(workdir, "memory.json")
+    for size in sizes:
+        memory = build_memory(size)
+        heavy = 1 if size >= 100_000 else repeat  # whole-file passes
+
+        # Pruning keeps the history at size, so every call sees the same load
+        results[f"append_session_entry[n={size}]"] = measure(
+            lambda: append_session_entry(
+                memory, "plan for tomorrow", "reply", 0.1, "2025-01-01T00:00:00Z", size
+            ),
+            repeat,
+        )
+        results[f"save_memory[n={size}]"] = measure(lambda: save_memory(memory, path), heavy)
+        results[f"load_memory[n={size}]"] = measure(lambda: load_memory(path), heavy)
+        results[f"load_memory_lazy[n={size}]"] = measure(lambda: load_memory_lazy(path), repeat)
+        results[f"file_sha256[n={size}]"] = measure(lambda: file_sha256(path), heavy)
+        print(f"  history {size:>9,} done", file=sys.stderr)
+    return results
+
+
+def compare(
+    current: Dict[str, dict],
+    baseline: Dict[str, dict],
+    threshold: float,
+    min_delta_us: float = DEFAULT_MIN_DELTA_US,
+) -> List[str]:
+    """Print a comparison table and return the names of regressed cases."""
+    regressed = []
+    print(f"{'case':<42}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<42}{'-':>14}{result['us']:>12.1f}us{'new':>10}")
+            continue
+        change = result["us"] / base["us"] - 1.0 if base["us"] else 0.0
+        flag = ""
+        if change > threshold and result["us"] - base["us"] >= min_delta_us:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<42}{base['us']:>12.1f}us{result['us']:>12.1f}us{change:>+9.1%}{flag}")
+    for name in baseline:
+        if name not in current:
+            print(f"{name:<42}{'(not run)':>14}")
+    return regressed
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(v.replace("_", "")) for v in value.split(",") if v.strip()]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="SSM-AIM Mini benchmark suite")
+    p.add_argument("--sizes", type=parse_int_list, default=None,
+                   help="history sizes, comma separated (default 50..1,000,000)")
+    p.add_argument("--lengths", type=parse_int_list, default=None,
+                   help="input lengths in chars, comma separated (default 1..4000)")
+    p.add_argument("--quick", action="store_true", help="small sizes only (CI smoke run)")
+    p.add_argument("--repeat", type=int, default=5, help="repetitions per case (best is kept)")
+    p.add_argument("--out", help="write results as JSON to this file")
+    p.add_argument("--compare", metavar="BASELINE", help="compare against a stored JSON run")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                   help="slowdown ratio flagged as regression (default 0.20)")
+    p.add_argument("--min-delta-us", type=float, default=DEFAULT_MIN_DELTA_US,
+                   help="ignore slowdowns smaller than this many microseconds")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    lengths = args.lengths or (QUICK_LENGTHS if args.quick else DEFAULT_LENGTHS)
+    repeat = max(1, args.repeat)
+
+    results = run_turn_cases(lengths, repeat)
+    with tempfile.TemporaryDirectory() as workdir:
+        results.update(run_storage_cases(sizes, repeat, workdir))
+
+    report = {
+        "version": 1,
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "sizes": sizes,
+            "lengths": lengths,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        regressed = compare(results, baseline, args.threshold, args.min_delta_us)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than baseline by more than "
+                  f"{args.threshold:.0%}")
+            return 1
+        print("\nno regressions")
+        return 0
+
+    print(f"{'case':<42}{'time':>14}")
+    for name, result in results.items():
+        print(f"{name:<42}{result['us']:>12.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Running statistics over the alignment lane for :trend.
+
+Updated in O(1) per turn as an append_session_entry listener:
+- count, mean and standard deviation (Welford)
+- EWMA of the lane (alpha = 0.2 by default)
+- min / max with the seq where they were seen
+- rolling window of the last N values (running sum)
+- fixed-bucket histogram over [-1, +1]
+- streaks: current run of the same band (low / mid / high) and the
+  longest run per band
+
+Statistics cover every entry ever appended (by seq), not only the
+entries still kept after pruning. They are stored next to memory.json
+as memory.analytics.json; if that file is missing or does not match,
+they are rebuilt from the stored history in one streaming pass.
+
+Used by: aim_core.py
+"""
+
+import json
+import math
+import os
+from collections import deque
+
+from aim_utils import DEFAULT_MEMORY_PATH, LANE_BAND_EDGE, format_align, session_seq_range
+
+DEFAULT_WINDOW = 50
+DEFAULT_ALPHA = 0.2
+HIST_BUCKETS = 10  # over [-1, +1], 0.2 wide
+BAND_NAMES = ("low", "mid", "high")
+BAR_WIDTH = 30
+
+
+def analytics_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the analytics file that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".analytics.json"
+
+
+def lane_band(align: float) -> int:
+    """0 = low, 1 = mid, 2 = high (same edges as the reply suffixes)."""
+    if align < -LANE_BAND_EDGE:
+        return 0
+    if align > LANE_BAND_EDGE:
+        return 2
+    return 1
+
+
+class LaneAnalytics:
+    """Incremental lane statistics keyed by absolute entry seq."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA) -> None:
+        self.window = max(1, int(window))
+        self.alpha = float(alpha)
+        self.reset()
+
+    def reset(self) -> None:
+        self.first = 0  # seq of the first value counted
+        self.last = 0  # seq of the last value counted
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Welford sum of squared deviations
+        self.ewma = 0.0
+        self.min = (0.0, 0)  # (value, seq)
+        self.max = (0.0, 0)
+        self.recent = deque(maxlen=self.window)
+        self._recent_sum = 0.0
+        self.hist = [0] * HIST_BUCKETS
+        self.streak = (1, 0)  # (band, length)
+        self.longest = [0, 0, 0]
+
+    # ---------- maintenance ----------
+
+    def add(self, seq: int, align: float) -> None:
+        """Count one value; seq must be greater than any counted so far."""
+        if seq <= self.last:
+            return
+        a = float(align)
+        if not math.isfinite(a):
+            return
+        if not self.count:
+            self.first = seq
+            self.ewma = a
+            self.min = self.max = (a, seq)
+        else:
+            self.ewma += self.alpha * (a - self.ewma)
+            if a < self.min[0]:
+                self.min = (a, seq)
+            if a > self.max[0]:
+                self.max = (a, seq)
+        self.count += 1
+        delta = a - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (a - self.mean)
+
+        if len(self.recent) == self.window:
+            self._recent_sum -= self.recent[0]
+        self.recent.append(a)
+        self._recent_sum += a
+
+        bucket = int((min(max(a, -1.0), 1.0) + 1.0) / 2.0 * HIST_BUCKETS)
+        self.hist[min(bucket, HIST_BUCKETS - 1)] += 1
+
+        band, length = self.streak
+        new_band = lane_band(a)
+        length = length + 1 if new_band == band and self.count > 1 else 1
+        self.streak = (new_band, length)
+        if length > self.longest[new_band]:
+            self.longest[new_band] = length
+        self.last = seq
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """Listener hook for append_session_entry."""
+        self.add(session_seq_range(memory)[1], entry.get("align", 0.0))
+
+    def sync(self, memory: dict) -> int:
+        """
+        Catch up with memory after load. Rebuilds from the stored
+        history if the statistics are ahead of memory or entries are
+        missing in between. Returns the number of values added.
+        """
+        sessions = memory.get("sessions", [])
+        first, last = session_seq_range(memory)
+        if self.last > last or (self.count and self.last < first - 1):
+            self.reset()
+        start = max(first, self.last + 1)
+        missing = last - start + 1
+        if missing <= 0:
+            return 0
+        # Full rebuilds stream the history; catch-up reads only the tail
+        new = sessions if missing >= len(sessions) else sessions[-missing:]
+        for offset, entry in enumerate(new):
+            self.add(start + offset, entry.get("align", 0.0))
+        return missing
+
+    # ---------- queries ----------
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count > 1 else 0.0
+
+    @property
+    def recent_mean(self) -> float:
+        return self._recent_sum / len(self.recent) if self.recent else 0.0
+
+    def direction(self) -> str:
+        """Where the EWMA sits against the overall mean."""
+        gap = self.ewma - self.mean
+        if abs(gap) < max(0.05, self.stddev / 4):
+            return "steady"
+        return "rising" if gap > 0 else "falling"
+
+    def format_report(self) -> str:
+        """Text for :trend (size independent of history length)."""
+        if not self.count:
+            return "[trend] No alignment values yet."
+        band, length = self.streak
+        lines = [
+            f"[trend] {self.count} values (#{self.first}..#{self.last}) | "
+            f"mean {format_align(self.mean)} | sd {self.stddev:.2f} | "
+            f"ewma {format_align(self.ewma)} ({self.direction()})",
+            f"[trend] min {format_align(self.min[0])} (#{self.min[1]}) | "
+            f"max {format_align(self.max[0])} (#{self.max[1]})",
+            f"[trend] last {len(self.recent)}: mean {format_align(self.recent_mean)} | "
+            f"min {format_align(min(self.recent))} | max {format_align(max(self.recent))}",
+            f"[trend] streak: {length} x {BAND_NAMES[band]} | longest "
+            + " / ".join(f"{name} {n}" for name, n in zip(BAND_NAMES, self.longest)),
+        ]
+        top = max(self.hist)
+        for i, n in enumerate(self.hist):
+            lo = -1.0 + 2.0 * i / HIST_BUCKETS
+            bar = "#" * (round(n / top * BAR_WIDTH) if top else 0)
+            lines.append(f"  {format_align(lo)}..{format_align(lo + 2.0 / HIST_BUCKETS)} "
+                         f"{bar:<{BAR_WIDTH}} {n}")
+        return "\n".join(lines)
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "alpha": self.alpha,
+            "first": self.first,
+            "last": self.last,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self._m2,
+            "ewma": self.ewma,
+            "min": list(self.min),
+            "max": list(self.max),
+            "recent": list(self.recent),
+            "hist": self.hist,
+            "streak": list(self.streak),
+            "longest": self.longest,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict, window: int = DEFAULT_WINDOW,
+                  alpha: float = DEFAULT_ALPHA) -> "LaneAnalytics":
+        stats = cls(window, alpha)
+        if int(raw["window"]) != stats.window or float(raw["alpha"]) != stats.alpha:
+            raise ValueError("stored analytics use other settings")
+        stats.first = int(raw["first"])
+        stats.last = int(raw["last"])
+        stats.count = int(raw["count"])
+        stats.mean = float(raw["mean"])
+        stats._m2 = float(raw["m2"])
+        stats.ewma = float(raw["ewma"])
+        stats.min = (float(raw["min"][0]), int(raw["min"][1]))
+        stats.max = (float(raw["max"][0]), int(raw["max"][1]))
+        stats.recent.extend(float(a) for a in raw["recent"])
+        stats._recent_sum = sum(stats.recent)
+        stats.hist = [int(n) for n in raw["hist"]]
+        stats.streak = (int(raw["streak"][0]), int(raw["streak"][1]))
+        stats.longest = [int(n) for n in raw["longest"]]
+        if len(stats.hist) != HIST_BUCKETS or len(stats.longest) != len(BAND_NAMES):
+            raise ValueError("analytics buckets do not match")
+        return stats
+
+    @classmethod
+    def load(cls, path: str, window: int = DEFAULT_WINDOW,
+             alpha: float = DEFAULT_ALPHA) -> "LaneAnalytics":
+        """Load stored statistics; start empty if missing or invalid."""
+        if not os.path.exists(path):
+            return cls(window, alpha)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f), window, alpha)
+        except Exception:
+            return cls(window, alpha)
+
+    def save(self, path: str) -> None:
+        """Write to a temp file and swap it in, so a crash never leaves half a file."""
+        tmp_path = path + ".tmp"
+        try:
+            data = json.dumps(self.to_dict(), separators=(",", ":"))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
@@ -0,0 +1,382 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Archive of sessions pruned from memory.json.
+
+Entries that fall out of the max_sessions window are not discarded:
+- they are appended to memory.archive/open.jsonl as they roll off,
+- every segment_size entries are sealed into an immutable, compressed
+  segment (seg-<first>-<last>.jsonl.gz, or .xz with lzma),
+- memory.archive/manifest.json lists each segment with its seq range,
+  SHA-256 of the file, first/last chain links, and a running seal
+  (seal_i = SHA256(seal_{i-1} || sha256_i)), so removing or replacing
+  a segment is detected.
+
+Lines use the journal format ({"seq": n, "entry": {...}}). History,
+export and search stream over the sealed segments, the open tail and
+then the live sessions, so memory.json stays small while nothing is
+lost.
+
+Used by: aim_core.py, aim_server.py
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import shutil
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from aim_utils import (
+    CHAIN_GENESIS,
+    DEFAULT_ARCHIVE,
+    DEFAULT_ARCHIVE_SEGMENT_SIZE,
+    DEFAULT_MEMORY_PATH,
+    _prune_sessions,
+    chain_hash,
+    file_sha256_full,
+    journal_line,
+    session_seq_range,
+)
+from aim_index import tokenize
+
+ARCHIVE_CODECS = {"gzip": (gzip.open, ".jsonl.gz"), "lzma": (lzma.open, ".jsonl.xz")}
+DEFAULT_CODEC = "gzip"  # for archives opened directly (export, replay, tests)
+MANIFEST_NAME = "manifest.json"
+OPEN_NAME = "open.jsonl"
+
+
+def archive_dir_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the archive directory that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".archive"
+
+
+def _seal(prev: str, digest: str) -> str:
+    return hashlib.sha256((prev + digest).encode("ascii")).hexdigest()
+
+
+def _read_lines(lines) -> Iterator[Tuple[int, dict]]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            rec = json.loads(line)
+            yield int(rec["seq"]), rec["entry"]
+
+
+class SessionArchive:
+    """Sealed segments plus an open tail of pruned entries."""
+
+    def __init__(self, directory: str, codec: str = DEFAULT_CODEC,
+                 segment_size: int = DEFAULT_ARCHIVE_SEGMENT_SIZE) -> None:
+        if codec not in ARCHIVE_CODECS:
+            raise ValueError(f"unknown archive codec {codec!r}")
+        self.directory = directory
+        self.codec = codec
+        self.segment_size = max(1, int(segment_size))
+        self.segments: List[dict] = []
+        self.pending: List[Tuple[int, dict]] = []  # open tail (seq, entry)
+        self._stamp: Optional[tuple] = None  # file stamps seen by refresh()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    @property
+    def open_path(self) -> str:
+        return os.path.join(self.directory, OPEN_NAME)
+
+    @property
+    def last(self) -> int:
+        """Highest archived seq (0 if empty)."""
+        if self.pending:
+            return self.pending[-1][0]
+        return self.segments[-1]["last"] if self.segments else 0
+
+    @property
+    def count(self) -> int:
+        return sum(s["count"] for s in self.segments) + len(self.pending)
+
+    # ---------- load / save ----------
+
+    @classmethod
+    def load(cls, directory: str, codec: str = DEFAULT_CODEC,
+             segment_size: int = DEFAULT_ARCHIVE_SEGMENT_SIZE) -> "SessionArchive":
+        """Read the manifest and the open tail; start empty if missing."""
+        archive = cls(directory, codec, segment_size)
+        try:
+            with open(archive.manifest_path, "r", encoding="utf-8") as f:
+                archive.segments = list(json.load(f)["segments"])
+        except Exception:
+            archive.segments = []
+        sealed = archive.last
+        try:
+            with open(archive.open_path, "r", encoding="utf-8") as f:
+                for seq, entry in _read_lines(f):
+                    # Lines already sealed (crash before truncation) are skipped
+                    if seq > max(sealed, archive.last):
+                        archive.pending.append((seq, entry))
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # A torn last line: keep what was read
+            pass
+        return archive
+
+    def _file_stamp(self) -> tuple:
+        stamp = []
+        for path in (self.manifest_path, self.open_path):
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh(self) -> bool:
+        """
+        Reload the manifest and open tail if another process changed
+        them (shared storage). Returns True if anything was reloaded.
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        fresh = SessionArchive.load(self.directory, self.codec, self.segment_size)
+        self.segments, self.pending = fresh.segments, fresh.pending
+        self._stamp = stamp
+        return True
+
+    def _write_manifest(self) -> None:
+        tmp_path = self.manifest_path + ".tmp"
+        data = json.dumps({"version": 1, "segments": self.segments}, indent=1)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---------- archiving ----------
+
+    def add(self, first_seq: int, entries: List[dict]) -> int:
+        """
+        Archive entries numbered first_seq, first_seq + 1, ...
+        Seqs already archived are skipped. Returns how many were added.
+        """
+        new = [(first_seq + i, e) for i, e in enumerate(entries) if first_seq + i > self.last]
+        if not new:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.open_path, "a", encoding="utf-8") as f:
+            f.write("".join(journal_line(entry, seq) for seq, entry in new))
+        self.pending.extend(new)
+        while len(self.pending) >= self.segment_size:
+            self.seal(self.segment_size)
+        if self._stamp is not None:
+            self._stamp = self._file_stamp()
+        return len(new)
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """Listener hook for append_session_entry: keep what was pruned."""
+        if dropped:
+            self.add(session_seq_range(memory)[0] - len(dropped), dropped)
+
+    def catch_up(self, memory: dict, max_sessions: int) -> int:
+        """Prune memory to max_sessions, archiving what is dropped."""
+        dropped = _prune_sessions(memory, max_sessions)
+        if dropped:
+            self.add(session_seq_range(memory)[0] - len(dropped), dropped)
+        return len(dropped)
+
+    def seal(self, n: Optional[int] = None) -> Optional[dict]:
+        """Compress the oldest n open entries (default: all) into a segment."""
+        batch = self.pending[: n or len(self.pending)]
+        if not batch:
+            return None
+        first, last = batch[0][0], batch[-1][0]
+        opener, suffix = ARCHIVE_CODECS[self.codec]
+        name = f"seg-{first:09d}-{last:09d}{suffix}"
+        path = os.path.join(self.directory, name)
+        with opener(path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write("".join(journal_line(entry, seq) for seq, entry in batch))
+        os.replace(path + ".tmp", path)
+
+        prev = self.segments[-1] if self.segments else None
+        if prev is not None and prev["last"] == first - 1:
+            base = prev["chain_head"]
+        else:
+            base = CHAIN_GENESIS if first == 1 else None  # link before a gap is unknown
+        digest = file_sha256_full(path)
+        segment = {
+            "file": name,
+            "codec": self.codec,
+            "first": first,
+            "last": last,
+            "count": len(batch),
+            "sha256": digest,
+            "chain_base": base,
+            "chain_head": batch[-1][1].get("h"),
+            "ts_last": str(batch[-1][1].get("ts", "")),
+            "seal": _seal(prev["seal"] if prev else "", digest),
+        }
+        self.segments.append(segment)
+        self._write_manifest()
+
+        # The open file now only needs what is left
+        self.pending = self.pending[len(batch):]
+        with open(self.open_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write("".join(journal_line(entry, seq) for seq, entry in self.pending))
+        os.replace(self.open_path + ".tmp", self.open_path)
+        return segment
+
+    def clear(self) -> None:
+        """Remove every segment (used by :clear)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.segments = []
+        self.pending = []
+        if self._stamp is not None:
+            self._stamp = self._file_stamp()
+
+    # ---------- reading ----------
+
+    def iter_segment(self, segment: dict) -> Iterator[Tuple[int, dict]]:
+        opener, _ = ARCHIVE_CODECS[segment.get("codec", "gzip")]
+        with opener(os.path.join(self.directory, segment["file"]), "rt", encoding="utf-8") as f:
+            yield from _read_lines(f)
+
+    def _iter_from(self, segments: List[dict]) -> Iterator[Tuple[int, dict]]:
+        for segment in segments:
+            yield from self.iter_segment(segment)
+        yield from list(self.pending)
+
+    def tail(self, n: int) -> List[Tuple[int, dict]]:
+        """Newest n archived (seq, entry), oldest first."""
+        out = deque(self.pending[-n:] if n > 0 else [], maxlen=max(0, n))
+        for segment in reversed(self.segments):
+            if len(out) >= n:
+                break
+            older = list(self.iter_segment(segment))[-(n - len(out)):]
+            out.extendleft(reversed(older))
+        return list(out)
+
+    def search(
+        self,
+        terms: List[str],
+        since: Optional[str] = None,
+        align_min: Optional[float] = None,
+        align_max: Optional[float] = None,
+    ) -> List[Tuple[int, dict]]:
+        """
+        Scan the archive with the same rules as SessionIndex.search.
+        Segments that end before since (by their newest ts) are skipped.
+        """
+        tokens = {t for term in terms for t in tokenize(term)}
+        if terms and not tokens:
+            return []
+        found = []
+        segments = [s for s in self.segments if not since or s.get("ts_last", "~") >= since]
+        for seq, entry in self._iter_from(segments):
+            if since and str(entry.get("ts", "")) < since:
+                continue
+            a = float(entry.get("align", 0.0))
+            if align_min is not None and not a > align_min:
+                continue
+            if align_max is not None and not a < align_max:
+                continue
+            if tokens and not tokens <= tokenize(entry.get("user", "")):
+                continue
+            found.append((seq, entry))
+        return found
+
+    def verify(self, memory: Optional[dict] = None) -> List[str]:
+        """
+        Check every segment: file digest, running seal, seq range and
+        the hash chain inside and across segments. With memory, also
+        check that the newest archived link is memory's chain_base.
+        Returns a list of problems (empty if all is well).
+        """
+        problems = []
+        seal = ""
+        prev_last, prev_head = 0, None
+        for segment in self.segments:
+            name = segment["file"]
+            path = os.path.join(self.directory, name)
+            digest = file_sha256_full(path)
+            seal = _seal(seal, segment["sha256"])
+            if digest != segment["sha256"]:
+                problems.append(f"{name}: file digest does not match the manifest")
+                continue
+            if seal != segment.get("seal"):
+                problems.append(f"{name}: manifest seal broken (segment list edited)")
+            base = segment.get("chain_base")
+            if prev_last and segment["first"] == prev_last + 1 and base != prev_head:
+                problems.append(f"{name}: does not continue the previous segment")
+            link, expected, count = base, segment["first"], 0
+            try:
+                for seq, entry in self.iter_segment(segment):
+                    if seq != expected:
+                        problems.append(f"{name}: seq {seq} where {expected} was expected")
+                        break
+                    if link is not None and "h" in entry and chain_hash(link, entry) != entry["h"]:
+                        problems.append(f"{name}: chain broken at seq {seq}")
+                        break
+                    link = entry.get("h")
+                    expected += 1
+                    count += 1
+            except (OSError, EOFError, ValueError, KeyError, lzma.LZMAError) as exc:
+                problems.append(f"{name}: unreadable ({exc})")
+                continue
+            if count != segment["count"] or expected - 1 != segment["last"]:
+                problems.append(f"{name}: holds {count} entries, manifest says {segment['count']}")
+            prev_last, prev_head = segment["last"], segment.get("chain_head")
+
+        link = prev_head
+        for seq, entry in self.pending:
+            if link is not None and "h" in entry and chain_hash(link, entry) != entry["h"]:
+                problems.append(f"{OPEN_NAME}: chain broken at seq {seq}")
+                break
+            link = entry.get("h")
+        if memory is not None and self.last:
+            first_live = session_seq_range(memory)[0]
+            if first_live == self.last + 1 and link and memory.get("chain_base") != link:
+                problems.append("newest archived entry does not link to memory.json")
+        return problems
+
+    def describe(self) -> str:
+        size = 0
+        for segment in self.segments:
+            try:
+                size += os.path.getsize(os.path.join(self.directory, segment["file"]))
+            except OSError:
+                pass
+        return (f"archive: {self.count} entries in {len(self.segments)} segment(s) "
+                f"+ {len(self.pending)} open | {size} bytes ({self.codec})")
+
+
+def open_archive(cfg: dict, path: str = DEFAULT_MEMORY_PATH) -> Optional[SessionArchive]:
+    """The archive configured for a memory file, or None if archiving is off."""
+    codec = cfg.get("archive", DEFAULT_ARCHIVE)
+    if codec not in ARCHIVE_CODECS:
+        return None
+    return SessionArchive.load(
+        archive_dir_for(path), codec,
+        int(cfg.get("archive_segment_size", DEFAULT_ARCHIVE_SEGMENT_SIZE)),
+    )
+
+
+def iter_numbered_history(
+    memory: dict, archive: Optional[SessionArchive] = None, start: int = 1
+) -> Iterator[Tuple[int, dict]]:
+    """
+    Every (seq, entry) from seq start on, oldest first: archive (if
+    any), then live sessions. Segments that end before start are not
+    opened.
+    """
+    first_live = session_seq_range(memory)[0]
+    if archive is not None:
+        segments = [s for s in archive.segments if s["last"] >= start]
+        for seq, entry in archive._iter_from(segments):
+            if start <= seq < first_live:
+                yield seq, entry
+    skip = max(0, start - first_live)
+    for offset, entry in enumerate(islice(memory.get("sessions", []), skip, None)):
+        yield first_live + skip + offset, entry
@@ -0,0 +1,236 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Fleet audit: check many memory.json files in parallel.
+
+For every memory file found under the given directories:
+- SHA-256 of the file (read once, hashed and parsed from the same bytes)
+- JSON structure (sessions list, entry fields and types, header count;
+  compact rows are expanded first)
+- journal tail replayed on top, if a memory.journal.jsonl sits next to it
+- hash chain: every link, and last_hash against the chain head
+- alignment values finite and inside [-1, +1]
+
+Files are spread over a ProcessPoolExecutor in chunks, so one process
+handles many small files per round trip. One summary report is
+printed (and optionally written as JSON).
+
+Usage:
+    python aim_audit.py /srv/operators --workers 8 --json audit.json
+
+Exit status is 1 if any file fails.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+from aim_utils import (
+    chain_head,
+    decode_entry,
+    detect_hash_change,
+    expand_memory,
+    journal_path_for,
+    replay_journal,
+    verify_chain,
+)
+
+DEFAULT_PATTERN = "memory.json"
+ENTRY_FIELDS = {"ts": str, "user": str, "ai": str}
+MAX_ERRORS_PER_FILE = 20  # keep reports readable for badly damaged files
+
+
+def find_memory_files(roots: Iterable[str], pattern: str = DEFAULT_PATTERN) -> Iterator[str]:
+    """Yield memory files under roots (files given directly are kept as is)."""
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if fnmatch.fnmatch(name, pattern):
+                    yield os.path.join(dirpath, name)
+
+
+def _check_entry(i: int, entry, errors: List[str]) -> None:
+    if not isinstance(entry, dict):
+        errors.append(f"bad_entry: sessions[{i}] is not an object")
+        return
+    for field, kind in ENTRY_FIELDS.items():
+        if not isinstance(entry.get(field), kind):
+            errors.append(f"bad_entry: sessions[{i}].{field} missing or not a string")
+    align = entry.get("align")
+    if isinstance(align, bool) or not isinstance(align, (int, float)):
+        errors.append(f"bad_entry: sessions[{i}].align missing or not a number")
+    elif not math.isfinite(align) or not -1.0 <= align <= 1.0:
+        errors.append(f"align_range: sessions[{i}].align = {align}")
+
+
+def audit_file(path: str) -> dict:
+    """
+    Audit one memory file. Runs in a worker process, so it only
+    returns plain data.
+    """
+    result = {"path": path, "ok": False, "sha256": "", "entries": 0,
+              "errors": [], "warnings": []}
+    errors, warnings = result["errors"], result["warnings"]
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as exc:
+        errors.append(f"unreadable: {exc}")
+        return result
+    result["sha256"] = hashlib.sha256(data).hexdigest()
+
+    try:
+        memory = json.loads(data)
+    except ValueError as exc:
+        errors.append(f"invalid_json: {exc}")
+        return result
+    if not isinstance(memory, dict) or not isinstance(memory.get("sessions"), list):
+        errors.append("bad_structure: no 'sessions' list")
+        return result
+
+    sessions = memory["sessions"]
+    if "count" in memory and memory["count"] != len(sessions):
+        errors.append(f"bad_structure: header count {memory['count']} != {len(sessions)} entries")
+    try:
+        memory = expand_memory(memory)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        strings = memory.get("strings") or ()
+        for i, row in enumerate(sessions):
+            try:
+                decode_entry(row, strings)
+            except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+                errors.append(f"bad_entry: sessions[{i}] is not a valid compact row")
+                break
+        else:
+            errors.append("bad_structure: cannot expand compact rows")
+        return result
+
+    journal_path = journal_path_for(path)
+    if os.path.exists(journal_path):
+        replayed = replay_journal(memory, journal_path)
+        if replayed:
+            warnings.append(f"journal: {replayed} entries not yet compacted")
+    sessions = memory["sessions"]
+    result["entries"] = len(sessions)
+
+    for i, entry in enumerate(sessions):
+        _check_entry(i, entry, errors)
+        if len(errors) >= MAX_ERRORS_PER_FILE:
+            break
+    if errors:
+        return result
+
+    seq = memory.get("seq", len(sessions))
+    if not isinstance(seq, int) or seq < len(sessions):
+        errors.append(f"bad_structure: seq {seq!r} below entry count {len(sessions)}")
+
+    linked = sum(1 for e in sessions if "h" in e)
+    if sessions and not linked:
+        warnings.append("legacy: entries carry no hash chain")
+    elif linked:
+        bad = verify_chain(memory)
+        if 0 <= bad < len(sessions):
+            errors.append(f"chain_broken: first bad link at sessions[{bad}]")
+        elif bad == len(sessions) or detect_hash_change(memory, chain_head(memory)):
+            errors.append("head_mismatch: last_hash does not match the chain head")
+
+    result["ok"] = not errors
+    return result
+
+
+def audit_files(
+    paths: List[str],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[dict]:
+    """
+    Audit paths in parallel; results come back in input order.
+    workers=1 runs in this process (no pool).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        return [audit_file(p) for p in paths]
+    if not chunksize:
+        # A few chunks per worker: amortizes IPC, still balances slow files
+        chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(audit_file, paths, chunksize=chunksize))
+
+
+def summarize(results: List[dict], elapsed: float = 0.0) -> dict:
+    """One report for the whole fleet."""
+    kinds = {}
+    for r in results:
+        for err in r["errors"]:
+            kind = err.split(":", 1)[0]
+            kinds[kind] = kinds.get(kind, 0) + 1
+    failed = [r for r in results if not r["ok"]]
+    return {
+        "files": len(results),
+        "ok": len(results) - len(failed),
+        "failed": len(failed),
+        "entries": sum(r["entries"] for r in results),
+        "warnings": sum(len(r["warnings"]) for r in results),
+        "errors_by_kind": kinds,
+        "elapsed_s": round(elapsed, 3),
+        "failures": [{"path": r["path"], "errors": r["errors"]} for r in failed],
+        "files_detail": results,
+    }
+
+
+def print_report(report: dict, verbose: bool = False) -> None:
+    print(f"[audit] files {report['files']} | ok {report['ok']} | failed {report['failed']} | "
+          f"entries {report['entries']} | warnings {report['warnings']} | "
+          f"{report['elapsed_s']:.2f}s")
+    for kind, n in sorted(report["errors_by_kind"].items()):
+        print(f"[audit]   {kind}: {n}")
+    for failure in report["failures"]:
+        print(f"[audit] FAIL {failure['path']}")
+        for err in failure["errors"]:
+            print(f"          {err}")
+    if verbose:
+        for r in report["files_detail"]:
+            for w in r["warnings"]:
+                print(f"[audit] warn {r['path']}: {w}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Audit many SSM-AIM Mini memory files")
+    parser.add_argument("roots", nargs="+", metavar="DIR", help="directories (or files) to scan")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help=f"file name pattern (default: {DEFAULT_PATTERN})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count; 1 = no pool)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="files per task sent to a worker (default: automatic)")
+    parser.add_argument("--json", metavar="FILE", help="also write the full report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="list warnings too")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    paths = list(find_memory_files(args.roots, args.pattern))
+    results = audit_files(paths, args.workers, args.chunksize)
+    report = summarize(results, time.perf_counter() - start)
+    print_report(report, args.verbose)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
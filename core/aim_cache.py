@@ -0,0 +1,84 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Bounded LRU memo for reply generation.
+
+generate_reply + add_alignment_suffix are pure functions of the
+stripped, lowercased text and the suffix band of the lane, so a reply
+can be reused exactly whenever both repeat ("plan", journaling notes,
+replayed batches).
+
+Used by: aim_core.py
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from aim_utils import DEFAULT_REPLY_CACHE_SIZE
+
+
+class ReplyCache:
+    """
+    Least-recently-used cache with hit/miss/eviction counters.
+    A capacity of 0 disables caching (every lookup is a miss).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_REPLY_CACHE_SIZE) -> None:
+        self.capacity = max(0, int(capacity))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], str]) -> str:
+        """Return the cached value for key, computing and storing it on a miss."""
+        data = self._data
+        try:
+            value = data[key]
+        except KeyError:
+            pass
+        else:
+            data.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        if self.capacity:
+            data[key] = value
+            if len(data) > self.capacity:
+                data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def resize(self, capacity: int) -> None:
+        """Change capacity, evicting least-recently-used entries if needed."""
+        self.capacity = max(0, int(capacity))
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def describe(self) -> str:
+        """One-line summary for :stats and the batch summary."""
+        s = self.stats()
+        return (
+            f"reply cache {s['size']}/{s['capacity']} | "
+            f"hits {s['hits']} | misses {s['misses']} | "
+            f"evictions {s['evictions']} | hit rate {s['hit_rate']:.1%}"
+        )
@@ -4,9 +4,15 @@ Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
 This is a tiny, fully local personal console:
 - No network calls
 - No external dependencies beyond Python standard library
-- One JSON memory file (memory.json) in the same folder
+- Memory in memory.json in the working directory, with its sidecar
+  files next to it (journal, Merkle leaves, search index, lane
+  statistics, verify record, archive)
 - Light symbolic-style alignment lane per turn in (-1, +1)
 
+Non-interactive use:
+  python aim_core.py --batch messages.txt --out replies.jsonl
+  cat messages.txt | python aim_core.py --batch -
+
 It is NOT the full internal SSM-AI or AIM engine.
 It is a public demo that shows:
 - a small conversational loop,
@@ -14,65 +20,109 @@ It is a public demo that shows:
 - a gentle alignment lane for each message.
 """
 
-from typing import Optional
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import time
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, List, Optional, Sequence, TextIO, Tuple
 
 from aim_utils import (
-    load_memory,
-    save_memory,
-    append_session_entry,
-    compute_alignment_simple,
+    check_memory_file,
+    compact_memory,
+    journal_path_for,
+    save_verify_record,
+    verify_path_for,
     format_align,
-    current_utc_iso,
-    file_sha256,
     file_sha256_full,
+    chain_head,
+    ensure_chain,
+    verify_chain,
+    short_hash,
     load_config,
-    sanitize_text,
     detect_hash_change,
+    load_memory,
+    session_seq_range,
+    DEFAULT_FSYNC,
+    DEFAULT_HASH_LENGTH,
+    DEFAULT_MEMORY_PATH,
+    LANE_BAND_EDGE,
+    LANE_SUFFIXES,
 )
+from aim_lazy import LazySidecar, load_memory_lazy
+from aim_merkle import SessionMerkle, merkle_path_for
+from aim_index import SEARCH_USAGE, SessionIndex, index_path_for, parse_search
+from aim_analytics import LaneAnalytics, analytics_path_for
+from aim_archive import SessionArchive, open_archive
+from aim_export import (
+    DEFAULT_EXPORT_PATH,
+    EXPORT_FORMATS,
+    describe_export,
+    export_memory,
+    export_path_for,
+)
+from aim_rules import load_manifest
+from aim_cache import ReplyCache
+from aim_writer import MemoryWriter
+from aim_shared import open_shared
+from aim_pipeline import (
+    AlignStage,
+    EmitStage,
+    PassStage,
+    PersistStage,
+    ReplyStage,
+    SanitizeStage,
+    Turn,
+    TurnPipeline,
+    VerifyStage,
+)
+from aim_metrics import Metrics
 
 
-BANNER = r"""
-SSM-AIM (Mini Version) — Shunyaya Symbolic Mathematical AI
-----------------------------------------------------------
-- Fully local, file-based mini personal console
-- No internet, no remote calls, no tracking
-- One JSON memory file: memory.json
-
-Commands:
-  :quit           exit this mini console
-  :history        show recent interactions
-  :help           show this help again
-  :clear          erase local mini memory (with confirmation)
-  :verify         show short SHA256 of memory.json
-  :verify full    show full SHA256 of memory.json
-  :lane           tiny tutorial on the alignment lane
-  :export         export full history to a markdown file
-
-Type your message and press Enter to talk to SSM-AIM (Mini).
-"""
+# Reply rules and console texts: loaded from the compiled manifest cache,
+# compiled once if the manifest changed (run() writes the cache)
+MANIFEST = load_manifest()
 
+# Memo for (text, suffix band) -> reply; capacity comes from config
+REPLY_CACHE = ReplyCache()
 
-def add_alignment_suffix(reply: str, align_hint: Optional[float]) -> str:
-    """
-    Optionally add a short suffix based on the alignment lane.
+# Per-stage latency histograms for :stats and the metrics file
+METRICS = Metrics()
+DEFAULT_PROFILE_PATH = "aim_profile.prof"
 
-    This keeps behavior deterministic and very small:
-    - For lower alignment, we gently suggest slowing down.
-    - For higher alignment, we acknowledge focus and stability.
+
+def alignment_band(align_hint: Optional[float]) -> int:
+    """
+    Return which suffix add_alignment_suffix would pick:
+    -1 below -0.3, +1 above +0.3, 0 otherwise (including no hint).
     """
     if align_hint is None:
-        return reply
+        return 0
 
     try:
         a = float(align_hint)
     except Exception:
-        return reply
+        return 0
+
+    if a < -LANE_BAND_EDGE:
+        return -1
+    if a > LANE_BAND_EDGE:
+        return 1
+    return 0
 
-    if a < -0.3:
-        return reply + " You can pause, breathe, and take it one small step at a time."
-    if a > 0.3:
-        return reply + " This looks reasonably focused; you can build on it steadily."
-    return reply
+
+def add_alignment_suffix(reply: str, align_hint: Optional[float]) -> str:
+    """
+    Optionally add a short suffix based on the alignment lane.
+
+    This keeps behavior deterministic and very small:
+    - For lower alignment, we gently suggest slowing down.
+    - For higher alignment, we acknowledge focus and stability.
+    """
+    return reply + LANE_SUFFIXES.get(alignment_band(align_hint), "")
 
 
 def generate_reply(user_text: str, align_hint: Optional[float] = None) -> str:
@@ -88,107 +138,51 @@ def generate_reply(user_text: str, align_hint: Optional[float] = None) -> str:
     - stay grounded and simple,
     - fit in a small script that anyone can inspect.
 
+    The reply patterns are a declarative table (manifest/rules.json),
+    compiled once into a single-pass matcher (see aim_rules.py). The
+    first matching rule in table order wins.
+
     The alignment lane is used only as a light hint to optionally
     append a short suffix (via add_alignment_suffix).
     """
-    text = (user_text or "").strip()
-
-    if not text:
-        base = "I did not receive any content. Try typing a question, idea, or plan."
-        return add_alignment_suffix(base, align_hint)
-
-    lower = text.lower()
-    base: str
-
-    # Very small patterns to keep behavior readable and deterministic
-
-    if "plan" in lower or "schedule" in lower:
-        base = (
-            "I hear you are thinking in terms of plans or schedules. "
-            "Try breaking it into 3 small steps you can start soon. "
-            "If you like, describe Step 1 and I will help you refine it."
-        )
-        return add_alignment_suffix(base, align_hint)
+    base = MANIFEST.rules.reply_for(user_text)
+    return add_alignment_suffix(base, align_hint)
 
-    if "stress" in lower or "tired" in lower or "overwhelmed" in lower:
-        base = (
-            "It sounds like you may be under some stress. "
-            "One option is to list just one small thing you can do next, "
-            "not everything at once. I can help you think through that next step."
-        )
-        return add_alignment_suffix(base, align_hint)
 
-    if "idea" in lower or "project" in lower:
-        base = (
-            "Nice, you are in idea or project mode. "
-            "Try stating the core goal in one sentence. "
-            "From there, we can outline support, risks, and next moves."
-        )
-        return add_alignment_suffix(base, align_hint)
-
-    # Symbolic / math / formula thinking
-    if (
-        "math" in lower
-        or "symbolic" in lower
-        or "equation" in lower
-        or "formula" in lower
-    ):
-        base = (
-            "You are thinking in a symbolic or mathematical way. "
-            "It can help to name your key variables, write a simple equation, "
-            "and separate assumptions from results. I can mirror that structure "
-            "with you in plain text."
-        )
-        return add_alignment_suffix(base, align_hint)
-
-    # Curiosity about alignment lane or score
-    if "alignment" in lower or "lane" in lower or "score" in lower:
-        base = (
-            "You mentioned alignment or a lane. In this mini console, each message "
-            "gets a tiny lane value a in (-1,+1) as a posture hint, not a judgment. "
-            "You can type :lane to see a brief tutorial on how it is computed."
-        )
-        return add_alignment_suffix(base, align_hint)
-
-    # Journaling or notes
-    if "journal" in lower or "diary" in lower or "note" in lower:
-        base = (
-            "Treat this like a tiny journal if you wish. "
-            "You can write short notes about what happened, what you feel, "
-            "and one small thing you might try next. I will reflect it back "
-            "and keep a compact local memory for you."
-        )
-        return add_alignment_suffix(base, align_hint)
-
-    if text.endswith("?"):
-        base = (
-            "You asked a question. I cannot see the full world, but I can help you "
-            "think through it step by step. Try telling me what you already know, "
-            "and what is uncertain. We can separate facts, options, and next actions."
-        )
-        return add_alignment_suffix(base, align_hint)
+def cached_reply(user_text: str, align_hint: Optional[float] = None) -> str:
+    """
+    generate_reply through REPLY_CACHE.
 
-    # Default: reflective mirror with gentle nudge
-    base = (
-        "Thank you for sharing. I have recorded this in the mini memory. "
-        "If you want, you can now ask a question about it, or say :history "
-        "to see recent interactions."
+    The reply only depends on the stripped, lowercased text (rule
+    keywords are lowercase, the question rule checks a trailing '?')
+    and on the suffix band, so that pair is an exact cache key.
+    """
+    key = ((user_text or "").strip().lower(), alignment_band(align_hint))
+    return REPLY_CACHE.get_or_compute(
+        key, lambda: generate_reply(user_text, align_hint)
     )
-    return add_alignment_suffix(base, align_hint)
 
 
-def show_history(memory: dict, max_items: int = 10) -> None:
+def show_history(
+    memory: dict, max_items: int = 10, archive: Optional[SessionArchive] = None
+) -> None:
     """
     Print the last few interactions in a compact form.
+    Reaches into the archive if memory holds fewer than max_items.
     """
     sessions = memory.get("sessions", [])
-    if not sessions:
+    entries = list(sessions[-max_items:])
+    if archive is not None and len(entries) < max_items:
+        first_live = session_seq_range(memory)[0]
+        older = archive.tail(max_items - len(entries))
+        entries = [e for seq, e in older if seq < first_live] + entries
+    if not entries:
         print("\n[history] No previous sessions stored yet.\n")
         return
 
     print(f"\n[history] Showing up to last {max_items} entries:\n")
 
-    for entry in sessions[-max_items:]:
+    for entry in entries:
         ts = entry.get("ts", "?")
         user = entry.get("user", "")
         ai = entry.get("ai", "")
@@ -204,160 +198,621 @@ def show_history(memory: dict, max_items: int = 10) -> None:
 
 def show_lane_tutorial() -> None:
     """
-    Print a tiny tutorial about the alignment lane a in (-1,+1).
+    Print a tiny tutorial about the alignment lane a in (-1,+1)
+    (text from manifest/texts.json).
     """
-    print("\n[lane] Mini alignment lane overview:\n")
-    print("This mini console keeps a tiny symbolic lane a in (-1,+1) per message.")
-    print("It is a posture hint, not a sentiment score or judgment.\n")
-    print("Roughly, for each message:")
-    print("  - norm_len = clamp(len(text) / 400, 0, 1)")
-    print("  - raw starts from norm_len (questions are a bit lower)")
-    print("  - raw is centered around 0 and a small drift term is added")
-    print("  - we clamp into a safe range and map with tanh(raw)")
+    print(MANIFEST.texts["lane_tutorial"])
+
+
+def show_search(
+    memory: dict,
+    index: SessionIndex,
+    args: List[str],
+    max_items: int = 10,
+    archive: Optional[SessionArchive] = None,
+) -> None:
+    """
+    Run ':search' against the index and print the newest matches.
+    If fewer than max_items match in memory, the archive is scanned too.
+    """
+    try:
+        query = parse_search(args)
+    except ValueError:
+        print(SEARCH_USAGE + "\n")
+        return
+    if not (query["terms"] or query["since"]) and query["align_min"] is None \
+            and query["align_max"] is None:
+        print(SEARCH_USAGE + "\n")
+        return
+
+    t0 = time.perf_counter()
+    seqs = index.search(**query)
+    sessions = memory.get("sessions", [])
+    first = session_seq_range(memory)[0]
+    hits = [(seq, sessions[seq - first]) for seq in seqs[-max_items:]
+            if 0 <= seq - first < len(sessions)]
+    total = len(seqs)
+    if archive is not None and len(hits) < max_items:
+        older = [(s, e) for s, e in archive.search(**query) if s < first]
+        total += len(older)
+        hits = older[len(hits) - max_items:] + hits
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+    print(f"\n[search] {total} match(es) in {elapsed_ms:.3f} ms\n")
+    for seq, entry in reversed(hits):
+        print(f"#{seq}  {entry.get('ts', '?')}  [{format_align(entry.get('align', 0.0))}]")
+        print(f"User:    {entry.get('user', '')}")
+        print(f"SSM-AIM: {entry.get('ai', '')}")
+        print("-" * 40)
     print()
-    print("So in this demo:")
-    print("  - a near +1.00 suggests detailed, settled, sustained input,")
-    print("  - a near -1.00 suggests short, questioning, or unsettled input,")
-    print("  - values near 0.00 are neutral.")
-    print("\nIt is only a tiny symbolic posture signal for reflection.\n")
 
 
-def export_history(memory: dict, path: str = "aim_export.md") -> None:
+def show_merkle_verify(memory: dict, tree: SessionMerkle, args: List[str]) -> None:
     """
-    Export full history to a small markdown file.
+    Handle ':verify entry N' and ':verify range A..B'.
+    N, A and B are entry numbers (#seq, as shown by :history, :search
+    and exports); only entries still in memory.json have Merkle leaves.
     """
+    first, last = session_seq_range(memory)
     try:
-        sessions = memory.get("sessions", [])
-        with open(path, "w", encoding="utf-8") as f:
-            f.write("# SSM-AIM Mini Export\n\n")
-            if not sessions:
-                f.write("_No sessions stored._\n")
+        if args[0] == "entry":
+            seq = int(args[1].lstrip("#"))
+            if not first <= seq <= last:
+                print(f"[verify] entry #{seq} is not in memory.json (#{first}..#{last})\n")
                 return
-            for entry in sessions:
-                ts = entry.get("ts", "?")
-                user = entry.get("user", "")
-                ai = entry.get("ai", "")
-                align = entry.get("align", 0.0)
-                f.write(f"- Time:  {ts}\n")
-                f.write(f"  Align: {format_align(align)}\n")
-                f.write(f"  User:  {user}\n")
-                f.write(f"  AI:    {ai}\n\n")
-        print(f"[export] History written to {path}\n")
+            ok, steps, stored = tree.prove_entry(memory, seq - first)
+            status = "OK" if ok else "MISMATCH"
+            against = "stored root" if stored else "current root, not saved yet"
+            print(f"[verify] entry #{seq}: {status} ({steps} proof hashes, {against})")
+            return
+
+        lo, _, hi = args[1].partition("..")
+        start, end = int(lo.lstrip("#")), int((hi or lo).lstrip("#"))
+        if start > end:
+            raise ValueError(args[1])
+        if start < first or end > last:
+            print(f"[verify] range #{start}..#{end} is not in memory.json (#{first}..#{last})\n")
+            return
+        changed = tree.diff_range(memory, start - first, end - first)
+        if changed:
+            listed = ", ".join(f"#{first + i}" for i in changed)
+            print(f"[verify] range #{start}..#{end}: changed entries {listed}")
+        else:
+            print(f"[verify] range #{start}..#{end}: OK")
+    except (IndexError, ValueError):
+        print("[verify] usage: :verify entry N | :verify range A..B (entry numbers as in :history)\n")
+        return
+    print(f"[verify] merkle root = {tree.root()}")
+
+
+def export_history(
+    memory: dict,
+    path: str = DEFAULT_EXPORT_PATH,
+    archive: Optional[SessionArchive] = None,
+    fmt: Optional[str] = None,
+    incremental: bool = False,
+) -> None:
+    """
+    Export history as Markdown, JSONL or CSV (aim_export.py).
+    Archived entries (if any) come first, streamed segment by segment;
+    incremental only appends what was added since the last export.
+    """
+    try:
+        print(describe_export(export_memory(memory, path, archive, fmt, incremental)) + "\n")
     except Exception:
         print("[export] Could not write export file.\n")
 
 
-def main() -> None:
+def parse_export(args: List[str]) -> Tuple[str, Optional[str], bool]:
+    """:export [FILE] [md|jsonl|csv] [--incremental] -> (path, format, incremental)."""
+    path, fmt, incremental = None, None, False
+    for arg in args:
+        if arg.lstrip("-") == "incremental":
+            incremental = True
+        elif arg.lower() in EXPORT_FORMATS:
+            fmt = arg.lower()
+        else:
+            path = arg
+    return path or export_path_for(fmt or "md"), fmt, incremental
+
+
+# --------------------------------------
+# Turn pipeline (console, batch, server)
+# --------------------------------------
+
+def new_pipeline(
+    memory: dict,
+    max_sessions: int,
+    listeners: Sequence = (),
+    commit: Optional[Callable[[List[Turn]], None]] = None,
+    emit: Optional[Callable[[Turn], object]] = None,
+    hash_length: int = DEFAULT_HASH_LENGTH,
+    guard: Optional[Callable] = None,
+) -> TurnPipeline:
+    """
+    The standard stages: sanitize -> align -> reply (through the reply
+    cache) -> persist (append, then commit) -> verify -> emit.
+    """
+    return TurnPipeline(memory, [
+        SanitizeStage(),
+        AlignStage(),
+        ReplyStage(cached_reply),
+        PersistStage(max_sessions, listeners, commit),
+        VerifyStage(hash_length),
+        EmitStage(emit),
+    ], guard=guard)
+
+
+# --------------------------------------
+# Batch / streaming mode
+# --------------------------------------
+
+def run_batch(
+    source: TextIO,
+    out: TextIO,
+    batch_size: int = 500,
+    cfg: Optional[dict] = None,
+) -> int:
+    """
+    Stream messages from source through the turn pipeline and write
+    one JSON object per message to out.
+
+    Messages go through the stages batch_size at a time, so memory is
+    persisted once per batch instead of once per message. With shared
+    storage every message is its own batch (the file lock is held for
+    one append) and is also journaled. Returns the number of messages
+    processed.
+    """
+    cfg = cfg or load_config()
+    max_sessions = int(cfg.get("max_sessions", 50))
+    batch_size = max(1, int(batch_size))
+
+    # Batches are written as snapshots, so the journal is only folded in;
+    # shared storage journals each message so other writers see it
+    shared = open_shared(cfg)
+    journal_path = journal_path_for() if cfg.get("storage") in ("journal", "shared") else None
+    archive = open_archive(cfg)
+    loader = load_memory if shared is not None else load_memory_lazy
+    with shared.locked() if shared is not None else nullcontext():
+        memory = loader(journal_path=journal_path, max_sessions=0 if archive else max_sessions)
+        if archive is not None:
+            if shared is not None:
+                archive.refresh()
+            archive.catch_up(memory, max_sessions)
+    ensure_chain(memory)
+    merkle_path = merkle_path_for()
+    merkle = SessionMerkle.load(merkle_path)
+    index_path = index_path_for()
+    index = SessionIndex.load(index_path)
+    index.sync(memory)
+    analytics_path = analytics_path_for()
+    analytics = LaneAnalytics.load(analytics_path)
+    analytics.sync(memory)
+    listeners = (index, analytics) + ((archive,) if archive is not None else ())
+
+    if shared is not None:
+        compact = shared.compact
+    else:
+        compact = partial(compact_memory, journal_path=journal_path)
+    pending = 0
+
+    def commit(turns: List[Turn]) -> None:
+        nonlocal pending
+        pending += len(turns)
+        if pending >= batch_size:
+            compact(memory)
+            pending = 0
+
+    def emit(turn: Turn) -> None:
+        out.write(json.dumps(
+            {"turn": turn.turn, "ts": turn.ts, "user": turn.text, "ai": turn.reply,
+             "align": round(turn.align, 4)},
+            ensure_ascii=False,
+        ) + "\n")
+
+    if shared is None:
+        pipeline = new_pipeline(memory, max_sessions, listeners, commit, emit)
+        chunk_size = batch_size
+    else:
+        pipeline = new_pipeline(
+            memory, max_sessions, listeners + (shared,), commit, emit,
+            guard=partial(shared.locked, memory, max_sessions, listeners),
+        )
+        chunk_size = 1
+    # Output lines carry no chain link
+    pipeline.replace("verify", PassStage("verify"))
+
+    start = time.perf_counter()
+    count = 0
+    chunk: List[Turn] = []
+    for line in source:
+        chunk.append(Turn(line.rstrip("\r\n")))
+        if len(chunk) >= chunk_size:
+            count += len(pipeline.run(chunk))
+            chunk = []
+    if chunk:
+        count += len(pipeline.run(chunk))
+
+    merkle.sync(memory)
+    sidecars = (
+        partial(merkle.save, merkle_path),
+        partial(index.save, index_path),
+        partial(analytics.save, analytics_path),
+    )
+    if shared is not None:
+        # Sidecars are shared files too: written under the lock
+        shared.compact(memory, after=sidecars)
+        shared.close()
+    else:
+        compact_memory(memory, journal_path=journal_path)
+        for save in sidecars:
+            save()
+    save_verify_record(DEFAULT_MEMORY_PATH, verify_path_for())
+    out.flush()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[batch] {count} messages in {elapsed:.3f}s ({rate:.0f} msg/s)",
+        file=sys.stderr,
+    )
+    print(f"[batch] {REPLY_CACHE.describe()}", file=sys.stderr)
+    return count
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SSM-AIM (Mini Version) console")
+    parser.add_argument(
+        "--batch", metavar="FILE", type=argparse.FileType("r", encoding="utf-8"),
+        help="read messages from FILE (or - for stdin) instead of the prompt",
+    )
+    parser.add_argument(
+        "--out", metavar="FILE", type=argparse.FileType("w", encoding="utf-8"),
+        default=sys.stdout,
+        help="batch results as JSONL (default: stdout)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500,
+        help="messages per memory save in batch mode (default: 500)",
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE", nargs="?", const=DEFAULT_PROFILE_PATH,
+        help=f"run under cProfile and dump stats to FILE (default: {DEFAULT_PROFILE_PATH})",
+    )
+    parser.add_argument(
+        "--metrics", metavar="FILE",
+        help="write per-stage timings as JSON to FILE (also config 'metrics_file')",
+    )
+    parser.add_argument(
+        "--rebuild-manifest", action="store_true",
+        help="recompile manifest/ (rules, texts) and rewrite its cache",
+    )
+    return parser.parse_args(argv)
+
+
+def run_profiled(args: argparse.Namespace) -> None:
+    """Run the console (or batch) under cProfile; dump and summarize on exit."""
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        stream = sys.stderr if args.batch else sys.stdout
+        print(f"\n[profile] stats written to {args.profile}", file=stream)
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(15)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     Entry point for the SSM-AIM (Mini Version) console.
     """
-    print(BANNER)
+    args = parse_args(argv)
+    if args.profile:
+        run_profiled(args)
+    else:
+        run(args)
 
-    # Load basic config (max_sessions, hash_length)
+
+def run(args: argparse.Namespace) -> None:
+    """Console loop (or batch run) for parsed command-line arguments."""
+    # Load basic config (max_sessions, hash_length, storage, cache size)
     cfg = load_config()
-    max_sessions = int(cfg.get("max_sessions", 50))
-    hash_length = int(cfg.get("hash_length", 12))
+    REPLY_CACHE.resize(int(cfg.get("reply_cache_size", REPLY_CACHE.capacity)))
+    if args.rebuild_manifest:
+        MANIFEST.load(rebuild=True)
+        REPLY_CACHE.clear()
+        print(f"[manifest] rebuilt: {MANIFEST.describe()}",
+              file=sys.stderr if args.batch else sys.stdout)
+    # Cached next to memory.json; importing aim_core only reads it
+    MANIFEST.save_cache()
+
+    if args.batch:
+        try:
+            run_batch(args.batch, args.out, args.batch_size, cfg)
+        finally:
+            for stream in (args.batch, args.out):
+                if stream not in (sys.stdin, sys.stdout):
+                    stream.close()
+        return
 
-    # Load previous memory (if any)
-    memory = load_memory()
+    print(MANIFEST.texts["banner"])
+    if MANIFEST.error:
+        print(f"[manifest] {MANIFEST.error}; using built-in rules and texts")
 
-    # Detect hash change since last run (if possible)
-    current_hash = file_sha256(length=hash_length)
-    warning = detect_hash_change(memory, current_hash)
+    max_sessions = int(cfg.get("max_sessions", 50))
+    hash_length = int(cfg.get("hash_length", 12))
+    compact_every = int(cfg.get("compact_every", 200))
+
+    # Journal mode appends one line per turn instead of rewriting memory.json;
+    # shared mode does the same for several consoles under a file lock
+    storage = cfg.get("storage")
+    shared = open_shared(cfg)
+    if storage == "shared" and shared is None:
+        print("[shared] file locking is not available here; using journal storage")
+    journal_path = journal_path_for() if storage in ("journal", "shared") else None
+    pending = 0
+
+    # Load previous memory (if any); entries past max_sessions go to the archive.
+    # Other writers may replace memory.json at any time, so shared mode loads
+    # it eagerly and under the lock
+    archive = open_archive(cfg)
+    loader = load_memory if shared is not None else load_memory_lazy
+    with shared.locked() if shared is not None else nullcontext():
+        memory = loader(journal_path=journal_path, max_sessions=0 if archive else max_sessions)
+        if archive is not None:
+            if shared is not None:
+                archive.refresh()
+            archive.catch_up(memory, max_sessions)
+
+    # Detect hash change since last run: only the newest link is rehashed
+    warning = detect_hash_change(memory, chain_head(memory))
     if warning:
         print(warning)
 
-    # Turn index: number of existing sessions is our starting point
-    sessions = memory.get("sessions", [])
-    turn_index = len(sessions)
+    # Whole-file check: skipped if memory.json's stat matches the exit record
+    verify_path = verify_path_for()
+    status, _ = check_memory_file(
+        DEFAULT_MEMORY_PATH, verify_path, force=bool(cfg.get("verify_full_on_start"))
+    )
+    if status == "changed" and shared is None:
+        print("[verify] memory.json was modified outside the console since the last exit")
+
+    # Memory written by older versions has no per-entry hashes yet
+    ensure_chain(memory)
+
+    # Skip the final rewrite if the session only read memory
+    dirty = not getattr(memory["sessions"], "unchanged", False)
+
+    # Merkle leaves (per-entry proofs) and the search index are stored next
+    # to memory.json and read on first use (:verify, :search, or the next
+    # save), then only caught up, not rebuilt
+    merkle = LazySidecar(SessionMerkle.load, merkle_path_for())
+    index = LazySidecar(SessionIndex.load, index_path_for())
+
+    # Lane statistics cover pruned entries too, so they follow every append
+    # from the start (a small file)
+    analytics_path = analytics_path_for()
+    analytics = LaneAnalytics.load(analytics_path)
+    if analytics.sync(memory):
+        dirty = True
+
+    # memory.json, journal and sidecars are written through one writer:
+    # inline by default, from a background thread if configured
+    writer = MemoryWriter(
+        journal_path=journal_path,
+        fsync=cfg.get("fsync", DEFAULT_FSYNC),
+        background=bool(cfg.get("background_writes")),
+        metrics=METRICS,
+        shared=shared,
+    )
+    sidecars = (
+        lambda: merkle.save(pipeline.memory),
+        lambda: index.save(pipeline.memory),
+        partial(analytics.save, analytics_path),
+    )
 
-    while True:
-        try:
-            raw_input_text = input("you> ")
-        except (EOFError, KeyboardInterrupt):
-            print("\nExiting SSM-AIM (Mini Version). Goodbye.")
-            break
-
-        # Sanitize and trim
-        user_text = sanitize_text(raw_input_text).strip()
-
-        if not user_text:
-            # Ignore empty lines
-            continue
-
-        cmd = user_text.lower()
-
-        # Commands
-        if cmd in {":quit", "quit", "exit"}:
-            print("Exiting SSM-AIM (Mini Version). Goodbye.")
-            break
-
-        if cmd in {":help", "help"}:
-            print(BANNER)
-            continue
-
-        # lane tutorial
-        if cmd in {":lane", "lane", ":tutorial", "tutorial"}:
-            show_lane_tutorial()
-            continue
-
-        # verify (short/full)
-        if cmd.startswith(":verify") or cmd.startswith("verify"):
-            cleaned = cmd.lstrip(":")
-            parts = cleaned.split()
-            if len(parts) > 1 and parts[1] == "full":
-                full_hash = file_sha256_full()
-                print(f"[verify] full SHA256 (memory.json) = {full_hash}")
-            else:
-                mem_hash = file_sha256(length=hash_length)
-                print(f"[verify] memory_sha256 (short) = {mem_hash}")
-            continue
-
-        if cmd in {":history", "history"}:
-            show_history(memory)
-            continue
-
-        if cmd in {":export", "export"}:
-            export_history(memory)
-            continue
-
-        if cmd in {":clear", "clear"}:
-            confirm = input(
-                "This will erase local mini memory. "
-                "Type 'yes' to confirm: "
-            ).strip().lower()
-            if confirm == "yes":
-                memory = {"sessions": [], "last_hash": ""}
-                turn_index = 0
-                save_memory(memory)
-                print("[clear] Mini memory erased.\n")
-            else:
-                print("[clear] Cancelled; memory preserved.\n")
-            continue
-
-        # Normal conversational turn
-        turn_index += 1
-        ts = current_utc_iso()
-        align_value = compute_alignment_simple(user_text, turn_index)
-        reply = generate_reply(user_text, align_value)
-
-        append_session_entry(memory, user_text, reply, align_value, ts, max_sessions)
-
-        # First save updated sessions
-        save_memory(memory)
-
-        # Lightweight verification: show short SHA256 of memory.json
-        mem_hash = file_sha256(length=hash_length)
-        if mem_hash != "NA":
-            # Store hash in memory for next-run comparison
-            memory["last_hash"] = mem_hash
-            save_memory(memory)
-            print(f"[verify] memory_sha256 = {mem_hash}")
-
-        print(f"aim[{format_align(align_value)}]> {reply}\n")
-
-    # Final save (defensive)
-    save_memory(memory)
+    # The metrics file is refreshed with every snapshot and on exit
+    metrics_path = args.metrics or cfg.get("metrics_file")
+
+    def save_metrics() -> None:
+        extra = {"reply_cache": REPLY_CACHE.stats(), "writer": writer.describe()}
+        METRICS.save(metrics_path, extra)
+
+    if metrics_path:
+        sidecars += (save_metrics,)
+
+    # Appends feed the search index, lane statistics, the archive and the writer;
+    # entries merged from other writers (shared storage) skip the writer
+    merge_listeners = (index, analytics) + ((archive,) if archive is not None else ())
+    listeners = merge_listeners + (writer,) + ((shared,) if shared is not None else ())
+
+    # Turns run through the shared pipeline; the console only adds how an
+    # append is persisted and how the reply is shown
+    def commit(turns: List[Turn]) -> None:
+        nonlocal pending, dirty
+        merkle.sync(pipeline.memory)
+        dirty = True
+        pending += len(turns)
+        if pending >= compact_every:
+            # Journal folded in; sidecars are brought up to date only here
+            # and on exit (on load they catch up with what they missed)
+            writer.snapshot(pipeline.memory, sidecars)
+            pending = 0
+            dirty = False
+        elif not journal_path:
+            # json storage rewrites memory.json every turn, without sidecars
+            writer.snapshot(pipeline.memory)
+
+    def emit(turn: Turn) -> None:
+        if turn.hash:
+            print(f"[verify] memory_sha256 = {turn.hash}")
+        print(f"aim[{format_align(turn.align)}]> {turn.reply}\n")
+
+    # With shared storage a turn is numbered and chained under the file
+    # lock, after other consoles' turns
+    guard = None
+    if shared is not None:
+        guard = lambda: shared.locked(pipeline.memory, max_sessions, merge_listeners)
+    pipeline = new_pipeline(memory, max_sessions, listeners, commit, emit, hash_length, guard)
+
+    try:
+        while True:
+            try:
+                raw_input_text = input("you> ")
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting SSM-AIM (Mini Version). Goodbye.")
+                break
+
+            # Stage timings: lap(name) records the time since the previous lap
+            turn_start = time.perf_counter()
+            lap = METRICS.lap()
+
+            # Memory is only touched while holding the writer lock
+            with writer.lock:
+                lap("lock")
+
+                # Shared storage: take in the turns other consoles stored meanwhile
+                if shared is not None:
+                    with shared.locked(memory, max_sessions, merge_listeners) as merged:
+                        pipeline.turn_index += merged
+                    if merged:
+                        merkle.sync(memory)
+                    lap("merge")
+
+                # Sanitize and trim; empty lines are dropped
+                turns = pipeline.run([Turn(raw_input_text)], stop="sanitize", lap=lap)
+                if not turns:
+                    continue
+
+                user_text = turns[0].text
+                cmd = user_text.lower()
+
+                # Commands
+                if cmd in {":quit", "quit", "exit"}:
+                    print("Exiting SSM-AIM (Mini Version). Goodbye.")
+                    break
+
+                if cmd in {":help", "help"}:
+                    print(MANIFEST.texts["banner"])
+                    continue
+
+                # lane tutorial
+                if cmd in {":lane", "lane", ":tutorial", "tutorial"}:
+                    show_lane_tutorial()
+                    continue
+
+                # verify (short/full)
+                if cmd.startswith(":verify") or cmd.startswith("verify"):
+                    cleaned = cmd.lstrip(":")
+                    parts = cleaned.split()
+                    if len(parts) > 1 and parts[1] in {"entry", "range"}:
+                        show_merkle_verify(memory, merkle.get(memory), parts[1:])
+                    elif len(parts) > 1 and parts[1] == "archive":
+                        if archive is None:
+                            print("[verify] archiving is off\n")
+                            continue
+                        problems = archive.verify(memory)
+                        for problem in problems:
+                            print(f"[verify] archive: {problem}")
+                        if not problems:
+                            print(f"[verify] archive OK ({archive.describe()})\n")
+                    elif len(parts) > 1 and parts[1] == "full":
+                        bad = verify_chain(memory)
+                        if bad < 0:
+                            count = len(memory.get("sessions", []))
+                            print(f"[verify] hash chain OK ({count} entries)")
+                            print(f"[verify] chain head = {memory.get('last_hash', '')}")
+                        else:
+                            print(f"[verify] hash chain broken at entry {bad}")
+                        full_hash = file_sha256_full()
+                        print(f"[verify] full SHA256 (memory.json) = {full_hash}")
+                        tree = merkle.get(memory)
+                        print(f"[verify] merkle root = {tree.root()}")
+                        if not tree.stored_intact():
+                            print("[verify] stored merkle root differs from its leaves")
+                        changed = tree.diff_memory(memory)
+                        if changed:
+                            listed = ", ".join(f"#{seq}" for seq in changed)
+                            print(f"[verify] merkle: changed entries {listed}")
+                    else:
+                        head = chain_head(memory)
+                        mem_hash = short_hash(head, hash_length)
+                        print(f"[verify] memory_sha256 (short) = {mem_hash}")
+                        if head != memory.get("last_hash", ""):
+                            print("[verify] newest entry does not match chain head")
+                    continue
+
+                if cmd in {":stats", "stats"}:
+                    print(METRICS.format_table())
+                    print(f"[stats] {REPLY_CACHE.describe()}")
+                    print(f"[stats] {writer.describe()}")
+                    print(f"[stats] {MANIFEST.describe()}")
+                    if archive is not None:
+                        print(f"[stats] {archive.describe()}")
+                    if shared is not None:
+                        print(f"[stats] {shared.describe()}")
+                    print()
+                    continue
+
+                if cmd.startswith(":search") or cmd.startswith("search "):
+                    show_search(memory, index.get(memory), user_text.split()[1:], archive=archive)
+                    continue
+
+                if cmd in {":trend", "trend"}:
+                    print(analytics.format_report() + "\n")
+                    continue
+
+                if cmd.split()[0] in {":history", "history"}:
+                    args = cmd.split()[1:]
+                    count = int(args[0]) if args and args[0].isdigit() else 10
+                    show_history(memory, max(1, count), archive)
+                    continue
+
+                if cmd.split()[0] in {":export", "export"}:
+                    path, fmt, incremental = parse_export(user_text.split()[1:])
+                    export_history(memory, path, archive, fmt, incremental)
+                    continue
+
+                if cmd in {":clear", "clear"} and shared is not None:
+                    print("[clear] Not available with shared storage (other consoles use this memory).\n")
+                    continue
+
+                if cmd in {":clear", "clear"}:
+                    confirm = input(
+                        "This will erase local mini memory. "
+                        "Type 'yes' to confirm: "
+                    ).strip().lower()
+                    if confirm == "yes":
+                        memory = {"sessions": [], "last_hash": ""}
+                        pipeline.reset(memory)
+                        pending = 0
+                        merkle.sync(memory)
+                        index.sync(memory)
+                        analytics.sync(memory)
+                        if archive is not None:
+                            archive.clear()
+                        writer.snapshot(memory, sidecars)
+                        dirty = False
+                        print("[clear] Mini memory erased.\n")
+                    else:
+                        print("[clear] Cancelled; memory preserved.\n")
+                    continue
+
+                # Normal conversational turn: align -> reply -> persist -> verify -> emit
+                pipeline.run(turns, start="align", lap=lap)
+                METRICS.record("turn", time.perf_counter() - turn_start)
+    except KeyboardInterrupt:
+        print("\nExiting SSM-AIM (Mini Version). Goodbye.")
+    finally:
+        # Final save (defensive): runs on :quit, EOF and Ctrl+C alike
+        if dirty:
+            writer.snapshot(memory, sidecars)
+        writer.close()
+        if shared is not None:
+            shared.close()
+        save_verify_record(DEFAULT_MEMORY_PATH, verify_path)
+        if metrics_path:
+            save_metrics()
 
 
 if __name__ == "__main__":
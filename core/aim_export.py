@@ -0,0 +1,266 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Export the stored history as Markdown, JSONL or CSV.
+
+- Entries are streamed oldest first (archive segments, then memory.json
+  and its journal) and written in buffered chunks, so an export never
+  holds the whole history in memory.
+- The format follows the file extension (.md, .jsonl, .csv) unless one
+  is given.
+- After every export a small mark file next to it (aim_export.md ->
+  aim_export.md.mark.json) records the last seq written, its chain
+  link and the resulting file size. An incremental export appends only
+  the entries after that seq. If the export file was changed, or the
+  history no longer continues from the marked link (cleared, replaced),
+  it falls back to a full export.
+
+Usage:
+    python aim_export.py memory.json --out aim_export.jsonl --incremental
+
+Used by: aim_core.py
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from aim_archive import SessionArchive, archive_dir_for, iter_numbered_history
+from aim_lazy import load_memory_lazy
+from aim_utils import DEFAULT_MEMORY_PATH, chain_hash, format_align, journal_path_for
+
+DEFAULT_EXPORT_PATH = "aim_export.md"
+EXPORT_FORMATS = {"md": ".md", "jsonl": ".jsonl", "csv": ".csv"}
+CSV_COLUMNS = ("seq", "ts", "align", "user", "ai", "h")
+WRITE_BUFFER = 1 << 16  # bytes buffered by the file object
+FLUSH_EVERY = 1000  # entries rendered per write call
+
+MD_HEADER = "# SSM-AIM Mini Export\n\n"
+MD_EMPTY = "_No sessions stored._\n"
+
+MARK_VERSION = 1
+
+
+def mark_path_for(path: str = DEFAULT_EXPORT_PATH) -> str:
+    """
+    Return the high-water mark file that sits next to an export file
+    (the full name is kept: out.md and out.csv have separate marks).
+    """
+    return path + ".mark.json"
+
+
+def export_format_for(path: str, fmt: Optional[str] = None) -> str:
+    """The given format, else the one named by the extension (Markdown by default)."""
+    if fmt in EXPORT_FORMATS:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    for name, suffix in EXPORT_FORMATS.items():
+        if ext == suffix:
+            return name
+    return "md"
+
+
+def export_path_for(fmt: str) -> str:
+    """Default export file for a format (aim_export.md, aim_export.jsonl, ...)."""
+    root, _ = os.path.splitext(DEFAULT_EXPORT_PATH)
+    return root + EXPORT_FORMATS.get(fmt, ".md")
+
+
+# ---------- rendering ----------
+
+def _header(fmt: str) -> str:
+    if fmt == "md":
+        return MD_HEADER
+    if fmt == "csv":
+        return ",".join(CSV_COLUMNS) + "\n"
+    return ""
+
+
+def _write_chunk(f, fmt: str, chunk: List[Tuple[int, dict]]) -> None:
+    """Render a chunk of (seq, entry) into one string and write it once."""
+    buf = io.StringIO()
+    if fmt == "md":
+        for _, entry in chunk:
+            buf.write(
+                f"- Time:  {entry.get('ts', '?')}\n"
+                f"  Align: {format_align(entry.get('align', 0.0))}\n"
+                f"  User:  {entry.get('user', '')}\n"
+                f"  AI:    {entry.get('ai', '')}\n\n"
+            )
+    elif fmt == "jsonl":
+        for seq, entry in chunk:
+            buf.write(json.dumps(
+                {"seq": seq, "ts": entry.get("ts"), "user": entry.get("user"),
+                 "ai": entry.get("ai"), "align": entry.get("align"), "h": entry.get("h")},
+                ensure_ascii=False,
+            ) + "\n")
+    else:
+        writer = csv.writer(buf, lineterminator="\n")
+        for seq, entry in chunk:
+            writer.writerow([seq, entry.get("ts", ""), entry.get("align", ""),
+                             entry.get("user", ""), entry.get("ai", ""), entry.get("h", "")])
+    f.write(buf.getvalue())
+
+
+def write_entries(f, fmt: str, entries: Iterable[Tuple[int, dict]]) -> Tuple[int, int, str]:
+    """
+    Stream (seq, entry) pairs to f in chunks of FLUSH_EVERY.
+    Returns (count, last seq, last chain link).
+    """
+    count, last_seq, last_h = 0, 0, ""
+    chunk = []
+    for seq, entry in entries:
+        chunk.append((seq, entry))
+        if len(chunk) >= FLUSH_EVERY:
+            _write_chunk(f, fmt, chunk)
+            chunk = []
+        count += 1
+        last_seq, last_h = seq, entry.get("h", "")
+    if chunk:
+        _write_chunk(f, fmt, chunk)
+    return count, last_seq, last_h
+
+
+# ---------- high-water mark ----------
+
+def load_mark(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            mark = json.load(f)
+        if isinstance(mark, dict) and mark.get("version") == MARK_VERSION:
+            return mark
+    except Exception:
+        pass
+    return {}
+
+
+def save_mark(path: str, fmt: str, seq: int, h: str, size: int) -> None:
+    data = {"version": MARK_VERSION, "format": fmt, "seq": seq, "h": h, "size": size}
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps(data))
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+
+
+def _resume(
+    memory: dict, archive: Optional[SessionArchive], path: str, fmt: str, mark: dict
+) -> Tuple[Optional[Iterator[Tuple[int, dict]]], str]:
+    """
+    The entries after the mark, if the export file and the history both
+    still continue from it; else (None, why a full export is needed).
+    """
+    seq = int(mark.get("seq", 0) or 0)
+    if not mark or seq <= 0:
+        return None, "nothing exported yet"
+    if mark.get("format") != fmt:
+        return None, "format changed"
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None, "export file missing"
+    if size != mark.get("size"):
+        return None, "export file changed"
+    entries = iter_numbered_history(memory, archive, seq)
+    found = next(entries, None)
+    if found is not None and found[0] == seq and found[1].get("h", "") == mark.get("h"):
+        return entries, ""
+    if found is not None and found[0] == seq + 1 \
+            and chain_hash(mark.get("h", ""), found[1]) == found[1].get("h"):
+        # The marked entry was pruned (no archive), but the next one links to it
+        return chain([found], entries), ""
+    return None, "history does not continue from the last export"
+
+
+# ---------- export ----------
+
+def export_memory(
+    memory: dict,
+    path: str = DEFAULT_EXPORT_PATH,
+    archive: Optional[SessionArchive] = None,
+    fmt: Optional[str] = None,
+    incremental: bool = False,
+) -> dict:
+    """
+    Write the history to path (appending only new entries if
+    incremental and the mark still holds) and update the mark.
+    Returns {"path", "format", "mode", "count", "last", "reason"}.
+    """
+    fmt = export_format_for(path, fmt)
+    mark_path = mark_path_for(path)
+    mark = load_mark(mark_path)
+    entries, reason = (None, "")
+    if incremental:
+        entries, reason = _resume(memory, archive, path, fmt, mark)
+    full = entries is None
+    if full:
+        entries = iter_numbered_history(memory, archive)
+
+    newline = "" if fmt == "csv" else None
+    with open(path, "w" if full else "a", encoding="utf-8", newline=newline,
+              buffering=WRITE_BUFFER) as f:
+        if full:
+            f.write(_header(fmt))
+        count, last_seq, last_h = write_entries(f, fmt, entries)
+        if full and count == 0 and fmt == "md":
+            f.write(MD_EMPTY)
+
+    if count == 0 and not full:
+        last_seq, last_h = int(mark["seq"]), mark.get("h", "")
+    save_mark(mark_path, fmt, last_seq, last_h, os.path.getsize(path))
+    return {"path": path, "format": fmt, "mode": "full" if full else "incremental",
+            "count": count, "last": last_seq, "reason": reason if incremental else ""}
+
+
+def describe_export(result: dict) -> str:
+    """One-line summary for the console and the CLI."""
+    if result["mode"] == "incremental":
+        return (f"[export] {result['count']} new entries appended to {result['path']} "
+                f"(through #{result['last']})")
+    why = f" (full export: {result['reason']})" if result["reason"] else ""
+    return f"[export] History written to {result['path']} ({result['count']} entries){why}"
+
+
+def export_file(
+    path: str = DEFAULT_MEMORY_PATH,
+    out: Optional[str] = None,
+    fmt: Optional[str] = None,
+    incremental: bool = False,
+) -> dict:
+    """Export memory.json with its journal tail and archive, if present."""
+    journal_path = journal_path_for(path)
+    memory = load_memory_lazy(
+        path, journal_path if os.path.exists(journal_path) else None, max_sessions=0
+    )
+    archive_dir = archive_dir_for(path)
+    archive = SessionArchive.load(archive_dir) if os.path.isdir(archive_dir) else None
+    out = out or export_path_for(fmt or "md")
+    return export_memory(memory, out, archive, fmt, incremental)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export a stored SSM-AIM Mini history")
+    parser.add_argument("path", nargs="?", default=DEFAULT_MEMORY_PATH,
+                        help=f"memory file (default: {DEFAULT_MEMORY_PATH})")
+    parser.add_argument("--out", metavar="FILE", default=None,
+                        help=f"export file (default: {DEFAULT_EXPORT_PATH}, or by --format)")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default=None,
+                        help="md, jsonl or csv (default: from the --out extension)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="append only the entries added since the last export")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    print(describe_export(export_file(args.path, args.out, args.format, args.incremental)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
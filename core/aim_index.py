@@ -0,0 +1,297 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Inverted index over session history for :search.
+
+- token -> ascending list of entry seq numbers (user text; replies
+  come from a few templates and would only add the same postings to
+  every entry)
+- ts and align per seq (ts grows with seq, so "since:" is a bisect)
+- align values kept sorted for "align>x" / "align<x" range lookups;
+  appends are collected unsorted and merged in on the next range query
+
+The index follows append_session_entry as a listener and is stored
+next to memory.json as memory.index.json when memory is compacted and
+on exit, so startup only catches up the entries added since. Entries
+pruned from memory are dropped lazily and compacted away once they
+outnumber live ones.
+
+Used by: aim_core.py
+"""
+
+import bisect
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
+
+from aim_utils import DEFAULT_MEMORY_PATH, session_seq_range
+
+_TOKEN_RE = re.compile(r"\w+")
+
+SEARCH_USAGE = "[search] usage: :search <terms> [since:YYYY-MM-DD] [align>X] [align<X]"
+
+INDEX_VERSION = 2
+
+
+def index_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the index file that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".index.json"
+
+
+@lru_cache(maxsize=1024)
+def tokenize(text: str) -> FrozenSet[str]:
+    """
+    Lowercased word tokens of a text. Memoized: repeated messages and
+    query terms are tokenized only once.
+    """
+    return frozenset(_TOKEN_RE.findall((text or "").lower()))
+
+
+class SessionIndex:
+    """
+    Token, time and alignment indexes keyed by absolute entry seq.
+    Seqs from start to last are stored; those below base are pruned.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.start = 1  # seq of _ts[0] / _align[0]
+        self.base = 1  # first live seq
+        self.last = 0  # last indexed seq
+        self._ts: List[str] = []
+        self._align: List[float] = []
+        self._by_align: List[tuple] = []  # sorted (align, seq)
+        self._unsorted: List[tuple] = []  # (align, seq) appended since the last merge
+        self.postings: Dict[str, List[int]] = {}
+
+    # ---------- maintenance ----------
+
+    def add(self, seq: int, entry: dict) -> None:
+        """Index one entry; seq must be greater than any indexed so far."""
+        if seq <= self.last:
+            return
+        if not self._ts:
+            self.start = self.base = seq
+        elif seq > self.last + 1:
+            # Keep positions aligned with seq; repeat ts so it stays sorted
+            gap = seq - self.last - 1
+            self._ts.extend([self._ts[-1]] * gap)
+            self._align.extend([0.0] * gap)
+        align = float(entry.get("align", 0.0))
+        self._ts.append(str(entry.get("ts", "")))
+        self._align.append(align)
+        self._unsorted.append((align, seq))
+        for token in tokenize(entry.get("user", "")):
+            self.postings.setdefault(token, []).append(seq)
+        self.last = seq
+
+    def prune(self, first_live: int) -> None:
+        """Forget entries below first_live (lazily)."""
+        if first_live <= self.base:
+            return
+        self.base = min(first_live, self.last + 1)
+        dead = self.base - self.start
+        if dead > max(64, self.last - self.base + 1):
+            self._compact()
+
+    def _compact(self) -> None:
+        cut = self.base - self.start
+        del self._ts[:cut]
+        del self._align[:cut]
+        self.start = self.base
+        self._by_align = [p for p in self.by_align() if p[1] >= self.base]
+        for token in list(self.postings):
+            seqs = self.postings[token]
+            i = bisect.bisect_left(seqs, self.base)
+            if i >= len(seqs):
+                del self.postings[token]
+            elif i:
+                del seqs[:i]
+
+    def by_align(self) -> List[tuple]:
+        """(align, seq) pairs sorted by align, with recent appends merged in."""
+        if self._unsorted:
+            # Sorted run + short unsorted run: timsort merges in O(n)
+            self._by_align.extend(self._unsorted)
+            self._by_align.sort()
+            self._unsorted = []
+        return self._by_align
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """Listener hook for append_session_entry."""
+        first, last = session_seq_range(memory)
+        self.add(last, entry)
+        self.prune(first)
+
+    def sync(self, memory: dict) -> int:
+        """
+        Catch up with memory after load (journal replay, older index).
+        Rebuilds from scratch if the index is ahead of memory.
+        Returns the number of entries indexed.
+        """
+        sessions = memory.get("sessions", [])
+        first, last = session_seq_range(memory)
+        if self.last > last or (self._ts and self.start > first and sessions):
+            self.reset()
+        start = max(first, self.last + 1)
+        missing = last - start + 1
+        if missing > 0:
+            # Full rebuilds stream the history; catch-up reads only the tail
+            new = sessions if missing >= len(sessions) else sessions[-missing:]
+            for offset, entry in enumerate(new):
+                self.add(start + offset, entry)
+        self.prune(first)
+        return max(0, missing)
+
+    # ---------- queries ----------
+
+    def search(
+        self,
+        terms: List[str],
+        since: Optional[str] = None,
+        align_min: Optional[float] = None,
+        align_max: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Return matching seqs (ascending). All terms must match; since
+        and align bounds (exclusive) narrow the result further.
+        """
+        lo = self.base
+        if since:
+            i = bisect.bisect_left(self._ts, since, lo=lo - self.start)
+            lo = self.start + i
+        if lo > self.last:
+            return []
+
+        tokens = [t for term in terms for t in tokenize(term)]
+        if terms and not tokens:
+            return []  # nothing searchable (e.g. only punctuation)
+        if tokens:
+            lists = sorted((self.postings.get(t, []) for t in set(tokens)), key=len)
+            first = lists[0]
+            candidates = first[bisect.bisect_left(first, lo):]
+            for other in lists[1:]:
+                candidates = _intersect(candidates, other)
+                if not candidates:
+                    return []
+        elif align_min is not None or align_max is not None:
+            by_align = self.by_align()
+            a_lo = bisect.bisect_right(by_align, (align_min, float("inf"))) \
+                if align_min is not None else 0
+            a_hi = bisect.bisect_left(by_align, (align_max, -1)) \
+                if align_max is not None else len(by_align)
+            candidates = sorted(s for _, s in by_align[a_lo:a_hi] if s >= lo)
+        else:
+            candidates = list(range(lo, self.last + 1))
+
+        if align_min is None and align_max is None:
+            return candidates
+
+        out = []
+        for s in candidates:
+            a = self._align[s - self.start]
+            if align_min is not None and not a > align_min:
+                continue
+            if align_max is not None and not a < align_max:
+                continue
+            out.append(s)
+        return out
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "start": self.start,
+            "base": self.base,
+            "last": self.last,
+            "ts": self._ts,
+            "align": self._align,
+            "by_align": self.by_align(),
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "SessionIndex":
+        if raw.get("version") != INDEX_VERSION:
+            raise ValueError("index written by another version")
+        idx = cls()
+        idx.start = int(raw["start"])
+        idx.base = int(raw["base"])
+        idx.last = int(raw["last"])
+        idx._ts = list(raw["ts"])
+        idx._align = [float(a) for a in raw["align"]]
+        idx.postings = {k: list(v) for k, v in raw["postings"].items()}
+        if len(idx._ts) != idx.last - idx.start + 1 or len(idx._align) != len(idx._ts):
+            raise ValueError("index metadata does not match its range")
+        idx._by_align = [(float(a), int(s)) for a, s in raw["by_align"]]
+        return idx
+
+    @classmethod
+    def load(cls, path: str) -> "SessionIndex":
+        """Load a stored index; start empty if missing or invalid."""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except Exception:
+            return cls()
+
+    def save(self, path: str) -> None:
+        """Write to a temp file and swap it in, so a crash never leaves half an index."""
+        tmp_path = path + ".tmp"
+        try:
+            # json.dumps uses the C encoder; json.dump to a file does not
+            data = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+
+
+def _intersect(small: List[int], other: List[int]) -> List[int]:
+    """
+    Intersect two ascending seq lists. Probes with bisect when one side
+    is much shorter, otherwise uses a set.
+    """
+    if len(small) * 16 < len(other):
+        out = []
+        lo = 0
+        n = len(other)
+        for s in small:
+            lo = bisect.bisect_left(other, s, lo)
+            if lo == n:
+                break
+            if other[lo] == s:
+                out.append(s)
+        return out
+    other_set = set(other)
+    return [s for s in small if s in other_set]
+
+
+def parse_search(args: List[str]) -> dict:
+    """
+    Split ':search' arguments into terms and filters.
+    Raises ValueError on a malformed filter, or if the terms hold no
+    word to search for.
+    """
+    query = {"terms": [], "since": None, "align_min": None, "align_max": None}
+    for arg in args:
+        low = arg.lower()
+        if low.startswith("since:"):
+            query["since"] = arg[6:]
+        elif low.startswith("align>"):
+            query["align_min"] = float(arg[6:])
+        elif low.startswith("align<"):
+            query["align_max"] = float(arg[6:])
+        else:
+            query["terms"].append(arg)
+    if query["terms"] and not any(tokenize(term) for term in query["terms"]):
+        raise ValueError("no searchable words in the terms")
+    return query
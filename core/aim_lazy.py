@@ -0,0 +1,361 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Lazy loading of memory.json for fast startup on large histories.
+
+save_memory writes the header first and one entry per line (compact
+rows, expanded with the header string table), so this
+module can start the console after reading only:
+- the header (count, last_hash, seq, chain_base, ...); the string
+  table line is kept undecoded and its strings are decoded only as far
+  as the entries read so far need them,
+- the journal tail (bounded by compact_every),
+and then
+- seek-read the newest entries from the end of the file (:history,
+  chain check, new appends),
+- stream older entries only when something iterates them (:export,
+  :verify full, rebuilding an index).
+
+Random access far from the end falls back to loading everything once.
+
+Sidecar files (search index, Merkle leaves) are read on first use the
+same way, through LazySidecar.
+
+Used by: aim_core.py
+"""
+
+import json
+import os
+from collections.abc import Sequence as SequenceABC
+from json.decoder import scanstring
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from aim_utils import (
+    DEFAULT_MEMORY_PATH,
+    MEMORY_LAYOUTS,
+    MEMORY_LAYOUT_KEYS,
+    _prune_sessions,
+    decode_entry,
+    SessionStore,
+    load_memory,
+    replay_journal,
+)
+
+TAIL_BLOCK = 64 * 1024  # bytes read per step when scanning back from EOF
+TAIL_LIMIT = 4096  # deeper positions than this load the full history
+
+_STRINGS_KEY = b'"strings": ['
+
+
+class HeaderStrings(SequenceABC):
+    """
+    The header string table of a compact memory.json, kept as the raw
+    line and decoded front to back only up to the highest id asked for
+    (entries near the end mostly use the reply templates, which are
+    interned first).
+    """
+
+    def __init__(self, line: bytes) -> None:
+        self._text: Optional[str] = None
+        self._raw = line
+        self._pos = 0  # next unread char in _text
+        self._items: List[str] = []
+        self._done = False
+
+    def _decode_until(self, index: Optional[int]) -> None:
+        """Decode strings until index exists (None: all of them)."""
+        if self._done:
+            return
+        if self._text is None:
+            self._text = self._raw.decode("utf-8")
+            self._raw = b""
+            self._pos = self._text.index("[") + 1
+        text, items = self._text, self._items
+        while not self._done and (index is None or len(items) <= index):
+            pos = self._pos
+            while text[pos] in " ,\n\r":
+                pos += 1
+            if text[pos] == "]":
+                self._done = True
+                self._text = None
+                break
+            value, self._pos = scanstring(text, pos + 1)
+            items.append(value)
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self._decode_until(index)
+        else:
+            self._decode_until(None)
+        return self._items[index]
+
+    def __len__(self) -> int:
+        self._decode_until(None)
+        return len(self._items)
+
+
+def read_memory_header(path: str) -> Optional[Tuple[dict, int]]:
+    """
+    Read header keys of a line-layout memory.json.
+    Returns (header, byte offset of the first entry line), or None if
+    the file is missing or in an older layout. The string table comes
+    back as a HeaderStrings, decoded on use.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.readline().strip() != b"{":
+                return None
+            header = {}
+            while True:
+                line = f.readline()
+                if not line:
+                    return None
+                if line.startswith(_STRINGS_KEY):
+                    header["strings"] = HeaderStrings(line)
+                    continue
+                text = line.decode("utf-8").strip()
+                if text == '"sessions": [':
+                    break
+                key, value = json.loads("{" + text.rstrip(",") + "}").popitem()
+                header[key] = value
+            if header.get("layout") not in MEMORY_LAYOUTS:
+                return None
+            return header, f.tell()
+    except Exception:
+        return None
+
+
+def _entry_from_line(line: bytes, strings: Sequence[str] = ()) -> Optional[dict]:
+    text = line.strip().rstrip(b",")
+    if not text.startswith((b"[", b"{")):
+        return None
+    return decode_entry(json.loads(text), strings)
+
+
+class LazySessions:
+    """
+    List-like view of memory["sessions"] backed by memory.json.
+
+    Supports len(), iteration (streamed), negative indexing and
+    slicing near the end (seek-read), append (kept in memory until the
+    next save) and trim_front (pruning without loading). Anything else
+    loads the full list once.
+    """
+
+    def __init__(self, path: str, count: int, offset: int, strings: Sequence[str] = ()) -> None:
+        self._materialized: Optional[SessionStore] = None
+        self._reset(path, count, offset, strings)
+
+    def _reset(self, path: str, count: int, offset: int, strings: Sequence[str]) -> None:
+        self.path = path
+        self._strings = strings  # header string table of the compact layout
+        self._file_count = count  # entries still live in the file
+        self._saved_count = count
+        self._head_offset = offset  # byte offset of the first live entry
+        self._tail: List[dict] = []  # cached newest file entries
+        self._appended: List[dict] = []
+        self._materialized = None
+
+    def reopen(self, path: str) -> None:
+        """Point at a freshly saved file (called by save_memory)."""
+        found = read_memory_header(path)
+        if found is None:
+            self._materialized = SessionStore(self)
+            return
+        header, offset = found
+        self._reset(path, int(header.get("count", 0)), offset, header.get("strings", ()))
+
+    @property
+    def loaded(self) -> bool:
+        return self._materialized is not None
+
+    @property
+    def unchanged(self) -> bool:
+        """True while the view still matches the file exactly."""
+        return (
+            self._materialized is None
+            and not self._appended
+            and self._file_count == self._saved_count
+        )
+
+    # ---------- file access ----------
+
+    def _read_tail(self, n: int) -> List[dict]:
+        """Return the newest n live file entries, reading back from EOF."""
+        n = min(n, self._file_count)
+        if n <= len(self._tail):
+            return self._tail[len(self._tail) - n:]
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            # n entry lines + closing "]" and "}" lines
+            while pos > self._head_offset and buf.count(b"\n") <= n + 2:
+                step = min(TAIL_BLOCK, pos - self._head_offset)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        entries = []
+        for line in reversed(buf.split(b"\n")):
+            entry = _entry_from_line(line, self._strings)
+            if entry is not None:
+                entries.append(entry)
+                if len(entries) == n:
+                    break
+        entries.reverse()
+        self._tail = entries
+        return entries
+
+    def _iter_file(self) -> Iterator[dict]:
+        with open(self.path, "rb") as f:
+            f.seek(self._head_offset)
+            for _ in range(self._file_count):
+                entry = _entry_from_line(f.readline(), self._strings)
+                if entry is None:
+                    return
+                yield entry
+
+    def materialize(self) -> SessionStore:
+        """Load every entry once; later calls reuse the store."""
+        if self._materialized is None:
+            self._materialized = SessionStore(self._iter_file())
+            self._materialized.extend(self._appended)
+            self._appended = []
+            self._tail = []
+        return self._materialized
+
+    # ---------- list protocol ----------
+
+    def __len__(self) -> int:
+        if self._materialized is not None:
+            return len(self._materialized)
+        return self._file_count + len(self._appended)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[dict]:
+        if self._materialized is not None:
+            return iter(self._materialized)
+        return self._iter_all()
+
+    def _iter_all(self) -> Iterator[dict]:
+        yield from self._iter_file()
+        yield from list(self._appended)
+
+    def __getitem__(self, key):
+        if self._materialized is not None:
+            return self._materialized[key]
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step == 1 and n - start <= TAIL_LIMIT:
+                return self._newest(n - start)[: max(0, stop - start)]
+            return self.materialize()[key]
+        index = key + n if key < 0 else key
+        if not 0 <= index < n:
+            raise IndexError(key)
+        if n - index <= TAIL_LIMIT:
+            return self._newest(n - index)[0]
+        return self.materialize()[index]
+
+    def _newest(self, k: int) -> List[dict]:
+        """Newest k entries across file and in-memory appends."""
+        if k <= len(self._appended):
+            return self._appended[len(self._appended) - k:]
+        return self._read_tail(k - len(self._appended)) + self._appended
+
+    def append(self, entry: dict) -> None:
+        if self._materialized is not None:
+            self._materialized.append(entry)
+        else:
+            self._appended.append(entry)
+
+    def trim_front(self, k: int) -> List[dict]:
+        """Drop the k oldest entries and return them."""
+        if self._materialized is not None:
+            return self._materialized.trim_front(k)
+        dropped = []
+        with open(self.path, "rb") as f:
+            f.seek(self._head_offset)
+            while len(dropped) < k and self._file_count:
+                entry = _entry_from_line(f.readline(), self._strings)
+                if entry is None:
+                    break
+                dropped.append(entry)
+                self._file_count -= 1
+            self._head_offset = f.tell()
+        self._tail = self._tail[len(self._tail) - min(len(self._tail), self._file_count):]
+        while len(dropped) < k and self._appended:
+            dropped.append(self._appended.pop(0))
+        return dropped
+
+
+class LazySidecar:
+    """
+    A sidecar file (search index, Merkle leaves) read on first use
+    instead of at startup.
+
+    Until then appends are not followed: get(memory) loads the file and
+    the sidecar catches up through its own sync(memory), reading only
+    the entries it missed. Sidecars that must see every entry before it
+    is pruned (lane statistics) are not meant for this.
+    """
+
+    def __init__(self, load: Callable[[str], object], path: str) -> None:
+        self._load = load
+        self.path = path
+        self.value = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.value is not None
+
+    def get(self, memory: dict):
+        """The sidecar, loaded if needed and caught up with memory."""
+        if self.value is None:
+            self.value = self._load(self.path)
+        self.value.sync(memory)
+        return self.value
+
+    def sync(self, memory: dict) -> int:
+        """Catch up if loaded; a sidecar not read yet is left to get()."""
+        return self.value.sync(memory) if self.value is not None else 0
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """Listener hook for append_session_entry (only once loaded)."""
+        if self.value is not None:
+            self.value.on_append(memory, entry, dropped)
+
+    def save(self, memory: dict) -> None:
+        """Bring the file up to date (loading it first if needed)."""
+        self.get(memory).save(self.path)
+
+
+def load_memory_lazy(
+    path: str = DEFAULT_MEMORY_PATH,
+    journal_path: Optional[str] = None,
+    max_sessions: int = 0,
+) -> dict:
+    """
+    Like load_memory, but memory["sessions"] is a LazySessions view.
+    Files in the older indented layout, and files whose entries are not
+    hash-linked yet, are loaded eagerly: ensure_chain links entries in
+    place, which a view of freshly decoded rows would silently drop.
+    """
+    found = read_memory_header(path)
+    if found is None:
+        return load_memory(path, journal_path, max_sessions)
+
+    header, offset = found
+    sessions = LazySessions(path, int(header.get("count", 0)), offset, header.get("strings", ()))
+    if sessions and "h" not in sessions[-1]:
+        return load_memory(path, journal_path, max_sessions)
+    memory = {k: v for k, v in header.items() if k not in MEMORY_LAYOUT_KEYS}
+    memory.setdefault("last_hash", "")
+    memory["sessions"] = sessions
+
+    if journal_path:
+        replay_journal(memory, journal_path)
+
+    _prune_sessions(memory, max_sessions)
+    return memory
@@ -0,0 +1,293 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Merkle tree over memory["sessions"].
+
+The hash chain in aim_utils answers "is the newest history intact".
+This tree answers "is entry N (or range A..B) intact" with a proof of
+O(log n) hashes against a single root, and can point at the entries
+that differ when a root changes.
+
+Stored next to memory.json as memory.merkle.json:
+- base:   absolute seq of the first leaf (matches sessions[0])
+- leaves: one hex SHA-256 per session entry
+- root:   Merkle root over the leaves
+
+In memory the tree levels are built once and then follow appends by
+rehashing only the right edge (O(log n) nodes per leaf); they are
+rebuilt only after pruning drops leaves from the front. Entries are
+proven against the stored root, i.e. the tree as it was last saved;
+only entries appended since then are checked against the current one.
+
+Used by: aim_core.py
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+
+from aim_utils import DEFAULT_MEMORY_PATH, canonical_entry
+
+
+def merkle_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the Merkle sidecar file that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".merkle.json"
+
+
+# --------------------------------------
+# Tree primitives
+# --------------------------------------
+
+def leaf_hash(entry: dict) -> str:
+    """Leaf = H(0x00 || canonical_entry), domain-separated from nodes."""
+    return hashlib.sha256(b"\x00" + canonical_entry(entry)).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    """Node = H(0x01 || left || right)."""
+    h = hashlib.sha256(b"\x01")
+    h.update(bytes.fromhex(left))
+    h.update(bytes.fromhex(right))
+    return h.hexdigest()
+
+
+def build_levels(leaves: List[str]) -> List[List[str]]:
+    """
+    Build every level bottom-up. An unpaired last node is promoted
+    unchanged, so no leaf is ever duplicated.
+    """
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        cur = levels[-1]
+        nxt = [node_hash(cur[i], cur[i + 1]) for i in range(0, len(cur) - 1, 2)]
+        if len(cur) % 2:
+            nxt.append(cur[-1])
+        levels.append(nxt)
+    return levels
+
+
+def append_leaf(levels: List[List[str]], leaf: str) -> None:
+    """
+    Add one leaf to prebuilt levels in place, rehashing only the last
+    node of each level above it (same tree as build_levels).
+    """
+    levels[0].append(leaf)
+    depth = 0
+    while len(levels[depth]) > 1:
+        cur = levels[depth]
+        if depth + 1 == len(levels):
+            levels.append([])
+        last = len(cur) - 1
+        node = node_hash(cur[last - 1], cur[last]) if last % 2 else cur[last]
+        nxt = levels[depth + 1]
+        if last // 2 < len(nxt):
+            nxt[last // 2] = node
+        else:
+            nxt.append(node)
+        depth += 1
+
+
+def root_of(levels: List[List[str]]) -> str:
+    """Return the root of prebuilt levels ("" for an empty tree)."""
+    if not levels or not levels[-1]:
+        return ""
+    return levels[-1][0]
+
+
+def merkle_proof(levels: List[List[str]], index: int) -> List[Tuple[str, str]]:
+    """
+    Return the audit path for leaf index as (side, sibling) pairs,
+    side being "L" or "R" for where the sibling sits.
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(("L" if sibling < index else "R", level[sibling]))
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: str, proof: List[Tuple[str, str]], root: str) -> bool:
+    """Fold an audit path back up to the root (O(log n) hashes)."""
+    acc = leaf
+    for side, sibling in proof:
+        acc = node_hash(sibling, acc) if side == "L" else node_hash(acc, sibling)
+    return acc == root
+
+
+def diff_trees(old: List[List[str]], new: List[List[str]]) -> List[int]:
+    """
+    Return leaf indices that differ between two trees of equal size.
+
+    Only subtrees whose node hashes differ are descended into, so a
+    single changed entry costs O(log n) comparisons.
+    """
+    if len(old[0]) != len(new[0]):
+        raise ValueError("trees must have the same number of leaves")
+    if root_of(old) == root_of(new):
+        return []
+
+    top = len(old) - 1
+    pending = [(top, 0)]
+    changed = []
+    while pending:
+        depth, idx = pending.pop()
+        if old[depth][idx] == new[depth][idx]:
+            continue
+        if depth == 0:
+            changed.append(idx)
+            continue
+        for child in (2 * idx, 2 * idx + 1):
+            if child < len(old[depth - 1]):
+                pending.append((depth - 1, child))
+    return sorted(changed)
+
+
+# --------------------------------------
+# Session tree (persisted sidecar)
+# --------------------------------------
+
+class SessionMerkle:
+    """
+    Merkle leaves kept in step with memory["sessions"].
+
+    Leaves are only ever added for new entries (sync), never recomputed
+    from existing ones, so they stay a trusted record of what was
+    stored at append time.
+
+    The stored tree (leaves and root as last loaded or saved) is kept
+    apart from the current one, so proofs can be checked against the
+    stored root after later appends and pruning.
+    """
+
+    def __init__(self, base: int = 1, leaves: Optional[List[str]] = None) -> None:
+        self.base = base
+        self.leaves = list(leaves or [])
+        self.stored_root = ""
+        self.stored_base = base
+        self._stored_leaves: List[str] = []  # leaves the stored root was computed over
+        self._stored_levels: Optional[List[List[str]]] = None
+        self._levels: Optional[List[List[str]]] = None  # levels[0] is self.leaves
+
+    @classmethod
+    def load(cls, path: str) -> "SessionMerkle":
+        """Load a sidecar; start empty if missing or invalid."""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            tree = cls(int(raw.get("base", 1)), raw.get("leaves", []))
+            tree.stored_root = raw.get("root", "")
+            tree._stored_leaves = list(tree.leaves)
+            return tree
+        except Exception:
+            return cls()
+
+    def save(self, path: str) -> None:
+        """Persist base, leaves and root; they become the stored tree."""
+        tmp_path = path + ".tmp"
+        try:
+            root = self.root()
+            data = json.dumps({"base": self.base, "root": root, "leaves": self.leaves})
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            return
+        self.stored_root, self.stored_base = root, self.base
+        self._stored_leaves = list(self.leaves)
+        self._stored_levels = [list(level) for level in self.levels()]
+
+    def levels(self) -> List[List[str]]:
+        """Current levels: built once, then extended by sync."""
+        if self._levels is None:
+            self._levels = [self.leaves] + build_levels(self.leaves)[1:]
+        return self._levels
+
+    def root(self) -> str:
+        return root_of(self.levels())
+
+    def stored_levels(self) -> List[List[str]]:
+        """Levels of the stored tree (built on the first proof after load)."""
+        if self._stored_levels is None:
+            self._stored_levels = build_levels(self._stored_leaves)
+        return self._stored_levels
+
+    def stored_intact(self) -> bool:
+        """Do the stored leaves still hash up to the stored root?"""
+        return not self.stored_root or root_of(self.stored_levels()) == self.stored_root
+
+    def sync(self, memory: dict) -> int:
+        """
+        Follow memory["sessions"]: drop leaves for pruned entries and
+        add leaves for new ones. Returns the number of leaves added.
+        """
+        sessions = memory.get("sessions", [])
+        seq = int(memory.get("seq", len(sessions)))
+        first = seq - len(sessions) + 1
+        last = self.base + len(self.leaves) - 1
+
+        if first < self.base or last > seq:
+            # History was cleared or replaced: start over
+            self.base, self.leaves = first, []
+            self._levels = None
+            last = first - 1
+        elif first > self.base:
+            # Pruned from the front: positions shift, levels are rebuilt on use
+            del self.leaves[: first - self.base]
+            self.base = first
+            self._levels = None
+
+        missing = seq - max(last, first - 1)
+        if missing > 0:
+            # Full rebuilds stream the history; catch-up reads only the tail
+            new = sessions if missing >= len(sessions) else sessions[-missing:]
+            if self._levels is None:
+                self.leaves.extend(leaf_hash(entry) for entry in new)
+            else:
+                for entry in new:
+                    append_leaf(self._levels, leaf_hash(entry))
+        return max(0, missing)
+
+    def prove_entry(self, memory: dict, index: int) -> Tuple[bool, int, bool]:
+        """
+        Check sessions[index] with an audit path against the stored
+        root, or against the current root if the entry was appended
+        after the last save. Returns (ok, number of proof hashes,
+        checked against the stored root).
+        """
+        sessions = memory.get("sessions", [])
+        if not 0 <= index < min(len(sessions), len(self.leaves)):
+            raise IndexError(index)
+        seq = self.base + index
+        stored = bool(self.stored_root) and 0 <= seq - self.stored_base < len(self._stored_leaves)
+        if stored:
+            levels, pos, root = self.stored_levels(), seq - self.stored_base, self.stored_root
+        else:
+            levels, pos, root = self.levels(), index, self.root()
+        proof = merkle_proof(levels, pos)
+        return verify_proof(leaf_hash(sessions[index]), proof, root), len(proof), stored
+
+    def diff_memory(self, memory: dict) -> List[int]:
+        """
+        Rehash every stored entry and return the seqs whose content no
+        longer matches its leaf (descending only into differing subtrees).
+        """
+        self.sync(memory)
+        fresh = build_levels([leaf_hash(entry) for entry in memory.get("sessions", [])])
+        return [self.base + i for i in diff_trees(self.levels(), fresh)]
+
+    def diff_range(self, memory: dict, start: int, end: int) -> List[int]:
+        """
+        Rehash only sessions[start..end] (inclusive) and return the
+        indices whose content no longer matches the stored leaves.
+        """
+        sessions = memory.get("sessions", [])
+        end = min(end, len(sessions) - 1, len(self.leaves) - 1)
+        return [
+            i for i in range(max(0, start), end + 1)
+            if leaf_hash(sessions[i]) != self.leaves[i]
+        ]
@@ -0,0 +1,141 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Per-stage timing for the console loop.
+
+- one latency histogram per stage (sanitize, align, reply, persist, ...)
+- fixed log-spaced buckets (10% wide), so recording is a bisect and a
+  counter increment and memory does not grow with the number of turns
+- p50 / p95 / p99 are read from the buckets (within one bucket width)
+
+Shown by :stats, written to a JSON metrics file if one is configured.
+
+Used by: aim_core.py, aim_writer.py
+"""
+
+import bisect
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from aim_utils import current_utc_iso
+
+# Bucket upper bounds in seconds: 1 us .. ~190 s, each 10% above the last
+_BOUNDS = [1e-6 * 1.1 ** i for i in range(200)]
+PERCENTILES = (0.50, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """Count, total, max and log-bucketed distribution of durations."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(_BOUNDS) + 1)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(_BOUNDS, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th sample (seconds)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.999999))
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                bound = _BOUNDS[i] if i < len(_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """Microsecond figures for display and the metrics file."""
+        out = {
+            "count": self.count,
+            "mean_us": round(self.total / self.count * 1e6, 1) if self.count else 0.0,
+            "max_us": round(self.max * 1e6, 1),
+        }
+        for q in PERCENTILES:
+            out[f"p{int(q * 100)}_us"] = round(self.percentile(q) * 1e6, 1)
+        return out
+
+
+class Metrics:
+    """Named stage histograms (each counts its own events)."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+
+    def record(self, stage: str, seconds: float) -> None:
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages.setdefault(stage, LatencyHistogram())
+        hist.record(seconds)
+
+    def lap(self) -> Callable[[str], float]:
+        """
+        Return a stopwatch: each call lap(stage) records the time since
+        the previous call (or since lap() was created) under stage.
+        """
+        clock = time.perf_counter
+        last = [clock()]
+
+        def split(stage: str) -> float:
+            now = clock()
+            elapsed = now - last[0]
+            last[0] = now
+            self.record(stage, elapsed)
+            return elapsed
+
+        return split
+
+    def reset(self) -> None:
+        self.stages.clear()
+        self.started = time.time()
+
+    def to_dict(self, extra: Optional[dict] = None) -> dict:
+        data = {
+            "version": 1,
+            "updated": current_utc_iso(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "stages": {name: h.summary() for name, h in self.stages.items()},
+        }
+        if extra:
+            data.update(extra)
+        return data
+
+    def save(self, path: str, extra: Optional[dict] = None) -> None:
+        """Write the metrics file atomically so scrapers never see half a file."""
+        tmp_path = path + ".tmp"
+        try:
+            data = json.dumps(self.to_dict(extra), indent=2)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+
+    def format_table(self) -> str:
+        """Per-stage latency table for :stats (microseconds)."""
+        if not self.stages:
+            return "[stats] no timings recorded yet"
+        lines = [
+            f"{'stage':<10}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+        ]
+        for name, hist in self.stages.items():
+            s = hist.summary()
+            lines.append(
+                f"{name:<10}{s['count']:>8}{s['mean_us']:>10.1f}{s['p50_us']:>10.1f}"
+                f"{s['p95_us']:>10.1f}{s['p99_us']:>10.1f}{s['max_us']:>10.1f}"
+            )
+        lines.append("(times in microseconds)")
+        return "\n".join(lines)
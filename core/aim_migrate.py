@@ -0,0 +1,80 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Migrate memory.json between on-disk layouts.
+
+Every reader accepts all layouts (indented legacy JSON, "lines-1",
+"compact-1"), and the console rewrites memory in the compact layout
+on its next snapshot, so migration is optional. This tool does it up
+front and reports the size change:
+
+    python aim_migrate.py memory.json                 # rewrite in place (compact)
+    python aim_migrate.py memory.json --expand out.json
+
+--expand writes plain JSON with every entry spelled out (ts, user,
+ai, align, h), for tools that do not know the compact rows.
+Pending journal lines are folded in and entries without a hash link
+are chained before writing.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from aim_utils import (
+    compact_memory,
+    ensure_chain,
+    journal_path_for,
+    load_memory,
+    save_verify_record,
+    verify_path_for,
+)
+
+
+def migrate(path: str, expand_to: Optional[str] = None) -> dict:
+    """Rewrite path in the current layout (or expand it to expand_to)."""
+    journal_path = journal_path_for(path)
+    memory = load_memory(path, journal_path)
+    ensure_chain(memory)  # files from before the hash chain get their links now
+    before = os.path.getsize(path) if os.path.exists(path) else 0
+    if expand_to:
+        plain = dict(memory, sessions=[dict(e) for e in memory["sessions"]])
+        with open(expand_to, "w", encoding="utf-8") as f:
+            f.write(json.dumps(plain, ensure_ascii=False, indent=2))
+        target = expand_to
+    else:
+        compact_memory(memory, path, journal_path, fsync=True)
+        save_verify_record(path, verify_path_for(path))
+        target = path
+    return {
+        "path": target,
+        "entries": len(memory["sessions"]),
+        "bytes_before": before,
+        "bytes_after": os.path.getsize(target),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migrate SSM-AIM Mini memory.json layouts")
+    parser.add_argument("paths", nargs="+", metavar="FILE", help="memory.json files")
+    parser.add_argument("--expand", metavar="OUT",
+                        help="write plain expanded JSON to OUT instead (one input file)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.expand and len(args.paths) != 1:
+        print("[migrate] --expand takes exactly one input file")
+        return 2
+    for path in args.paths:
+        result = migrate(path, args.expand)
+        ratio = result["bytes_after"] / result["bytes_before"] if result["bytes_before"] else 0.0
+        print(f"[migrate] {path} -> {result['path']} | {result['entries']} entries | "
+              f"{result['bytes_before']} -> {result['bytes_after']} bytes ({ratio:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
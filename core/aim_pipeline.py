@@ -0,0 +1,309 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Turn pipeline: sanitize -> align -> reply -> persist -> verify -> emit.
+
+The console, batch mode and the server all run a message through the
+same named stages:
+
+- Each stage takes one turn (process) or a batch (process_batch). The
+  batch forms are where batching pays: align scores every text with one
+  compute_alignment_batch call, persist appends all entries and then
+  commits once (one snapshot or journal flush per batch).
+- Stages are found by name and can be swapped: replace("verify",
+  PassStage("verify")) for bulk loads, or a persist commit that hands
+  the write to another thread.
+- A turn dropped by a stage (empty text) does not reach later ones.
+- An optional guard (shared storage: the file lock, yielding how many
+  entries were merged) is held from align through the appends of
+  persist, so turns are numbered and chained after other writers'
+  entries. The commit (snapshot, compaction) runs after it is released.
+- With a Metrics stopwatch every stage is timed under its name.
+
+Used by: aim_core.py, aim_server.py
+"""
+
+from contextlib import ExitStack
+from typing import Callable, ContextManager, Iterable, List, Optional, Sequence
+
+from aim_utils import (
+    DEFAULT_HASH_LENGTH,
+    append_session_entry,
+    compute_alignment_batch,
+    compute_alignment_simple,
+    current_utc_iso,
+    sanitize_text,
+    session_seq_range,
+    short_hash,
+)
+
+STAGE_NAMES = ("sanitize", "align", "reply", "persist", "verify", "emit")
+GUARDED_STAGES = ("align", "reply", "persist")
+
+
+class Turn:
+    """One message on its way through the pipeline."""
+
+    __slots__ = ("raw", "text", "turn", "align", "reply", "ts", "entry", "dropped",
+                 "seq", "hash", "out")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self.text = ""
+        self.turn = 0  # turn index the lane was computed with
+        self.align = 0.0
+        self.reply = ""
+        self.ts = ""
+        self.entry: Optional[dict] = None  # stored entry, after persist
+        self.dropped: list = []  # entries pruned by this append
+        self.seq = 0
+        self.hash = ""  # short chain link, after verify
+        self.out = None  # whatever emit produced
+
+
+class _Capture:
+    """Listener that hands the appended entry back to the caller."""
+
+    __slots__ = ("out",)
+
+    def __init__(self, out: list) -> None:
+        self.out = out
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        self.out.append((entry, dropped))
+
+
+# ---------- stages ----------
+
+class Stage:
+    """Base stage: process_batch maps process over the turns (None drops one)."""
+
+    name = ""
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        return turn
+
+    def process_batch(self, turns: List[Turn], pipe: "TurnPipeline") -> List[Turn]:
+        kept = []
+        for turn in turns:
+            turn = self.process(turn, pipe)
+            if turn is not None:
+                kept.append(turn)
+        return kept
+
+
+class PassStage(Stage):
+    """A stage that leaves turns as they are (e.g. no verification for bulk loads)."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class SanitizeStage(Stage):
+    name = "sanitize"
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        turn.text = sanitize_text(turn.raw).strip()
+        return turn if turn.text else None
+
+
+class AlignStage(Stage):
+    """Number each turn after the pipeline's turn index and compute its lane."""
+
+    name = "align"
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        pipe.turn_index += 1
+        turn.turn = pipe.turn_index
+        turn.align = compute_alignment_simple(turn.text, turn.turn)
+        return turn
+
+    def process_batch(self, turns: List[Turn], pipe: "TurnPipeline") -> List[Turn]:
+        # Array path only: values must equal the scalar function (replay)
+        lanes = compute_alignment_batch([t.text for t in turns], pipe.turn_index + 1,
+                                        use_numpy=False)
+        for turn, lane in zip(turns, lanes):
+            pipe.turn_index += 1
+            turn.turn = pipe.turn_index
+            turn.align = lane
+        return turns
+
+
+class ReplyStage(Stage):
+    name = "reply"
+
+    def __init__(self, reply_fn: Callable[[str, float], str]) -> None:
+        self.reply_fn = reply_fn
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        turn.reply = self.reply_fn(turn.text, turn.align)
+        return turn
+
+
+class PersistStage(Stage):
+    """
+    Append each turn to memory (listeners see it as usual), release the
+    guard, then call commit(turns) once per call: once per turn, or once
+    per batch.
+
+    Replay scores an entry with its seq as turn index. Turns are numbered
+    from the retained history instead, so where that gives another lane
+    (short histories, small max_sessions) the entry records "turn".
+    """
+
+    name = "persist"
+
+    def __init__(
+        self,
+        max_sessions: int = 0,
+        listeners: Sequence = (),
+        commit: Optional[Callable[[List[Turn]], None]] = None,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.listeners = tuple(listeners)
+        self.commit = commit
+
+    def _append(self, turn: Turn, pipe: "TurnPipeline") -> None:
+        captured: list = []
+        turn.ts = current_utc_iso()
+        seq = session_seq_range(pipe.memory)[1] + 1
+        extra = None
+        if compute_alignment_simple(turn.text, seq) != turn.align:
+            extra = {"turn": turn.turn}
+        append_session_entry(
+            pipe.memory, turn.text, turn.reply, turn.align, turn.ts, self.max_sessions,
+            listeners=self.listeners + (_Capture(captured),), extra=extra,
+        )
+        turn.entry, turn.dropped = captured[0]
+        turn.seq = pipe.memory.get("seq", 0)
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        self._append(turn, pipe)
+        pipe.unguard()
+        if self.commit is not None:
+            self.commit([turn])
+        return turn
+
+    def process_batch(self, turns: List[Turn], pipe: "TurnPipeline") -> List[Turn]:
+        for turn in turns:
+            self._append(turn, pipe)
+        pipe.unguard()
+        if self.commit is not None:
+            self.commit(turns)
+        return turns
+
+
+class VerifyStage(Stage):
+    """Short form of the chain link each entry got on append."""
+
+    name = "verify"
+
+    def __init__(self, hash_length: int = DEFAULT_HASH_LENGTH) -> None:
+        self.hash_length = hash_length
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        link = turn.entry.get("h", "") if turn.entry is not None else ""
+        turn.hash = short_hash(link, self.hash_length)
+        return turn
+
+
+class EmitStage(Stage):
+    """Hand each turn to emit_fn (print, write a line, build a response)."""
+
+    name = "emit"
+
+    def __init__(self, emit_fn: Optional[Callable[[Turn], object]] = None) -> None:
+        self.emit_fn = emit_fn
+
+    def process(self, turn: Turn, pipe: "TurnPipeline") -> Optional[Turn]:
+        if self.emit_fn is not None:
+            turn.out = self.emit_fn(turn)
+        return turn
+
+
+# ---------- pipeline ----------
+
+class TurnPipeline:
+    """
+    Named stages over one memory.
+
+    memory:     the memory dict turns are appended to
+    turn_index: last turn index handed out (align numbers after it)
+    guard:      optional callable returning a context manager that
+                yields a count of entries merged meanwhile; held from
+                align until persist has appended (or unguard())
+    """
+
+    def __init__(
+        self,
+        memory: dict,
+        stages: Iterable[Stage],
+        turn_index: Optional[int] = None,
+        guard: Optional[Callable[[], ContextManager[int]]] = None,
+        metrics=None,
+    ) -> None:
+        self.memory = memory
+        self.turn_index = len(memory.get("sessions", [])) if turn_index is None else turn_index
+        self.stages: List[Stage] = list(stages)
+        self.guard = guard
+        self.metrics = metrics
+        self._held = ExitStack()
+
+    def _position(self, name: str) -> int:
+        for pos, stage in enumerate(self.stages):
+            if stage.name == name:
+                return pos
+        raise KeyError(f"no stage named {name!r}")
+
+    def stage(self, name: str) -> Stage:
+        return self.stages[self._position(name)]
+
+    def replace(self, name: str, stage: Stage) -> Stage:
+        """Swap the stage called name for stage; returns the old one."""
+        pos = self._position(name)
+        old, self.stages[pos] = self.stages[pos], stage
+        return old
+
+    def unguard(self) -> None:
+        """Release the guard if it is held (no-op otherwise)."""
+        self._held.close()
+
+    def reset(self, memory: dict, turn_index: Optional[int] = None) -> None:
+        """Point the pipeline at another memory (e.g. after :clear)."""
+        self.memory = memory
+        self.turn_index = len(memory.get("sessions", [])) if turn_index is None else turn_index
+
+    def run(
+        self,
+        turns: List[Turn],
+        start: Optional[str] = None,
+        stop: Optional[str] = None,
+        lap: Optional[Callable[[str], float]] = None,
+    ) -> List[Turn]:
+        """
+        Pass turns through the stages from start to stop (inclusive;
+        default: all). A single turn takes each stage's process path,
+        several take process_batch. Returns the turns that got through.
+        """
+        first = self._position(start) if start else 0
+        last = self._position(stop) if stop else len(self.stages) - 1
+        if lap is None and self.metrics is not None:
+            lap = self.metrics.lap()
+        entered = False  # the guard is taken at most once per run
+        with self._held:
+            for stage in self.stages[first:last + 1]:
+                if not turns:
+                    break
+                if stage.name in GUARDED_STAGES:
+                    if self.guard is not None and not entered:
+                        self.turn_index += self._held.enter_context(self.guard())
+                        entered = True
+                else:
+                    self.unguard()
+                if len(turns) == 1:
+                    turn = stage.process(turns[0], self)
+                    turns = [turn] if turn is not None else []
+                else:
+                    turns = stage.process_batch(turns, self)
+                if lap is not None:
+                    lap(stage.name)
+        return turns
@@ -0,0 +1,313 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Deterministic replay: does a stored history still reproduce?
+
+Every stored user text is run again through compute_alignment_simple
+(with its turn index) and the reply rules, and the result is compared
+with the stored align and ai fields. The turn index of an entry is its
+seq, unless the entry records another one as "turn": the console,
+batch and server modes number turns from the retained history and
+store the index whenever seq would give a different lane.
+
+- The history (archive segments, then memory.json and its journal) is
+  streamed in chunks of consecutive seqs; chunks are replayed in a
+  ProcessPoolExecutor and folded back in order.
+- Progress is checkpointed to memory.replay.json after every chunk.
+  A later run resumes after the last checked seq if the code and that
+  entry (text, reply, lane, chain link) are unchanged, so re-runs only
+  replay what was added since. --restart replays everything.
+- Mismatches are summarized by kind, as merged seq ranges and a few
+  examples.
+
+Usage:
+    python aim_replay.py memory.json --workers 8
+
+Exit status is 1 if any entry does not reproduce.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import aim_core
+import aim_rules
+import aim_utils
+from aim_archive import SessionArchive, archive_dir_for, iter_numbered_history
+from aim_core import cached_reply
+from aim_lazy import load_memory_lazy
+from aim_utils import DEFAULT_MEMORY_PATH, compute_alignment_simple, journal_path_for
+
+DEFAULT_CHUNK = 5000
+ALIGN_TOL = 1e-9  # stored align is rounded to 4 decimals, compared after rounding
+MAX_EXAMPLES = 20
+MAX_RANGES = 200
+TEXT_PREVIEW = 60
+
+CHECKPOINT_VERSION = 2
+
+
+def replay_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the replay checkpoint that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".replay.json"
+
+
+def code_fingerprint() -> str:
+    """SHA-256 over the sources that decide align and ai (lane, rules, reply)."""
+    h = hashlib.sha256()
+    sources = [aim_utils.__file__, aim_core.__file__, aim_rules.__file__,
+               aim_rules.find_rules_path()]
+    for path in sources:
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except (OSError, TypeError):
+            h.update(b"-")
+    return h.hexdigest()
+
+
+# ---------- worker side ----------
+
+def replay_chunk(task: Tuple[int, List[tuple]]) -> List[tuple]:
+    """
+    Replay rows (user, ai, align, turn) numbered start, start + 1, ...
+    (turn None: the seq is the turn index).
+    Runs in a worker process, so it only returns plain data:
+    a list of (seq, kind, stored, replayed).
+    """
+    start, rows = task
+    mismatches = []
+    for offset, (user, ai, align, turn) in enumerate(rows):
+        seq = start + offset
+        if turn is None:
+            turn = seq
+        if not isinstance(user, str) or isinstance(turn, bool) or not isinstance(turn, int):
+            mismatches.append((seq, "bad_entry", user, None))
+            continue
+        align_value = compute_alignment_simple(user, turn)
+        expected = round(align_value, 4)
+        if isinstance(align, bool) or not isinstance(align, (int, float)) \
+                or not abs(align - expected) <= ALIGN_TOL:
+            mismatches.append((seq, "align", align, expected))
+        reply = cached_reply(user, align_value)
+        if reply != ai:
+            mismatches.append((seq, "reply", ai, reply))
+    return mismatches
+
+
+# ---------- driver side ----------
+
+def new_state(source: str = "") -> dict:
+    return {
+        "version": CHECKPOINT_VERSION,
+        "source": source,
+        "code": code_fingerprint(),
+        "first": 0,  # first seq checked
+        "done": 0,  # last seq checked
+        "done_key": None,  # entry_key of that entry
+        "checked": 0,
+        "by_kind": {},
+        "ranges": [],  # merged [first, last] seqs with a mismatch
+        "ranges_dropped": 0,
+        "examples": [],
+    }
+
+
+def load_checkpoint(path: str, source: str = "") -> Optional[dict]:
+    """A stored checkpoint for the same source and code, else None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    if (not isinstance(state, dict) or state.get("version") != CHECKPOINT_VERSION
+            or state.get("source") != source or state.get("code") != code_fingerprint()):
+        return None
+    return state
+
+
+def save_checkpoint(state: dict, path: str) -> None:
+    try:
+        data = json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    except Exception:
+        pass
+
+
+def _merge(state: dict, mismatches: List[tuple]) -> None:
+    ranges = state["ranges"]
+    for seq, kind, stored, replayed in mismatches:
+        state["by_kind"][kind] = state["by_kind"].get(kind, 0) + 1
+        if len(state["examples"]) < MAX_EXAMPLES:
+            state["examples"].append([seq, kind, stored, replayed])
+        if ranges and ranges[-1][1] >= seq - 1:
+            ranges[-1][1] = max(ranges[-1][1], seq)
+        elif len(ranges) < MAX_RANGES:
+            ranges.append([seq, seq])
+        else:
+            state["ranges_dropped"] += 1
+
+
+def entry_key(row: tuple) -> str:
+    """Short digest of a replayed row and its chain link (for resuming)."""
+    data = json.dumps(list(row), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]
+
+
+def _row(entry: dict) -> tuple:
+    return entry.get("user"), entry.get("ai"), entry.get("align"), entry.get("turn")
+
+
+def _iter_chunks(
+    entries: Iterable[Tuple[int, dict]], chunk_size: int
+) -> Iterator[Tuple[Tuple[int, List[tuple]], str]]:
+    """((start, rows), key of the last entry) per run of consecutive seqs."""
+    start, rows, last = 0, [], None
+    for seq, entry in entries:
+        if rows and (len(rows) >= chunk_size or seq != start + len(rows)):
+            yield (start, rows), entry_key(rows[-1] + (last.get("h"),))
+            rows = []
+        if not rows:
+            start = seq
+        rows.append(_row(entry))
+        last = entry
+    if rows:
+        yield (start, rows), entry_key(rows[-1] + (last.get("h"),))
+
+
+def _run_chunks(chunks, workers: int):
+    """Yield (task, key, mismatches) in input order, a few chunks in flight per worker."""
+    if workers <= 1:
+        for task, key in chunks:
+            yield task, key, replay_chunk(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for task, key in chunks:
+            in_flight.append((task, key, pool.submit(replay_chunk, task)))
+            if len(in_flight) >= workers * 2:
+                task, key, future = in_flight.popleft()
+                yield task, key, future.result()
+        while in_flight:
+            task, key, future = in_flight.popleft()
+            yield task, key, future.result()
+
+
+def replay_memory(
+    memory: dict,
+    archive: Optional[SessionArchive] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    source: str = "",
+) -> dict:
+    """
+    Replay every stored entry (after the checkpoint, if it still
+    matches) and return the accumulated state.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, int(chunk_size))
+    state = load_checkpoint(checkpoint_path, source) if checkpoint_path and resume else None
+
+    entries = None
+    if state and state["done"]:
+        # Resume only if the last checked entry is unchanged
+        entries = iter_numbered_history(memory, archive, state["done"])
+        found = next(entries, None)
+        if (found is None or found[0] != state["done"]
+                or entry_key(_row(found[1]) + (found[1].get("h"),)) != state["done_key"]):
+            state, entries = None, None
+    if state is None:
+        state = new_state(source)
+        entries = iter_numbered_history(memory, archive)
+
+    for (start, rows), key, mismatches in _run_chunks(_iter_chunks(entries, chunk_size), workers):
+        _merge(state, mismatches)
+        state["first"] = state["first"] or start
+        state["done"] = start + len(rows) - 1
+        state["done_key"] = key
+        state["checked"] += len(rows)
+        if checkpoint_path:
+            save_checkpoint(state, checkpoint_path)
+    return state
+
+
+def replay_file(
+    path: str = DEFAULT_MEMORY_PATH,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+) -> dict:
+    """Replay memory.json with its journal tail and archive, if present."""
+    journal_path = journal_path_for(path)
+    memory = load_memory_lazy(
+        path, journal_path if os.path.exists(journal_path) else None, max_sessions=0
+    )
+    archive_dir = archive_dir_for(path)
+    archive = SessionArchive.load(archive_dir) if os.path.isdir(archive_dir) else None
+    return replay_memory(memory, archive, workers, chunk_size, checkpoint_path,
+                         resume, source=os.path.abspath(path))
+
+
+def _preview(value) -> str:
+    text = value if isinstance(value, str) else json.dumps(value)
+    return text if len(text) <= TEXT_PREVIEW else text[:TEXT_PREVIEW - 3] + "..."
+
+
+def format_report(state: dict, elapsed: float = 0.0) -> str:
+    """Compact mismatch report."""
+    total = sum(state["by_kind"].values())
+    span = f"#{state['first']}..#{state['done']}" if state["checked"] else "none"
+    lines = [f"[replay] {state['checked']} entries ({span}) | mismatches {total} | {elapsed:.2f}s"]
+    for kind, n in sorted(state["by_kind"].items()):
+        lines.append(f"[replay]   {kind}: {n}")
+    if state["ranges"]:
+        seqs = ", ".join(str(a) if a == b else f"{a}..{b}" for a, b in state["ranges"])
+        more = f" (+{state['ranges_dropped']} more)" if state["ranges_dropped"] else ""
+        lines.append(f"[replay]   at {seqs}{more}")
+    for seq, kind, stored, replayed in state["examples"]:
+        lines.append(f"[replay]   #{seq} {kind}: stored {_preview(stored)} "
+                     f"| replayed {_preview(replayed)}")
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a stored SSM-AIM Mini history")
+    parser.add_argument("path", nargs="?", default=DEFAULT_MEMORY_PATH,
+                        help=f"memory file (default: {DEFAULT_MEMORY_PATH})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count; 1 = no pool)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                        help=f"entries per task sent to a worker (default: {DEFAULT_CHUNK})")
+    parser.add_argument("--checkpoint", metavar="FILE", default=None,
+                        help="checkpoint file (default: memory.replay.json next to the memory)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the checkpoint and replay everything")
+    parser.add_argument("--json", metavar="FILE", help="also write the report state as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    state = replay_file(args.path, args.workers, args.chunk,
+                        args.checkpoint or replay_path_for(args.path), not args.restart)
+    print(format_report(state, time.perf_counter() - start))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state, ensure_ascii=False, indent=2))
+    return 1 if state["by_kind"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,524 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Declarative reply rules + single-pass matcher.
+
+The reply patterns live as data (manifest/rules.json) instead of an
+if-chain. At startup the table is validated and compiled once:
+
+- every keyword of every rule goes into one trie-shaped regex,
+- the regex is scanned once per message (zero-width lookahead, so
+  overlapping keywords are all seen),
+- the rule with the lowest position in the table wins, exactly like
+  the first-match order of the original if-chain.
+
+Per-message cost depends on the message length, not on the number of
+rules. If no manifest is found, the built-in table below is used, so
+the three-file setup keeps working.
+
+The console texts (banner, lane tutorial) live next to the rules in
+manifest/texts.json. The compiled result of both files is cached in
+manifest.cache.json in the data directory (next to memory.json), keyed
+by a SHA-256 over the sources and this module: a later start with the
+same key loads the cache and only compiles the matcher regex, skipping
+parsing, validation and the trie build. Any change recompiles;
+load_manifest(rebuild=True) forces it. Loading only reads the cache;
+it is written by save_cache() (the console does so at startup).
+
+Used by: aim_core.py
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_RULES_FILE = "rules.json"
+DEFAULT_TEXTS_FILE = "texts.json"
+DEFAULT_CACHE_FILE = "manifest.cache.json"
+DEFAULT_MANIFEST_DIR = "manifest"
+
+CACHE_VERSION = 1
+
+BUILTIN_RULES = {
+    "version": 1,
+    "empty": "I did not receive any content. Try typing a question, idea, or plan.",
+    "default": (
+        "Thank you for sharing. I have recorded this in the mini memory. "
+        "If you want, you can now ask a question about it, or say :history "
+        "to see recent interactions."
+    ),
+    "rules": [
+        {
+            "id": "plan",
+            "any": ["plan", "schedule"],
+            "reply": (
+                "I hear you are thinking in terms of plans or schedules. "
+                "Try breaking it into 3 small steps you can start soon. "
+                "If you like, describe Step 1 and I will help you refine it."
+            ),
+        },
+        {
+            "id": "stress",
+            "any": ["stress", "tired", "overwhelmed"],
+            "reply": (
+                "It sounds like you may be under some stress. "
+                "One option is to list just one small thing you can do next, "
+                "not everything at once. I can help you think through that next step."
+            ),
+        },
+        {
+            "id": "idea",
+            "any": ["idea", "project"],
+            "reply": (
+                "Nice, you are in idea or project mode. "
+                "Try stating the core goal in one sentence. "
+                "From there, we can outline support, risks, and next moves."
+            ),
+        },
+        {
+            "id": "symbolic",
+            "any": ["math", "symbolic", "equation", "formula"],
+            "reply": (
+                "You are thinking in a symbolic or mathematical way. "
+                "It can help to name your key variables, write a simple equation, "
+                "and separate assumptions from results. I can mirror that structure "
+                "with you in plain text."
+            ),
+        },
+        {
+            "id": "alignment",
+            "any": ["alignment", "lane", "score"],
+            "reply": (
+                "You mentioned alignment or a lane. In this mini console, each message "
+                "gets a tiny lane value a in (-1,+1) as a posture hint, not a judgment. "
+                "You can type :lane to see a brief tutorial on how it is computed."
+            ),
+        },
+        {
+            "id": "journal",
+            "any": ["journal", "diary", "note"],
+            "reply": (
+                "Treat this like a tiny journal if you wish. "
+                "You can write short notes about what happened, what you feel, "
+                "and one small thing you might try next. I will reflect it back "
+                "and keep a compact local memory for you."
+            ),
+        },
+        {
+            "id": "question",
+            "endswith": "?",
+            "reply": (
+                "You asked a question. I cannot see the full world, but I can help you "
+                "think through it step by step. Try telling me what you already know, "
+                "and what is uncertain. We can separate facts, options, and next actions."
+            ),
+        },
+    ],
+}
+
+
+BUILTIN_TEXTS = {
+    "banner": r"""
+SSM-AIM (Mini Version) — Shunyaya Symbolic Mathematical AI
+----------------------------------------------------------
+- Fully local, file-based mini personal console
+- No internet, no remote calls, no tracking
+- Memory in memory.json, with sidecars next to it
+  (journal, Merkle leaves, search index, lane stats, verify record, archive)
+
+Commands:
+  :quit           exit this mini console
+  :history [N]    show recent interactions (older ones from the archive)
+  :help           show this help again
+  :clear          erase local mini memory (with confirmation)
+  :verify         show short SHA256 chain head of memory
+  :verify full    walk the whole hash chain + full SHA256 of memory.json
+  :verify entry N     prove entry #N against the Merkle root
+  :verify range A..B  list entries #A..#B that changed since stored
+  :verify archive     check archived segments (digests, seal, chain)
+  :lane           tiny tutorial on the alignment lane
+  :export [FILE] [md|jsonl|csv] [--incremental]
+                  export history (incremental: only what is new)
+  :stats          show per-stage timings and cache counters
+  :search <terms> [since:YYYY-MM-DD] [align>X] [align<X]
+                  find past interactions
+  :trend          alignment lane statistics (EWMA, window, histogram, streaks)
+
+Type your message and press Enter to talk to SSM-AIM (Mini).
+""",
+    "lane_tutorial": """
+[lane] Mini alignment lane overview:
+
+This mini console keeps a tiny symbolic lane a in (-1,+1) per message.
+It is a posture hint, not a sentiment score or judgment.
+
+Roughly, for each message:
+  - norm_len = clamp(len(text) / 400, 0, 1)
+  - raw starts from norm_len (questions are a bit lower)
+  - raw is centered around 0 and a small drift term is added
+  - we clamp into a safe range and map with tanh(raw)
+
+So in this demo:
+  - a near +1.00 suggests detailed, settled, sustained input,
+  - a near -1.00 suggests short, questioning, or unsettled input,
+  - values near 0.00 are neutral.
+
+It is only a tiny symbolic posture signal for reflection.
+""",
+}
+TEXT_KEYS = ("banner", "lane_tutorial")
+
+
+class RuleError(ValueError):
+    """Raised when a rule table does not validate."""
+
+
+def validate_rules(table: dict) -> None:
+    """
+    Check the shape of a rule table. Each rule needs a unique id, a
+    reply, and exactly one condition: "any" (lowercase substrings) or
+    "endswith" (lowercase suffix of the stripped message). Both are
+    matched against the lowercased message, so a reply never depends on
+    case (the reply cache in aim_core.py relies on that).
+    """
+    if not isinstance(table, dict):
+        raise RuleError("rule table must be an object")
+    for key in ("empty", "default"):
+        if not isinstance(table.get(key), str):
+            raise RuleError(f"missing text for '{key}'")
+    rules = table.get("rules")
+    if not isinstance(rules, list):
+        raise RuleError("'rules' must be a list")
+
+    seen = set()
+    for pos, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise RuleError(f"rule {pos} must be an object")
+        rid = rule.get("id")
+        if not isinstance(rid, str) or not rid or rid in seen:
+            raise RuleError(f"rule {pos} needs a unique id")
+        seen.add(rid)
+        if not isinstance(rule.get("reply"), str):
+            raise RuleError(f"rule '{rid}' needs a reply")
+        conditions = [k for k in ("any", "endswith") if k in rule]
+        if len(conditions) != 1:
+            raise RuleError(f"rule '{rid}' needs exactly one of 'any' / 'endswith'")
+        if "any" in rule:
+            words = rule["any"]
+            if not isinstance(words, list) or not words:
+                raise RuleError(f"rule '{rid}': 'any' must be a non-empty list")
+            for w in words:
+                if not isinstance(w, str) or not w or w != w.lower():
+                    raise RuleError(f"rule '{rid}': keywords must be lowercase strings")
+        elif (not isinstance(rule["endswith"], str) or not rule["endswith"]
+              or rule["endswith"] != rule["endswith"].lower()):
+            raise RuleError(f"rule '{rid}': 'endswith' must be a non-empty lowercase string")
+
+
+def compile_texts(table: dict) -> Dict[str, str]:
+    """
+    Validate manifest texts: each of TEXT_KEYS is a string or a list of
+    lines (joined with newlines). Returns the joined texts.
+    """
+    if not isinstance(table, dict):
+        raise RuleError("texts must be an object")
+    texts = {}
+    for key in TEXT_KEYS:
+        value = table.get(key)
+        if isinstance(value, list) and all(isinstance(line, str) for line in value):
+            value = "\n".join(value)
+        if not isinstance(value, str):
+            raise RuleError(f"missing text for '{key}'")
+        texts[key] = value
+    return texts
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Render keywords as a prefix-shared regex. Only one branch can
+    match per character, and greedy optionals return the longest
+    keyword starting at a position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [
+            re.escape(ch) + render(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if "" in node else body
+
+    return render(trie)
+
+
+class CompiledRules:
+    """
+    A validated rule table compiled into one matcher.
+
+    source: path of the manifest, or "builtin".
+    error:  why the manifest was not used (empty if it was).
+    """
+
+    def __init__(self, table: dict, source: str = "builtin") -> None:
+        validate_rules(table)
+        self.table = table
+        self.source = source
+        self.error = ""
+        self.empty: str = table["empty"]
+        self.default: str = table["default"]
+        self.rules: List[Tuple[str, str]] = [
+            (r["id"], r["reply"]) for r in table["rules"]
+        ]
+        self._suffix_rules: List[Tuple[int, str]] = [
+            (pos, r["endswith"]) for pos, r in enumerate(table["rules"])
+            if "endswith" in r
+        ]
+
+        # Keyword -> highest-priority rule among it and its keyword prefixes
+        owner: Dict[str, int] = {}
+        for pos, r in enumerate(table["rules"]):
+            for w in r.get("any", []):
+                owner.setdefault(w, pos)
+        self._best: Dict[str, int] = {
+            w: min(p for k, p in owner.items() if w.startswith(k))
+            for w in owner
+        }
+        self._first_keyword_rule = min(owner.values()) if owner else len(self.rules)
+        self._pattern: Optional["re.Pattern[str]"] = (
+            re.compile("(?=(" + _trie_pattern(list(owner)) + "))") if owner else None
+        )
+
+    def to_cache(self) -> dict:
+        """The compiled state as plain JSON data (see from_cache)."""
+        return {
+            "empty": self.empty,
+            "default": self.default,
+            "rules": self.rules,
+            "suffix_rules": self._suffix_rules,
+            "best": self._best,
+            "first_keyword_rule": self._first_keyword_rule,
+            "pattern": self._pattern.pattern if self._pattern is not None else None,
+        }
+
+    @classmethod
+    def from_cache(cls, data: dict, source: str = "builtin") -> "CompiledRules":
+        """Rebuild from to_cache() output without validating or compiling the table again."""
+        rules = cls.__new__(cls)
+        rules.table = None  # not kept in the cache
+        rules.source = source
+        rules.error = ""
+        rules.empty = data["empty"]
+        rules.default = data["default"]
+        rules.rules = [(rid, reply) for rid, reply in data["rules"]]
+        rules._suffix_rules = [(pos, suffix) for pos, suffix in data["suffix_rules"]]
+        rules._best = data["best"]
+        rules._first_keyword_rule = data["first_keyword_rule"]
+        pattern = data["pattern"]
+        rules._pattern = re.compile(pattern) if pattern is not None else None
+        return rules
+
+    def match(self, user_text: str) -> Tuple[str, str]:
+        """
+        Return (rule id, base reply) for a message.
+        The ids "empty" and "default" are used for the two fallbacks.
+        """
+        text = (user_text or "").strip()
+        if not text:
+            return "empty", self.empty
+
+        lowered = text.lower()
+        best = len(self.rules)
+        if self._pattern is not None:
+            floor = self._first_keyword_rule
+            for m in self._pattern.finditer(lowered):
+                pos = self._best[m.group(1)]
+                if pos < best:
+                    best = pos
+                    if best == floor:
+                        break
+
+        for pos, suffix in self._suffix_rules:
+            if pos >= best:
+                break
+            if lowered.endswith(suffix):
+                best = pos
+                break
+
+        if best < len(self.rules):
+            return self.rules[best]
+        return "default", self.default
+
+    def reply_for(self, user_text: str) -> str:
+        """Return only the base reply text."""
+        return self.match(user_text)[1]
+
+
+def find_rules_path(filename: str = DEFAULT_RULES_FILE) -> Optional[str]:
+    """
+    Look for manifest/<filename> in the working directory first,
+    then next to the repository layout (core/../manifest).
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.path.join(DEFAULT_MANIFEST_DIR, filename),
+        os.path.join(here, "..", DEFAULT_MANIFEST_DIR, filename),
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return os.path.normpath(path)
+    return None
+
+
+def load_rules(path: Optional[str] = None) -> CompiledRules:
+    """
+    Load and compile the rule manifest.
+    Falls back to BUILTIN_RULES if it is missing or invalid.
+    """
+    path = path or find_rules_path()
+    if not path:
+        return CompiledRules(BUILTIN_RULES)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+        return CompiledRules(table, source=path)
+    except Exception as exc:
+        rules = CompiledRules(BUILTIN_RULES)
+        rules.error = f"{path}: {exc}"
+        return rules
+
+
+def manifest_key(paths: List[Optional[str]]) -> str:
+    """SHA-256 over the cache version, this module and each manifest source."""
+    h = hashlib.sha256(f"aim-manifest-{CACHE_VERSION}".encode("ascii"))
+    for path in [os.path.abspath(__file__)] + list(paths):
+        h.update(b"\0")
+        if path is None:
+            h.update(b"-")
+            continue
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class Manifest:
+    """
+    Reply rules plus console texts, from the compiled cache when its
+    key still matches the sources.
+
+    from_cache: True if the cache was used on the last load.
+    error:      why (part of) the manifest was not used (empty if it was).
+    """
+
+    def __init__(
+        self,
+        rules_path: Optional[str] = None,
+        texts_path: Optional[str] = None,
+        cache_path: Optional[str] = None,
+    ) -> None:
+        self.rules_path = rules_path or find_rules_path()
+        self.texts_path = texts_path or find_rules_path(DEFAULT_TEXTS_FILE)
+        if cache_path is None and (self.rules_path or self.texts_path):
+            cache_path = DEFAULT_CACHE_FILE  # data directory, not the source tree
+        self.cache_path = cache_path
+        self.key = ""
+        self.from_cache = False
+        self.rules = CompiledRules(BUILTIN_RULES)
+        self.texts = dict(BUILTIN_TEXTS)
+        self.error = ""
+
+    def load(self, rebuild: bool = False) -> "Manifest":
+        """Load from the cache, or compile the sources (the cache is not written)."""
+        self.from_cache = False
+        if not self.rules_path and not self.texts_path:
+            return self
+        try:
+            self.key = manifest_key([self.rules_path, self.texts_path])
+        except OSError as exc:
+            self.key = ""
+            self.error = str(exc)
+            return self
+        if not rebuild and self._load_cache():
+            return self
+        self._compile()
+        return self
+
+    def _load_cache(self) -> bool:
+        if not self.cache_path:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION or data.get("key") != self.key:
+                return False
+            rules = CompiledRules.from_cache(data["rules"], self.rules_path or "builtin")
+            texts = {key: data["texts"][key] for key in TEXT_KEYS}
+        except Exception:
+            return False
+        self.rules, self.texts, self.error = rules, texts, ""
+        self.from_cache = True
+        return True
+
+    def _compile(self) -> None:
+        errors = []
+        self.rules = CompiledRules(BUILTIN_RULES)
+        if self.rules_path:
+            self.rules = load_rules(self.rules_path)
+            if self.rules.error:
+                errors.append(self.rules.error)
+        self.texts = dict(BUILTIN_TEXTS)
+        if self.texts_path:
+            try:
+                with open(self.texts_path, "r", encoding="utf-8") as f:
+                    self.texts = compile_texts(json.load(f))
+            except Exception as exc:
+                errors.append(f"{self.texts_path}: {exc}")
+        self.error = "; ".join(errors)
+
+    def save_cache(self) -> None:
+        """Write the compiled state unless it came from the cache or is invalid."""
+        if not self.cache_path or not self.key or self.error or self.from_cache:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "key": self.key,
+            "rules": self.rules.to_cache(),
+            "texts": self.texts,
+        }
+        try:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+            os.replace(tmp_path, self.cache_path)
+        except Exception:
+            pass
+
+    def describe(self) -> str:
+        """One-line summary of where the manifest came from."""
+        origin = "cache" if self.from_cache else "compiled"
+        return f"manifest | {len(self.rules.rules)} rules | {origin} | {self.rules.source}"
+
+
+def load_manifest(
+    rules_path: Optional[str] = None,
+    texts_path: Optional[str] = None,
+    cache_path: Optional[str] = None,
+    rebuild: bool = False,
+    save: bool = False,
+) -> Manifest:
+    """Load rules and texts (cache when valid, else compile; save: refresh the cache)."""
+    manifest = Manifest(rules_path, texts_path, cache_path).load(rebuild)
+    if save:
+        manifest.save_cache()
+    return manifest
@@ -0,0 +1,368 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Local asyncio server: many console sessions in one process.
+
+Listens on a Unix socket or a localhost TCP port and speaks
+line-delimited JSON. One request per line, one response per line:
+
+  {"op": "hello", "client": "alice"}   -> {"ok": true, "client": "alice", "entries": 12}
+  {"op": "turn", "text": "plan"}       -> {"ok": true, "reply": "...", "align": 0.12,
+                                           "seq": 13, "hash": "a1b2c3d4e5f6"}
+  {"op": "history", "n": 5}            -> {"ok": true, "entries": [...]}
+  {"op": "verify"}                     -> {"ok": true, "head": "...", "matches": true}
+  {"op": "stats"}                      -> {"ok": true, "clients": 3, "stages": {...}}
+  {"op": "quit"}                       -> {"ok": true}  (connection closes)
+
+An optional "id" in a request is echoed back. Without "hello" a
+connection gets its own anonymous client.
+
+- each client has its own memory under <data>/<client>/memory.json
+  (same format, fsync policy and archive as the console; json or
+  journal storage, since shared storage is for several consoles on
+  one memory file and is refused at startup)
+- turns run through the console's pipeline (aim_pipeline.py: sanitize,
+  align, reply through the reply cache, append, verify, emit); only the
+  storage commit is taken out of it and awaited in the pool
+- loading and writing memory runs in a thread pool, never on the
+  event loop; memory is loaded fully there, so the stages that run on
+  the loop never read the file; requests of one client are handled
+  in order
+
+Usage:
+    python aim_server.py --port 8765 --data aim_clients
+    python aim_server.py --unix /tmp/aim.sock
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+
+from aim_utils import (
+    chain_head,
+    journal_path_for,
+    load_config,
+    load_memory,
+    DEFAULT_FSYNC,
+    DEFAULT_HASH_LENGTH,
+)
+from aim_archive import open_archive
+from aim_metrics import Metrics
+from aim_pipeline import Turn
+from aim_writer import MemoryWriter
+from aim_core import REPLY_CACHE, new_pipeline
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DATA_DIR = "aim_clients"
+MAX_LINE_BYTES = 256 * 1024  # a 4000-char message is far below this
+MAX_HISTORY = 50
+
+_CLIENT_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$")
+
+
+class ClientSession:
+    """Memory of one client, shared by all of its connections."""
+
+    def __init__(self, name: str, path: str, cfg: dict) -> None:
+        self.name = name
+        self.path = path
+        self.journal_path = journal_path_for(path) if cfg.get("storage") == "journal" else None
+        self.max_sessions = int(cfg.get("max_sessions", 50))
+        self.compact_every = int(cfg.get("compact_every", 200))
+        self.fsync = cfg.get("fsync", DEFAULT_FSYNC)
+        self.cfg = cfg
+        self.archive = None
+        self.writer = self._new_writer()
+        self.memory: dict = {"sessions": [], "last_hash": ""}
+        # Persist only appends; the commit is awaited in the I/O pool (persist())
+        self.pipeline = new_pipeline(
+            self.memory, self.max_sessions, emit=self._response,
+            hash_length=int(cfg.get("hash_length", DEFAULT_HASH_LENGTH)),
+        )
+        self.pending = 0  # journal lines since the last snapshot
+        self.lock = asyncio.Lock()
+        self.refs = 0
+        self.loaded = False
+
+    def _new_writer(self) -> MemoryWriter:
+        # Inline writer: the server already calls it from its I/O pool
+        return MemoryWriter(self.path, self.journal_path, fsync=self.fsync, background=False)
+
+    def load(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.archive = open_archive(self.cfg, self.path)
+        limit = 0 if self.archive is not None else self.max_sessions
+        # Eager, not load_memory_lazy: appends run on the event loop and
+        # must not page sessions in from disk there
+        self.memory = load_memory(self.path, self.journal_path, limit)
+        if self.archive is not None:
+            self.archive.catch_up(self.memory, self.max_sessions)
+        self.pipeline.reset(self.memory)
+        self.loaded = True
+
+    @staticmethod
+    def _response(turn: Turn) -> dict:
+        return {
+            "ok": True,
+            "reply": turn.reply,
+            "align": turn.entry["align"],
+            "seq": turn.seq,
+            "hash": turn.hash,
+        }
+
+    def persist(self, entry: dict, dropped: list) -> None:
+        """Journal the entry or rewrite the snapshot (runs in the pool)."""
+        if self.archive is not None:
+            self.archive.on_append(self.memory, entry, dropped)
+        if self.journal_path:
+            self.writer.on_append(self.memory, entry, dropped)
+            self.pending += 1
+            if self.pending < self.compact_every:
+                return
+        self.writer.snapshot(self.memory)
+        self.pending = 0
+
+    def close(self) -> None:
+        """Fold pending journal lines and fsync; stays usable afterwards."""
+        if self.pending:
+            self.writer.snapshot(self.memory)
+            self.pending = 0
+        self.writer.close()
+        self.writer = self._new_writer()
+
+
+class AimServer:
+    """Line-delimited JSON front end over per-client memories."""
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, cfg: Optional[dict] = None,
+                 workers: int = 8) -> None:
+        self.data_dir = data_dir
+        self.cfg = cfg or load_config()
+        if self.cfg.get("storage") == "shared":
+            raise ValueError(
+                'storage "shared" is not supported by the server '
+                '(each client has its own memory); use "json" or "journal"'
+            )
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aim-io")
+        self.sessions: Dict[str, ClientSession] = {}
+        self.metrics = Metrics()
+        self.connections = 0
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, partial(fn, *args))
+
+    # ---------- sessions ----------
+
+    async def acquire(self, name: str) -> ClientSession:
+        """The loaded session for name; raises if its memory cannot be loaded."""
+        while True:
+            session = self.sessions.get(name)
+            if session is None:
+                path = os.path.join(self.data_dir, name, "memory.json")
+                session = ClientSession(name, path, self.cfg)
+                self.sessions[name] = session
+            async with session.lock:
+                if self.sessions.get(name) is not session:
+                    continue  # load failed or released meanwhile: start over
+                if not session.loaded:
+                    try:
+                        await self._io(session.load)
+                    except Exception:
+                        # Not kept: the next client with this name tries again
+                        del self.sessions[name]
+                        raise
+                session.refs += 1
+                return session
+
+    async def _acquire_response(self, state: dict, name: str) -> Optional[dict]:
+        """Switch the connection to name; an error response if that fails."""
+        try:
+            session = await self.acquire(name)
+        except Exception as exc:
+            return {"ok": False, "error": f"cannot load memory of {name!r}: {exc}"}
+        old, state["session"] = state.get("session"), session
+        await self.release(old)
+        return None
+
+    async def release(self, session: Optional[ClientSession]) -> None:
+        if session is None:
+            return
+        session.refs -= 1
+        if session.refs > 0:
+            return
+        async with session.lock:
+            await self._io(session.close)
+            # Dropped only after the flush, so a reconnect never loads a half-written file
+            if session.refs == 0 and self.sessions.get(session.name) is session:
+                del self.sessions[session.name]
+
+    # ---------- requests ----------
+
+    async def handle_turn(self, session: ClientSession, text: str) -> dict:
+        turns = session.pipeline.run([Turn(text or "")], stop="sanitize")
+        if not turns:
+            return {"ok": False, "error": "empty text"}
+        async with session.lock:
+            turns = session.pipeline.run(turns, start="align", stop="persist")
+            await self._io(session.persist, turns[0].entry, turns[0].dropped)
+            return session.pipeline.run(turns, start="verify")[0].out
+
+    async def dispatch(self, state: dict, req: dict) -> dict:
+        op = req.get("op")
+        if op == "hello":
+            name = str(req.get("client", ""))
+            if not _CLIENT_RE.match(name):
+                return {"ok": False, "error": "client must be 1-64 chars of [A-Za-z0-9_.-]"}
+            failed = await self._acquire_response(state, name)
+            if failed is not None:
+                return failed
+            session = state["session"]
+            async with session.lock:
+                entries = len(session.memory["sessions"])
+            return {"ok": True, "client": name, "entries": entries}
+        if op == "stats":
+            return {
+                "ok": True,
+                "clients": len(self.sessions),
+                "connections": self.connections,
+                "stages": self.metrics.to_dict()["stages"],
+                "reply_cache": REPLY_CACHE.stats(),
+            }
+        if op == "quit":
+            return {"ok": True}
+
+        if state.get("session") is None:
+            failed = await self._acquire_response(state, f"anon-{uuid.uuid4().hex[:12]}")
+            if failed is not None:
+                return failed
+        session = state["session"]
+
+        if op == "turn":
+            return await self.handle_turn(session, str(req.get("text", "")))
+        if op == "history":
+            n = max(1, min(MAX_HISTORY, int(req.get("n", 5))))
+            async with session.lock:
+                entries = await self._io(lambda: list(session.memory["sessions"][-n:]))
+            return {"ok": True, "entries": entries}
+        if op == "verify":
+            async with session.lock:
+                head = await self._io(chain_head, session.memory)
+                stored = session.memory.get("last_hash", "")
+            return {"ok": True, "head": head, "matches": head == stored}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        state: dict = {"session": None}
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                start = loop.time()
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise ValueError("request must be a JSON object")
+                    resp = await self.dispatch(state, req)
+                except (ValueError, TypeError) as exc:
+                    req, resp = {}, {"ok": False, "error": f"bad request: {exc}"}
+                if "id" in req:
+                    resp["id"] = req["id"]
+                self.metrics.record(str(req.get("op", "invalid")), loop.time() - start)
+                writer.write((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+                if req.get("op") == "quit":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            await self.release(state["session"])
+            writer.close()
+            self._handlers.pop(asyncio.current_task(), None)
+
+    # ---------- lifecycle ----------
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_path:
+            self._server = await asyncio.start_unix_server(
+                self.serve_client, path=unix_path, limit=MAX_LINE_BYTES
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.serve_client, host=host, port=port, limit=MAX_LINE_BYTES
+            )
+        return self._server
+
+    async def close(self) -> None:
+        """Stop listening and flush every open client memory."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Closing the transports ends each handler's read loop; let them release
+        for writer in list(self._handlers.values()):
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        for session in list(self.sessions.values()):
+            async with session.lock:
+                await self._io(session.close)
+        self.sessions.clear()
+        self.pool.shutdown(wait=True)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SSM-AIM (Mini Version) local server")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"TCP host (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--data", default=DEFAULT_DATA_DIR,
+                        help=f"directory for per-client memory (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--workers", type=int, default=8, help="storage I/O threads (default: 8)")
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    cfg = load_config()
+    REPLY_CACHE.resize(int(cfg.get("reply_cache_size", REPLY_CACHE.capacity)))
+    server = AimServer(args.data, cfg, args.workers)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or "%s:%d" % listener.sockets[0].getsockname()[:2]
+    print(f"[server] listening on {where} | data in {args.data}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except ValueError as exc:
+        sys.exit(f"[server] {exc}")
+    except KeyboardInterrupt:
+        print("\n[server] stopped; client memories saved.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
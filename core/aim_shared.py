@@ -0,0 +1,332 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Shared memory: several consoles (or batch runs) in one directory.
+
+With "storage": "shared" every process appends to the same
+memory.journal.jsonl under an fcntl advisory lock on memory.lock:
+
+- A turn takes the lock, reads the journal lines other processes
+  appended since its last look (a byte offset into the journal),
+  applies them to its own memory, appends its own entry as one line
+  and releases the lock. The lock is held for that short read and one
+  append, never for a whole-file rewrite.
+- New entries are numbered and chained after everything merged, so
+  seq and the hash chain stay linear across writers.
+- Compaction writes the snapshot without the lock. Under the lock it
+  is swapped in (unless another writer already stored a newer one)
+  and the journal is rewritten with only the lines after it. Other
+  writers notice the new journal (a rotation counter kept in the lock
+  file) and take the entries that moved into memory.json from its tail.
+
+memory is loaded eagerly in this mode, since another writer may
+replace memory.json at any time.
+
+Used by: aim_core.py, aim_writer.py
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, shared storage is unavailable
+    fcntl = None
+
+from aim_lazy import LazySessions, read_memory_header
+from aim_utils import (
+    DEFAULT_MEMORY_PATH,
+    _prune_sessions,
+    journal_line,
+    journal_path_for,
+    load_memory,
+    save_memory,
+    session_seq_range,
+)
+
+GENERATION_WIDTH = 21  # lock file content: zero-padded rotation counter + newline
+
+
+def lock_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the lock file that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".lock"
+
+
+def shared_available() -> bool:
+    """True if this platform has fcntl advisory locks."""
+    return fcntl is not None
+
+
+def open_shared(cfg: dict, path: str = DEFAULT_MEMORY_PATH) -> Optional["SharedJournal"]:
+    """The shared journal for "storage": "shared", or None (other modes, no fcntl)."""
+    if cfg.get("storage") != "shared" or fcntl is None:
+        return None
+    return SharedJournal(path, journal_path_for(path), fsync=cfg.get("fsync") == "turn")
+
+
+def apply_entry(memory: dict, entry: dict, seq: int, max_sessions: int,
+                listeners: Sequence = ()) -> None:
+    """Add an entry another writer already chained and numbered."""
+    memory.setdefault("sessions", []).append(entry)
+    memory["seq"] = seq
+    if "h" in entry:
+        memory["last_hash"] = entry["h"]
+    dropped = _prune_sessions(memory, max_sessions)
+    for listener in listeners:
+        listener.on_append(memory, entry, dropped)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class SharedJournal:
+    """One process's handle on the shared journal and its lock."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_MEMORY_PATH,
+        journal_path: Optional[str] = None,
+        fsync: bool = False,
+    ) -> None:
+        if fcntl is None:
+            raise RuntimeError("shared storage needs fcntl advisory locks")
+        self.path = path
+        self.journal_path = journal_path or journal_path_for(path)
+        self.lock_path = lock_path_for(path)
+        self.fsync = fsync  # fsync every appended line
+        self._thread_lock = threading.RLock()  # flock does not exclude threads
+        self._fd: Optional[int] = None
+        self._depth = 0
+        self._held_since = 0.0
+        self._generation: Optional[int] = None  # journal rotations seen so far
+        self._offset = 0  # journal bytes already merged or written by us
+        self.locks = 0
+        self.merged = 0  # entries taken from other writers
+        self.appended = 0  # entries written by this process
+        self.reloads = 0
+        self.wait_total = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+    # ---------- lock ----------
+
+    def acquire(self) -> None:
+        """Take the lock (re-entrant within this process)."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            start = time.perf_counter()
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._held_since = time.perf_counter()
+            self.wait_total += self._held_since - start
+            self.locks += 1
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            held = time.perf_counter() - self._held_since
+            self.hold_total += held
+            self.hold_max = max(self.hold_max, held)
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    @contextmanager
+    def locked(
+        self, memory: Optional[dict] = None, max_sessions: int = 0, listeners: Sequence = ()
+    ) -> Iterator[int]:
+        """
+        Hold the lock. With memory, other writers' entries are merged
+        first; yields how many were merged.
+        """
+        self.acquire()
+        try:
+            yield self.merge(memory, max_sessions, listeners) if memory is not None else 0
+        finally:
+            self.release()
+
+    def _read_generation(self) -> int:
+        """
+        Rotation counter stored in the lock file. File identity (inode)
+        is not enough: a rotated journal may get a freed inode back.
+        """
+        raw = os.pread(self._fd, GENERATION_WIDTH, 0)
+        return int(raw) if raw.strip() else 0
+
+    def _bump_generation(self) -> int:
+        generation = self._read_generation() + 1
+        os.pwrite(self._fd, b"%0*d\n" % (GENERATION_WIDTH - 1, generation), 0)
+        return generation
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # ---------- reading other writers ----------
+
+    def merge(self, memory: dict, max_sessions: int = 0, listeners: Sequence = ()) -> int:
+        """
+        Apply entries other writers added since the last look (the
+        lock must be held). Listeners get on_append for each of them;
+        those with refresh() (the archive) reload their files first.
+        Returns the number of entries applied.
+        """
+        for listener in listeners:
+            refresh = getattr(listener, "refresh", None)
+            if refresh is not None:
+                refresh()
+        merged = 0
+        generation, size = self._read_generation(), _file_size(self.journal_path)
+        if generation != self._generation or size < self._offset:
+            # Rotated by a compaction: what we have not seen is in memory.json
+            self._generation, self._offset = generation, 0
+            merged += self._merge_snapshot(memory, max_sessions, listeners)
+        if size > self._offset:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            end = data.rfind(b"\n") + 1  # a torn last line (crash) is left alone
+            self._offset += end
+            for line in data[:end].splitlines():
+                try:
+                    rec = json.loads(line)
+                    seq, entry = int(rec["seq"]), rec["entry"]
+                except Exception:
+                    continue
+                last = session_seq_range(memory)[1]
+                if seq <= last or not isinstance(entry, dict):
+                    continue
+                if seq != last + 1:
+                    merged += self._reload(memory, max_sessions, listeners)
+                    break
+                apply_entry(memory, entry, seq, max_sessions, listeners)
+                merged += 1
+        self.merged += merged
+        return merged
+
+    def _merge_snapshot(self, memory: dict, max_sessions: int, listeners: Sequence) -> int:
+        """Take entries folded into memory.json by another writer from its tail."""
+        found = read_memory_header(self.path)
+        if found is None:
+            return 0
+        header, offset = found
+        count = int(header.get("count", 0))
+        last = session_seq_range(memory)[1]
+        missing = int(header.get("seq", count)) - last
+        if missing <= 0:
+            return 0
+        if missing > count:
+            return self._reload(memory, max_sessions, listeners)
+        view = LazySessions(self.path, count, offset, header.get("strings", ()))
+        for i, entry in enumerate(view[count - missing:]):
+            apply_entry(memory, entry, last + 1 + i, max_sessions, listeners)
+        return missing
+
+    def _reload(self, memory: dict, max_sessions: int, listeners: Sequence) -> int:
+        """
+        Too far behind to merge entry by entry (they were already
+        pruned by the others): load memory.json and the journal again
+        and let listeners with sync() catch up.
+        """
+        before = session_seq_range(memory)[1]
+        fresh = load_memory(self.path, self.journal_path, max_sessions)
+        memory.clear()
+        memory.update(fresh)
+        self._generation = self._read_generation()
+        self._offset = _file_size(self.journal_path)
+        for listener in listeners:
+            sync = getattr(listener, "sync", None)
+            if sync is not None:
+                sync(memory)
+        self.reloads += 1
+        return max(0, session_seq_range(memory)[1] - before)
+
+    # ---------- writing ----------
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """
+        Listener hook for append_session_entry: write the journal line
+        now. Call under locked(memory, ...) so the entry was numbered
+        after every other writer's.
+        """
+        line = journal_line(entry, session_seq_range(memory)[1]).encode("utf-8")
+        with self.locked():
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                if self.fsync:
+                    os.fsync(fd)
+                self._offset = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        self.appended += 1
+
+    def compact(self, memory: dict, fsync: bool = False,
+                after: Sequence[Callable[[], None]] = ()) -> bool:
+        """
+        Fold the journal into memory.json. The snapshot is written
+        without the lock; the swap, the journal rewrite and the after
+        callbacks (sidecars) run under it. Returns False if another
+        writer had already stored a newer snapshot (ours is dropped).
+        """
+        snap_seq = session_seq_range(memory)[1]
+        staged = f"{self.path}.{os.getpid()}.staged"  # one per writer: written unlocked
+        save_memory(memory, staged, fsync=fsync)
+        with self.locked():
+            found = read_memory_header(self.path)
+            stored = int(found[0].get("seq", found[0].get("count", 0))) if found else -1
+            fresh = os.path.exists(staged) and stored < snap_seq
+            if fresh:
+                os.replace(staged, self.path)
+                self._rotate(snap_seq)
+            else:
+                try:
+                    os.remove(staged)
+                except OSError:
+                    pass
+            for callback in after:
+                callback()
+        return fresh
+
+    def _rotate(self, snap_seq: int) -> None:
+        """Rewrite the journal with only the lines after snap_seq."""
+        keep = []
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if int(json.loads(line)["seq"]) > snap_seq:
+                            keep.append(line)
+                    except Exception:
+                        continue
+        except FileNotFoundError:
+            pass
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(keep))
+        os.replace(tmp_path, self.journal_path)
+        # Lines kept here are merged (or skipped as ours) on the next look
+        self._generation, self._offset = self._bump_generation(), 0
+
+    def describe(self) -> str:
+        """One-line summary for :stats."""
+        n = max(1, self.locks)
+        return (
+            f"shared | merged {self.merged} | appended {self.appended} | "
+            f"reloads {self.reloads} | lock wait avg {self.wait_total / n * 1000:.2f} ms | "
+            f"hold avg {self.hold_total / n * 1000:.2f} ms, max {self.hold_max * 1000:.2f} ms"
+        )
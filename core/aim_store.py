@@ -0,0 +1,256 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Columnar in-memory session store.
+
+A list of dicts repeats the keys ts / user / ai / align / h in every
+entry and prunes by copying the list. SessionStore keeps one column
+per field in a ring buffer instead:
+
+- ts:    array('q') of UTC epoch seconds (the "...Z" text is rebuilt)
+- align: array('d')
+- h:     32 raw bytes per entry in one bytearray
+- user / ai: plain lists (reply strings are shared with the cache)
+
+With a capacity of max_sessions, append and pruning (trim_front) are
+O(1): the oldest slots are simply reused. Entries that do not fit the
+columns (older files without hashes, other timestamp formats, extra
+keys) are kept as the original dicts.
+
+The store behaves like the old list: len(), iteration, indexing and
+slicing, append, ==. Indexing returns a SessionEntry, a small
+dict-compatible view of one slot (entry["ai"], entry.get("h"),
+"h" in entry, dict(entry)). Slices return plain dicts, like a list
+slice returns copies.
+
+Used by: aim_utils.py (load_memory), aim_lazy.py
+"""
+
+import calendar
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Iterable, Iterator, List, Optional
+
+ENTRY_KEYS = ("ts", "user", "ai", "align", "h")
+HASH_BYTES = 32
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def pack_ts(ts) -> Optional[int]:
+    """Epoch seconds for a 'YYYY-MM-DDTHH:MM:SSZ' string, None if it does not round-trip."""
+    if not (isinstance(ts, str) and len(ts) == 20 and ts[10] == "T" and ts[19] == "Z"):
+        return None
+    try:
+        value = calendar.timegm((
+            int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+            int(ts[11:13]), int(ts[14:16]), int(ts[17:19]),
+        ))
+    except (ValueError, OverflowError):
+        return None
+    return value if unpack_ts(value) == ts else None
+
+
+def unpack_ts(value: int) -> str:
+    return time.strftime(_TS_FORMAT, time.gmtime(value))
+
+
+def _pack_hash(h) -> Optional[bytes]:
+    if not (isinstance(h, str) and len(h) == 2 * HASH_BYTES):
+        return None
+    try:
+        raw = bytes.fromhex(h)
+    except ValueError:
+        return None
+    return raw if raw.hex() == h else None
+
+
+class SessionEntry(Mapping):
+    """
+    Read/write view of one stored entry.
+
+    A view follows its slot: once the entry is pruned the slot is
+    reused, so keep dict(entry) rather than the view itself if it
+    must outlive the next appends.
+    """
+
+    __slots__ = ("_store", "_slot")
+
+    def __init__(self, store: "SessionStore", slot: int) -> None:
+        self._store = store
+        self._slot = slot
+
+    def __getitem__(self, key: str):
+        store, slot = self._store, self._slot
+        if key == "ts":
+            return unpack_ts(store._ts[slot])
+        if key == "user":
+            return store._user[slot]
+        if key == "ai":
+            return store._ai[slot]
+        if key == "align":
+            return store._align[slot]
+        if key == "h":
+            start = slot * HASH_BYTES
+            return store._h[start:start + HASH_BYTES].hex()
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        entry = self.to_dict()
+        entry[key] = value
+        self._store._put(self._slot, entry)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ENTRY_KEYS)
+
+    def __len__(self) -> int:
+        return len(ENTRY_KEYS)
+
+    def __contains__(self, key) -> bool:
+        return key in ENTRY_KEYS
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        # Hot path: canonical_entry / chain hashing read every field
+        store, slot = self._store, self._slot
+        start = slot * HASH_BYTES
+        return [
+            ("ts", unpack_ts(store._ts[slot])),
+            ("user", store._user[slot]),
+            ("ai", store._ai[slot]),
+            ("align", store._align[slot]),
+            ("h", store._h[start:start + HASH_BYTES].hex()),
+        ]
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"SessionEntry({self.to_dict()!r})"
+
+
+class SessionStore:
+    """
+    Ring buffer of session entries in columns.
+
+    capacity is the expected maximum length (max_sessions); 0 means
+    unbounded. The buffer grows if more entries are kept than that.
+    """
+
+    __slots__ = ("capacity", "_size", "_head", "_len",
+                 "_ts", "_align", "_h", "_user", "_ai", "_odd")
+
+    def __init__(self, entries: Iterable[dict] = (), capacity: int = 0) -> None:
+        self.capacity = max(0, int(capacity or 0))
+        self._head = 0
+        self._len = 0
+        # One spare slot: append_session_entry appends before it prunes
+        self._alloc(self.capacity + 1 if self.capacity else 16)
+        for entry in entries:
+            self.append(entry)
+
+    def _alloc(self, size: int) -> None:
+        self._size = size
+        self._ts = array("q", bytes(8 * size))
+        self._align = array("d", bytes(8 * size))
+        self._h = bytearray(HASH_BYTES * size)
+        self._user: List[Optional[str]] = [None] * size
+        self._ai: List[Optional[str]] = [None] * size
+        self._odd = {}  # slot -> entry dict that does not fit the columns
+
+    def _grow(self) -> None:
+        entries = [self._entry(self._slot(i)) for i in range(self._len)]
+        entries = [e.to_dict() if isinstance(e, SessionEntry) else e for e in entries]
+        self._alloc(self._size * 2)
+        self._head = 0
+        self._len = 0
+        for entry in entries:
+            self.append(entry)
+
+    def _slot(self, index: int) -> int:
+        return (self._head + index) % self._size
+
+    def _put(self, slot: int, entry) -> None:
+        """Store entry in slot, in the columns if it fits them."""
+        ts = pack_ts(entry.get("ts"))
+        h = _pack_hash(entry.get("h"))
+        user, ai, align = entry.get("user"), entry.get("ai"), entry.get("align")
+        if (
+            ts is None or h is None or len(entry) != len(ENTRY_KEYS)
+            or not (isinstance(user, str) and isinstance(ai, str) and type(align) is float)
+        ):
+            self._odd[slot] = entry if isinstance(entry, dict) else dict(entry)
+            self._user[slot] = self._ai[slot] = None
+            return
+        self._odd.pop(slot, None)
+        self._ts[slot] = ts
+        self._align[slot] = align
+        self._h[slot * HASH_BYTES:(slot + 1) * HASH_BYTES] = h
+        self._user[slot] = user
+        self._ai[slot] = ai
+
+    def _entry(self, slot: int):
+        odd = self._odd.get(slot) if self._odd else None
+        return odd if odd is not None else SessionEntry(self, slot)
+
+    # ---------- list protocol ----------
+
+    def append(self, entry: dict) -> None:
+        if self._len == self._size:
+            self._grow()
+        self._put(self._slot(self._len), entry)
+        self._len += 1
+
+    def extend(self, entries: Iterable[dict]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def trim_front(self, k: int) -> List[dict]:
+        """Drop the k oldest entries (O(k)) and return them as dicts."""
+        k = max(0, min(k, self._len))
+        dropped = []
+        for _ in range(k):
+            slot = self._head
+            entry = self._entry(slot)
+            dropped.append(entry.to_dict() if isinstance(entry, SessionEntry) else entry)
+            self._odd.pop(slot, None)
+            self._user[slot] = self._ai[slot] = None
+            self._head = (slot + 1) % self._size
+            self._len -= 1
+        return dropped
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._len):
+            yield self._entry(self._slot(i))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [
+                dict(self._entry(self._slot(i)))
+                for i in range(*key.indices(self._len))
+            ]
+        index = key + self._len if key < 0 else key
+        if not 0 <= index < self._len:
+            raise IndexError(key)
+        return self._entry(self._slot(index))
+
+    def __eq__(self, other) -> bool:
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SessionStore(len={self._len}, capacity={self.capacity})"
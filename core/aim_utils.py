@@ -7,6 +7,9 @@ Intentionally tiny:
 - Simple symbolic-style alignment lane in (-1, +1)
 - No external dependencies, no network calls
 - Configurable max_sessions + hash_length if config.json exists
+- Optional append-only journal storage (memory.journal.jsonl)
+- Per-entry SHA-256 hash chain for constant-cost tamper evidence
+- Batched alignment lane (array module; NumPy only if installed)
 
 Used by: aim_core.py
 """
@@ -15,8 +18,13 @@ import json
 import os
 import math
 import hashlib
+import re
 import unicodedata
+from array import array
 from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+from aim_store import SessionStore
 
 # --------------------------------------
 # Defaults + config loader
@@ -27,17 +35,56 @@ DEFAULT_CONFIG_PATH = "config.json"
 
 DEFAULT_MAX_SESSIONS = 50
 DEFAULT_HASH_LENGTH = 12
+DEFAULT_STORAGE = "json"  # "json" (full rewrite), "journal" (append-only) or "shared"
+DEFAULT_COMPACT_EVERY = 200  # journal lines before folding into memory.json
+DEFAULT_REPLY_CACHE_SIZE = 256  # memoized replies (0 disables)
+DEFAULT_BACKGROUND_WRITES = False  # persist from a writer thread
+DEFAULT_FSYNC = "exit"  # "turn", "exit" or milliseconds between fsyncs
+DEFAULT_METRICS_FILE = ""  # JSON timing metrics ("" disables)
+DEFAULT_VERIFY_FULL_ON_START = False  # rehash memory.json even if its stat matches
+DIGEST_CHUNK = 1024 * 1024  # read size when hashing whole files
+DEFAULT_ARCHIVE = "off"  # pruned entries are dropped ("gzip"/"lzma" archive them)
+DEFAULT_ARCHIVE_SEGMENT_SIZE = 500  # entries per sealed archive segment
 MAX_INPUT_CHARS = 4000  # safety cap for console cleanliness
 
+STORAGE_MODES = ("json", "journal", "shared")
+FSYNC_MODES = ("turn", "exit")
+ARCHIVE_MODES = ("gzip", "lzma", "off")
+
+# memory.json header keys written by save_memory, not part of memory itself
+MEMORY_LAYOUT = "compact-1"  # written by save_memory
+MEMORY_LAYOUTS = ("lines-1", "compact-1")  # readable line layouts
+MEMORY_LAYOUT_KEYS = ("layout", "count", "strings")
+
+# Lane suffixes appended by aim_core.add_alignment_suffix (band -1 / +1).
+# The compact layout stores replies as template + suffix references.
+LANE_SUFFIXES = {
+    -1: " You can pause, breathe, and take it one small step at a time.",
+    1: " This looks reasonably focused; you can build on it steadily.",
+}
+ALIGN_SCALE = 10000  # align is stored rounded to 4 decimals
+LANE_BAND_EDGE = 0.3  # |align| beyond this picks a lane suffix
+
 
 def load_config(path: str = DEFAULT_CONFIG_PATH) -> dict:
     """
-    Load basic config (max_sessions, hash_length) if present.
+    Load basic config (max_sessions, hash_length, storage, compact_every,
+    reply_cache_size, background_writes, fsync, metrics_file,
+    verify_full_on_start, archive, archive_segment_size) if present.
     Otherwise return defaults.
     """
     cfg = {
         "max_sessions": DEFAULT_MAX_SESSIONS,
         "hash_length": DEFAULT_HASH_LENGTH,
+        "storage": DEFAULT_STORAGE,
+        "compact_every": DEFAULT_COMPACT_EVERY,
+        "reply_cache_size": DEFAULT_REPLY_CACHE_SIZE,
+        "background_writes": DEFAULT_BACKGROUND_WRITES,
+        "fsync": DEFAULT_FSYNC,
+        "metrics_file": DEFAULT_METRICS_FILE,
+        "verify_full_on_start": DEFAULT_VERIFY_FULL_ON_START,
+        "archive": DEFAULT_ARCHIVE,
+        "archive_segment_size": DEFAULT_ARCHIVE_SEGMENT_SIZE,
     }
     if not os.path.exists(path):
         return cfg
@@ -49,6 +96,26 @@ def load_config(path: str = DEFAULT_CONFIG_PATH) -> dict:
                 cfg["max_sessions"] = int(raw["max_sessions"])
             if "hash_length" in raw:
                 cfg["hash_length"] = int(raw["hash_length"])
+            if raw.get("storage") in STORAGE_MODES:
+                cfg["storage"] = raw["storage"]
+            if "compact_every" in raw:
+                cfg["compact_every"] = max(1, int(raw["compact_every"]))
+            if "reply_cache_size" in raw:
+                cfg["reply_cache_size"] = max(0, int(raw["reply_cache_size"]))
+            if "background_writes" in raw:
+                cfg["background_writes"] = bool(raw["background_writes"])
+            if raw.get("fsync") in FSYNC_MODES:
+                cfg["fsync"] = raw["fsync"]
+            elif isinstance(raw.get("fsync"), (int, float)) and raw["fsync"] >= 0:
+                cfg["fsync"] = int(raw["fsync"])
+            if isinstance(raw.get("metrics_file"), str):
+                cfg["metrics_file"] = raw["metrics_file"]
+            if "verify_full_on_start" in raw:
+                cfg["verify_full_on_start"] = bool(raw["verify_full_on_start"])
+            if raw.get("archive") in ARCHIVE_MODES:
+                cfg["archive"] = raw["archive"]
+            if "archive_segment_size" in raw:
+                cfg["archive_segment_size"] = max(1, int(raw["archive_segment_size"]))
     except Exception:
         pass
     return cfg
@@ -63,62 +130,394 @@ def current_utc_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
-def load_memory(path: str = DEFAULT_MEMORY_PATH) -> dict:
+def journal_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the journal file that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".journal.jsonl"
+
+
+def verify_path_for(path: str = DEFAULT_MEMORY_PATH) -> str:
+    """Return the verification record that sits next to a memory snapshot."""
+    root, _ = os.path.splitext(path)
+    return root + ".verify.json"
+
+
+def load_memory(
+    path: str = DEFAULT_MEMORY_PATH,
+    journal_path: Optional[str] = None,
+    max_sessions: int = 0,
+) -> dict:
     """
     Load AIM mini memory from JSON.
     Start fresh if file invalid.
+
+    If journal_path is given, entries appended after the last
+    compaction are replayed on top of the snapshot.
+
+    Sessions come back as a SessionStore (aim_store.py) sized for
+    max_sessions, so later appends prune in O(1).
     """
-    if not os.path.exists(path):
-        return {"sessions": [], "last_hash": ""}
+    memory = {"sessions": [], "last_hash": ""}
+
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and "sessions" in data:
+                memory = expand_memory(data)
+        except Exception:
+            pass
 
+    if journal_path:
+        replay_journal(memory, journal_path)
+
+    _prune_sessions(memory, max_sessions)
+    memory["sessions"] = SessionStore(memory["sessions"], max_sessions)
+    return memory
+
+
+# --------------------------------------
+# Compact entry codec (layout "compact-1")
+# --------------------------------------
+#
+# Replies come from a handful of rule templates plus an optional lane
+# suffix, and users repeat themselves, so entries are stored as
+#
+#   [ts, user, template, suffix, align, h]
+#
+# user / template: index into the header "strings" table, or the text
+# suffix:          index into "strings", or -1 for none
+# align:           int = align * 10000 (4 decimals), or a float as is
+# h:               chain hash, or null
+#
+# plus a trailing {...} with any other keys. Entries that do not fit
+# (missing or odd-typed fields) are written as plain objects. Decoding
+# rebuilds the exact dict, so chain hashes still verify.
+
+_ENTRY_KEYS = ("ts", "user", "ai", "align", "h")
+
+
+class StringTable:
+    """Interned strings for one compact snapshot."""
+
+    def __init__(self, sessions: Iterable[dict] = ()) -> None:
+        self.strings: List[str] = []
+        self.ids = {}
+        self.suffix_ids = [(s, self.add(s)) for s in LANE_SUFFIXES.values()]
+        seen_users = set()
+        repeated = {}  # insertion-ordered set
+        for entry in sessions:
+            if not hasattr(entry, "get"):
+                continue
+            ai = entry.get("ai")
+            if isinstance(ai, str):
+                self.add(self.split_reply(ai)[0])
+            user = entry.get("user")
+            if isinstance(user, str):
+                # Only users seen twice are worth a table slot
+                if user in seen_users:
+                    repeated[user] = None
+                else:
+                    seen_users.add(user)
+        # Templates first: a reader decoding the table lazily needs only its front
+        for user in repeated:
+            self.add(user)
+
+    def add(self, text: str) -> int:
+        ref = self.ids.get(text)
+        if ref is None:
+            ref = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return ref
+
+    def split_reply(self, ai: str):
+        """Return (template text, suffix id or -1)."""
+        for suffix, ref in self.suffix_ids:
+            if ai.endswith(suffix) and len(ai) > len(suffix):
+                return ai[: -len(suffix)], ref
+        return ai, -1
+
+    def encode(self, entry: dict):
+        """Compact row for entry, or entry itself if it does not fit."""
+        ts, user, ai, align = (entry.get(k) for k in _ENTRY_KEYS[:4])
+        h = entry.get("h")
+        if not (
+            isinstance(ts, str) and isinstance(user, str) and isinstance(ai, str)
+            and type(align) is float and (isinstance(h, str) or "h" not in entry)
+        ):
+            return entry
+        base, suffix = self.split_reply(ai)
+        scaled = round(align * ALIGN_SCALE)
+        # Exact floats only (-0.0 stays a float: its repr is hashed)
+        exact = scaled / ALIGN_SCALE == align and (scaled or repr(align) == "0.0")
+        packed = scaled if exact else align
+        row = [ts, self.ids.get(user, user), self.ids.get(base, base), suffix, packed, h]
+        if len(entry) > 4 + ("h" in entry):
+            row.append({k: v for k, v in entry.items() if k not in _ENTRY_KEYS})
+        return row
+
+
+def decode_entry(row, strings: Sequence[str]) -> dict:
+    """Expand one stored entry (compact row or plain object) into a dict."""
+    if isinstance(row, dict):
+        return row
+    ts, user, base, suffix, align, h = row[:6]
+    ai = strings[base] if isinstance(base, int) else base
+    entry = {
+        "ts": ts,
+        "user": strings[user] if isinstance(user, int) else user,
+        "ai": ai + strings[suffix] if suffix >= 0 else ai,
+        "align": align / ALIGN_SCALE if isinstance(align, int) else align,
+    }
+    if h is not None:
+        entry["h"] = h
+    if len(row) > 6:
+        entry.update(row[6])
+    return entry
+
+
+def expand_memory(data: dict) -> dict:
+    """
+    Turn a parsed memory.json (any layout) into the in-memory form:
+    layout keys removed, compact rows expanded to entry dicts.
+    """
+    strings = data.get("strings") or ()
+    if data.get("layout") == "compact-1":
+        data["sessions"] = [decode_entry(row, strings) for row in data["sessions"]]
+    for key in MEMORY_LAYOUT_KEYS:
+        data.pop(key, None)
+    data.setdefault("last_hash", "")
+    return data
+
+
+def save_memory(memory: dict, path: str = DEFAULT_MEMORY_PATH, fsync: bool = False) -> None:
+    """
+    Persist memory to disk.
+
+    Layout (still plain JSON): header keys first, one per line, then
+    one compact session row per line (see StringTable). Readers can
+    take the header and the newest entries without parsing the whole
+    file (see aim_lazy.py).
+    The file is written next to the target and swapped in, because a
+    lazily loaded history is streamed from the old file while writing;
+    a crash mid-write therefore leaves the previous snapshot intact.
+    With fsync=True the data reaches the disk before the swap.
+    """
+    sessions = memory.get("sessions", [])
+    tmp_path = path + ".tmp"
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, dict) and "sessions" in data:
-            data.setdefault("last_hash", "")
-            return data
+        table = StringTable(sessions)
+        encode = table.encode
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("{\n")
+            f.write(f'"layout": "{MEMORY_LAYOUT}",\n"count": {len(sessions)},\n')
+            f.write(f'"strings": {json.dumps(table.strings, ensure_ascii=False)},\n')
+            for key, value in memory.items():
+                if key != "sessions" and key not in MEMORY_LAYOUT_KEYS:
+                    f.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            f.write('"sessions": [\n')
+            first = True
+            for entry in sessions:
+                if not first:
+                    f.write(",\n")
+                f.write(dumps(encode(entry)))
+                first = False
+            f.write("\n]\n}\n")
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+
+    reopen = getattr(sessions, "reopen", None)
+    if reopen is not None:
+        reopen(path)
+
+
+def replay_journal(memory: dict, journal_path: str) -> int:
+    """
+    Apply journal lines newer than memory["seq"] to memory["sessions"].
+
+    Lines already folded into the snapshot (seq <= snapshot seq) are
+    skipped, so a crash between snapshot write and journal truncation
+    never duplicates entries. A torn last line is ignored.
+    Returns the number of entries replayed.
+    """
+    if not os.path.exists(journal_path):
+        return 0
+
+    sessions = memory.setdefault("sessions", [])
+    seq = int(memory.get("seq", len(sessions)))
+    replayed = 0
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    line_seq = int(rec["seq"])
+                    entry = rec["entry"]
+                except Exception:
+                    continue
+                if line_seq <= seq or not isinstance(entry, dict):
+                    continue
+                sessions.append(entry)
+                seq = line_seq
+                replayed += 1
+                if "h" in entry:
+                    memory["last_hash"] = entry["h"]
     except Exception:
         pass
 
-    return {"sessions": [], "last_hash": ""}
+    memory["seq"] = seq
+    return replayed
 
 
-def save_memory(memory: dict, path: str = DEFAULT_MEMORY_PATH) -> None:
-    """Persist memory to disk."""
+def journal_line(entry: dict, seq: int) -> str:
+    """Format one session entry as a journal line (with newline)."""
+    return json.dumps({"seq": seq, "entry": entry}, ensure_ascii=False) + "\n"
+
+
+def append_journal_entry(entry: dict, seq: int, journal_path: str) -> None:
+    """Append one session entry as a single JSON line."""
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(memory, f, ensure_ascii=False, indent=2)
+        line = journal_line(entry, seq)
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
     except Exception:
         pass
 
 
-def file_sha256(path: str = DEFAULT_MEMORY_PATH, length: int = DEFAULT_HASH_LENGTH) -> str:
+def compact_memory(
+    memory: dict,
+    path: str = DEFAULT_MEMORY_PATH,
+    journal_path: Optional[str] = None,
+    fsync: bool = False,
+) -> None:
     """
-    Return SHA-256 digest (shortened for console).
+    Fold the journal into a fresh snapshot and start a new journal.
+
+    The snapshot carries memory["seq"], so the journal is only
+    truncated after the entries it holds are safely in memory.json.
     """
+    save_memory(memory, path, fsync=fsync)
+    if not journal_path:
+        return
     try:
-        h = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        full = h.hexdigest()
-        return full[: max(4, length)]
+        with open(journal_path, "w", encoding="utf-8"):
+            pass
     except Exception:
-        return "NA"
+        pass
+
+
+def file_sha256(path: str = DEFAULT_MEMORY_PATH, length: int = DEFAULT_HASH_LENGTH) -> str:
+    """
+    Return SHA-256 digest (shortened for console).
+    """
+    full = file_sha256_full(path)
+    return full if full == "NA" else full[: max(4, length)]
+
+
+def short_hash(digest: str, length: int = DEFAULT_HASH_LENGTH) -> str:
+    """Shorten a hex digest for console display."""
+    return (digest or "")[: max(4, length)]
 
 
 def file_sha256_full(path: str = DEFAULT_MEMORY_PATH) -> str:
     """Return full SHA-256 hex digest."""
     try:
-        h = hashlib.sha256()
         with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            h = hashlib.sha256()
+            buf = bytearray(DIGEST_CHUNK)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+            return h.hexdigest()
     except Exception:
         return "NA"
 
 
+# --------------------------------------
+# Verification record (stat fast path)
+# --------------------------------------
+#
+# On a clean exit the console stores memory.json's (size, mtime_ns,
+# inode) next to its SHA-256. At startup a matching stat means nothing
+# touched the file since, so the digest is taken from the record
+# without reading the file. Any difference leads to a full rehash.
+
+def file_stat_key(path: str) -> Optional[List[int]]:
+    """[size, mtime_ns, inode] of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def load_verify_record(record_path: str) -> dict:
+    try:
+        with open(record_path, "r", encoding="utf-8") as f:
+            record = json.load(f)
+        if isinstance(record, dict) and isinstance(record.get("sha256"), str):
+            return record
+    except Exception:
+        pass
+    return {}
+
+
+def check_memory_file(path: str, record_path: str, force: bool = False) -> tuple:
+    """
+    Return (status, digest) for the memory file:
+    "missing" (no file), "cached" (stat matches the record), "hashed"
+    (rehashed, same digest or no record) or "changed" (rehashed, the
+    digest differs from the one recorded on the last clean exit).
+    force skips the stat fast path.
+    """
+    key = file_stat_key(path)
+    if key is None:
+        return "missing", ""
+    record = load_verify_record(record_path)
+    if not force and record.get("stat") == key:
+        return "cached", record["sha256"]
+    digest = file_sha256_full(path)
+    if record and record["sha256"] != digest:
+        return "changed", digest
+    return "hashed", digest
+
+
+def save_verify_record(path: str, record_path: str, digest: Optional[str] = None) -> str:
+    """
+    Record the memory file's stat and digest (on a clean exit).
+    Without a known digest the file is only rehashed if it changed
+    since the last record. Returns the digest ("" if there is no file).
+    """
+    key = file_stat_key(path)
+    if key is None:
+        return ""
+    if digest is None:
+        record = load_verify_record(record_path)
+        digest = record["sha256"] if record.get("stat") == key else file_sha256_full(path)
+    tmp_path = record_path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"stat": key, "sha256": digest}))
+        os.replace(tmp_path, record_path)
+    except Exception:
+        pass
+    return digest
+
+
 def detect_hash_change(memory: dict, current_hash: str) -> str:
     """
     Compare stored memory['last_hash'] with current_hash and
@@ -133,29 +532,159 @@ def detect_hash_change(memory: dict, current_hash: str) -> str:
     return ""
 
 
+# --------------------------------------
+# Hash chain
+# --------------------------------------
+
+CHAIN_GENESIS = "0" * 64
+
+
+def canonical_entry(entry: dict) -> bytes:
+    """Stable byte form of a session entry (without its own link hash)."""
+    body = {k: v for k, v in entry.items() if k != "h"}
+    return json.dumps(
+        body, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def chain_hash(prev_hash: str, entry: dict) -> str:
+    """Return H(prev_hash || canonical_entry) as hex."""
+    h = hashlib.sha256(prev_hash.encode("ascii"))
+    h.update(canonical_entry(entry))
+    return h.hexdigest()
+
+
+def ensure_chain(memory: dict) -> int:
+    """
+    Link any entries that do not carry a hash yet (older memory files).
+    Returns the number of entries that were linked.
+    """
+    sessions = memory.setdefault("sessions", [])
+    if sessions and "h" in sessions[-1]:
+        # New entries are always linked; only older files need a pass
+        return 0
+    prev = memory.get("chain_base", CHAIN_GENESIS)
+    linked = 0
+    for entry in sessions:
+        if "h" not in entry or linked:
+            entry["h"] = chain_hash(prev, entry)
+            linked += 1
+        prev = entry["h"]
+    if sessions:
+        memory["last_hash"] = prev
+    return linked
+
+
+def chain_head(memory: dict) -> str:
+    """
+    Recompute only the newest link and return it (O(1)).
+
+    If the last entry carries no hash (memory written by an older
+    version), the stored last_hash is returned unchanged.
+    """
+    sessions = memory.get("sessions", [])
+    if not sessions:
+        return memory.get("last_hash", "")
+    last = sessions[-1]
+    if "h" not in last:
+        return memory.get("last_hash", "")
+    if len(sessions) > 1:
+        prev = sessions[-2].get("h", "")
+    else:
+        prev = memory.get("chain_base", CHAIN_GENESIS)
+    return chain_hash(prev, last)
+
+
+def verify_chain(memory: dict) -> int:
+    """
+    Walk the whole chain. Return the index of the first entry whose
+    link does not match, len(sessions) if the stored head disagrees
+    with the chain, or -1 if everything is consistent.
+    """
+    sessions = memory.get("sessions", [])
+    prev = memory.get("chain_base", CHAIN_GENESIS)
+    for i, entry in enumerate(sessions):
+        if entry.get("h") != chain_hash(prev, entry):
+            return i
+        prev = entry["h"]
+    if sessions and memory.get("last_hash", "") != prev:
+        return len(sessions)
+    return -1
+
+
 # --------------------------------------
 # Text cleaning
 # --------------------------------------
 
+# C0/C1 controls (except tab/newline), DEL and common invisible format
+# characters: none of them are printable, so sanitize_text drops them.
+_CONTROL_DELETE = dict.fromkeys(
+    [c for c in range(0x00, 0x20) if c not in (0x09, 0x0A)]
+    + list(range(0x7F, 0xA0))
+    + [0xAD, 0x061C, 0x180E, 0xFEFF]
+    + list(range(0x200B, 0x2010))
+    + list(range(0x2028, 0x202F))
+    + list(range(0x2060, 0x2065))
+    + list(range(0x2066, 0x2070))
+)
+# Same set as a regex: faster than str.translate on non-ASCII strings
+_CONTROL_DELETE_RE = re.compile(
+    "[" + "".join(re.escape(chr(c)) for c in sorted(_CONTROL_DELETE)) + "]"
+)
+
+# Cutting right before one of these never changes NFC of either side:
+# they have combining class 0 and never compose with a preceding char.
+_NFC_SAFE_BOUNDARY = re.compile(r"[\u0000-\u02ff\u4e00-\u9fff]")
+_SANITIZE_SLACK = 64  # extra chars read so a few deletions rarely force a retry
+_SANITIZE_MARGIN = 64  # how far past the window a safe boundary is looked for
+
+
+def _sanitize_piece(t: str) -> str:
+    """Normalize + drop non-printables, without the length cap."""
+    if t.isascii():
+        if t.isprintable():
+            return t
+        return t.translate(_CONTROL_DELETE)
+
+    if not unicodedata.is_normalized("NFC", t):
+        t = unicodedata.normalize("NFC", t)
+    if t.isprintable():
+        return t
+    out = _CONTROL_DELETE_RE.sub("", t)
+    if out.replace("\n", "").replace("\t", "").isprintable():
+        return out
+    # Rare: other non-printables (unassigned, private separators, ...)
+    return "".join(ch for ch in out if ch.isprintable() or ch in ("\n", "\t"))
+
+
 def sanitize_text(text: str) -> str:
     """
     Basic safety cleaning:
     - Unicode normalization
     - Remove control chars except whitespace
     - Trim overly long input (>4000 chars)
+
+    Pure printable ASCII is returned as is, NFC is skipped when the text
+    is already normalized, and long input is cut at a normalization-safe
+    point before any work, so a multi-megabyte paste costs about the
+    same as 4000 characters. Text with no such point nearby (Thai,
+    emoji, a run of combining marks) is cut hard a few characters past
+    the limit; only characters beyond it can normalize differently.
     """
     if not isinstance(text, str):
         text = str(text)
 
-    # Unicode normalize
-    t = unicodedata.normalize("NFC", text)
+    window = MAX_INPUT_CHARS + _SANITIZE_SLACK
+    while len(text) > window:
+        m = _NFC_SAFE_BOUNDARY.search(text, window, window + _SANITIZE_MARGIN)
+        cut = m.start() if m is not None else window + _SANITIZE_MARGIN
+        out = _sanitize_piece(text[:cut])
+        if len(out) >= MAX_INPUT_CHARS:
+            return out[:MAX_INPUT_CHARS]
+        # Too much was deleted; read further
+        window *= 2
 
-    # Remove control characters
-    cleaned = []
-    for ch in t:
-        if ch.isprintable() or ch in ("\n", "\t", " "):
-            cleaned.append(ch)
-    out = "".join(cleaned)
+    out = _sanitize_piece(text)
 
     # Trim if excessively long
     if len(out) > MAX_INPUT_CHARS:
@@ -175,9 +704,25 @@ def append_session_entry(
     align_value: float,
     ts: str,
     max_sessions: int,
+    journal_path: Optional[str] = None,
+    listeners: Sequence = (),
+    extra: Optional[dict] = None,
 ) -> None:
     """
     Append a single interaction to memory["sessions"], with pruning.
+
+    memory["seq"] counts every entry ever appended. If journal_path
+    is given, the entry is also appended there as one JSON line, so
+    the caller does not need to rewrite memory.json for this turn.
+
+    Each entry carries h = H(prev_h || entry) and memory["last_hash"]
+    holds the chain head, so hashing cost per turn is constant.
+
+    Each listener (search index, analytics, ...) gets
+    on_append(memory, entry, dropped) after pruning, so it can follow
+    the history incrementally instead of rescanning it.
+
+    extra holds optional keys stored (and hashed) with the entry.
     """
     entry = {
         "ts": ts,
@@ -185,12 +730,59 @@ def append_session_entry(
         "ai": ai_text,
         "align": round(float(align_value), 4),
     }
+    if extra:
+        entry.update(extra)
     sessions = memory.setdefault("sessions", [])
+    if sessions and "h" not in sessions[-1]:
+        ensure_chain(memory)
+    if sessions:
+        prev = sessions[-1]["h"]
+    else:
+        prev = memory.get("chain_base", CHAIN_GENESIS)
+    entry["h"] = chain_hash(prev, entry)
     sessions.append(entry)
+    memory["last_hash"] = entry["h"]
+
+    seq = int(memory.get("seq", len(sessions) - 1)) + 1
+    memory["seq"] = seq
+    if journal_path:
+        append_journal_entry(entry, seq, journal_path)
+
+    dropped = _prune_sessions(memory, max_sessions)
+    for listener in listeners:
+        listener.on_append(memory, entry, dropped)
+
+
+def session_seq_range(memory: dict) -> tuple:
+    """
+    Return (first, last) absolute seq numbers of the stored sessions.
+    first > last when there are none.
+    """
+    sessions = memory.get("sessions", [])
+    last = int(memory.get("seq", len(sessions)))
+    return last - len(sessions) + 1, last
 
-    if isinstance(max_sessions, int) and max_sessions > 0:
-        if len(sessions) > max_sessions:
-            memory["sessions"] = sessions[-max_sessions:]
+
+def _prune_sessions(memory: dict, max_sessions: int) -> List[dict]:
+    """
+    Keep the last max_sessions entries; remember the cut-off link.
+    Returns the entries that were dropped (oldest first).
+    """
+    if not (isinstance(max_sessions, int) and max_sessions > 0):
+        return []
+    sessions = memory.get("sessions", [])
+    if len(sessions) <= max_sessions:
+        return []
+    excess = len(sessions) - max_sessions
+    if hasattr(sessions, "trim_front"):
+        # Lazy / columnar stores drop in place without copying the tail
+        dropped = sessions.trim_front(excess)
+    else:
+        dropped = sessions[:excess]
+        memory["sessions"] = sessions[excess:]
+    if dropped and "h" in dropped[-1]:
+        memory["chain_base"] = dropped[-1]["h"]
+    return dropped
 
 
 # --------------------------------------
@@ -228,6 +820,75 @@ def compute_alignment_simple(text: str, turn_index: int, eps_a: float = 1e-6) ->
     return float(math.tanh(a_c))
 
 
+NUMPY_MIN_BATCH = 1024  # below this the array path is faster than NumPy setup
+
+_numpy_module = None  # NumPy once imported, False if it is not installed
+
+
+def _numpy():
+    """Import NumPy on first use (it is optional and slow to import); None if missing."""
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
+
+def compute_alignment_batch(
+    texts: Iterable[str],
+    start_turn: int = 1,
+    eps_a: float = 1e-6,
+    use_numpy: Optional[bool] = None,
+) -> array:
+    """
+    Alignment lane for a whole sequence: texts[k] is scored with turn
+    index start_turn + k, as if compute_alignment_simple were called
+    once per message.
+
+    The default path keeps the lane in an array('d') and applies the
+    same float operations in the same order, so values are identical
+    to the scalar function. The NumPy path (use_numpy=True, or None
+    with NumPy installed and a large batch) vectorizes length scaling,
+    question penalty, drift, clamp and tanh; tanh may differ in the
+    last ulp. NumPy is only imported the first time that path is taken.
+    """
+    stripped = [(t or "").strip() for t in texts]
+    n = len(stripped)
+    lo, hi = -1.0 + eps_a, 1.0 - eps_a
+
+    if use_numpy is None:
+        use_numpy = n >= NUMPY_MIN_BATCH
+    _np = _numpy() if use_numpy else None
+    if _np is not None:
+        lengths = _np.fromiter(map(len, stripped), dtype=_np.float64, count=n)
+        questions = _np.fromiter(
+            (t.endswith("?") for t in stripped), dtype=bool, count=n
+        )
+        turns = _np.arange(start_turn, start_turn + n, dtype=_np.float64)
+        norm_len = _np.minimum(lengths / 400.0, 1.0)
+        raw = _np.where(questions, norm_len - 0.2, norm_len)
+        a_raw = (raw - 0.3) + _np.minimum(turns / 50.0, 0.3)
+        lane = _np.tanh(_np.clip(a_raw, lo, hi))
+        out = array("d")
+        out.frombytes(lane.astype(_np.float64).tobytes())
+        return out
+
+    out = array("d", bytes(8 * n))
+    tanh = math.tanh
+    turn = start_turn
+    for i, t in enumerate(stripped):
+        raw = min(len(t) / 400.0, 1.0)
+        if t.endswith("?"):
+            raw -= 0.2
+        a_raw = (raw - 0.3) + min(turn / 50.0, 0.3)
+        out[i] = tanh(max(lo, min(hi, a_raw)))
+        turn += 1
+    return out
+
+
 def format_align(a: float) -> str:
     """Return compact sign+2dec string like '+0.42'."""
     try:
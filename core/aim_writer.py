@@ -0,0 +1,236 @@
+"""
+Shunyaya Symbolic Mathematical AI (SSM-AIM) — Mini Version
+Persistence off the prompt thread.
+
+- The console queues journal lines and snapshot requests
+- One writer thread drains the queue: pending journal lines go out in
+  a single write (group commit) and repeated snapshot requests collapse
+  into one save_memory (temp file + os.replace)
+- fsync policy: "turn" (every commit), "exit" (only on close) or a
+  number of milliseconds between fsyncs
+
+With background=False the same calls write inline, which is what the
+console does unless config.json sets "background_writes": true.
+
+With shared storage (aim_shared.py) journal lines are written by the
+SharedJournal under its file lock, and snapshots go through its
+compact() instead of compact_memory.
+
+close() writes everything still pending; aim_core calls it on :quit,
+EOF and Ctrl+C.
+
+Used by: aim_core.py
+"""
+
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+from aim_utils import DEFAULT_FSYNC, DEFAULT_MEMORY_PATH, compact_memory, journal_line
+
+
+def fsync_interval(policy) -> Optional[float]:
+    """
+    Seconds between fsyncs for a config "fsync" value:
+    0.0 for "turn", None for "exit" (fsync only on close).
+    """
+    if policy == "turn":
+        return 0.0
+    if policy == "exit" or policy is None:
+        return None
+    try:
+        return max(0.0, float(policy) / 1000.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fsync_path(path: Optional[str]) -> None:
+    if not path or not os.path.exists(path):
+        return
+    try:
+        with open(path, "rb+") as f:
+            os.fsync(f.fileno())
+    except OSError:
+        pass
+
+
+class MemoryWriter:
+    """
+    Group-committing writer for memory.json, the journal and sidecars.
+
+    lock guards the memory dict and the objects saved in snapshot
+    callbacks: hold it while mutating them (append, sync, clear).
+    The writer holds it only while writing a snapshot.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_MEMORY_PATH,
+        journal_path: Optional[str] = None,
+        fsync=DEFAULT_FSYNC,
+        background: bool = True,
+        metrics=None,
+        shared=None,
+    ) -> None:
+        self.path = path
+        self.shared = shared  # aim_shared.SharedJournal: it writes lines and compacts
+        self.metrics = metrics  # aim_metrics.Metrics: "write" stage per commit
+        self.journal_path = journal_path
+        self.interval = fsync_interval(fsync)
+        self.lock = threading.RLock()
+        self.commits = 0  # group commits performed
+        self.lines_written = 0
+        self.snapshots = 0
+        self._cond = threading.Condition()
+        self._lines: List[str] = []
+        self._snapshot = None  # (memory, callbacks) of the newest request
+        self._busy = False
+        self._closed = False
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="aim-writer", daemon=True)
+            self._thread.start()
+
+    @property
+    def background(self) -> bool:
+        return self._thread is not None
+
+    # ---------- requests (prompt thread) ----------
+
+    def on_append(self, memory: dict, entry: dict, dropped: list) -> None:
+        """Listener hook for append_session_entry: queue a journal line."""
+        if self.journal_path and self.shared is None:
+            self._submit(lines=[journal_line(entry, int(memory.get("seq", 0)))])
+
+    def snapshot(self, memory: dict, after: Sequence[Callable[[], None]] = ()) -> None:
+        """
+        Request a fresh memory.json (folding the journal, if any), then
+        run the after callbacks (sidecar saves). Requests made before
+        the writer gets to them are merged into one.
+        """
+        self._submit(snapshot=(memory, tuple(after)))
+
+    def _submit(self, lines=None, snapshot=None) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            if lines:
+                self._lines.extend(lines)
+            if snapshot is not None:
+                self._snapshot = snapshot
+            self._cond.notify_all()
+        if self._thread is None:
+            self._commit()
+
+    def flush(self) -> None:
+        """Block until every queued request has been written."""
+        if self._thread is None:
+            return
+        with self._cond:
+            while self._lines or self._snapshot is not None or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write what is pending, fsync, and stop the thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        else:
+            self._commit()
+        if self._unsynced:
+            self._fsync_all()
+
+    # ---------- writer side ----------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not (self._lines or self._snapshot is not None or self._closed):
+                    wait = self._fsync_wait()
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                done = self._closed and not self._lines and self._snapshot is None
+            if done:
+                return
+            self._commit()
+
+    def _fsync_wait(self) -> Optional[float]:
+        """Seconds until a timed fsync is due, None if none is pending."""
+        if not self._unsynced or not self.interval:
+            return None
+        return self._last_fsync + self.interval - time.monotonic()
+
+    def _fsync_due(self) -> bool:
+        if self.interval is None:
+            return False
+        return time.monotonic() - self._last_fsync >= self.interval
+
+    def _commit(self) -> None:
+        with self._cond:
+            lines, self._lines = self._lines, []
+            snapshot, self._snapshot = self._snapshot, None
+            self._busy = True
+        start = time.perf_counter()
+        try:
+            due = self._fsync_due()
+            if lines:
+                self._write_lines(lines, due)
+            if snapshot is not None:
+                memory, after = snapshot
+                with self.lock:
+                    if self.shared is not None:
+                        self.shared.compact(memory, fsync=due, after=after)
+                    else:
+                        compact_memory(memory, self.path, self.journal_path, fsync=due)
+                        for callback in after:
+                            callback()
+                self.snapshots += 1
+            wrote = bool(lines) or snapshot is not None
+            if wrote:
+                self.commits += 1
+                if self.metrics is not None:
+                    self.metrics.record("write", time.perf_counter() - start)
+            if due:
+                if self._unsynced:
+                    self._fsync_all()  # earlier commits written without fsync
+                self._unsynced = False
+                self._last_fsync = time.monotonic()
+            elif wrote:
+                self._unsynced = True
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write_lines(self, lines: List[str], fsync: bool) -> None:
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.lines_written += len(lines)
+        except Exception:
+            pass
+
+    def _fsync_all(self) -> None:
+        _fsync_path(self.journal_path)
+        _fsync_path(self.path)
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+
+    def describe(self) -> str:
+        """One-line summary for :stats."""
+        mode = "background" if self._thread is not None else "inline"
+        return (
+            f"writer {mode} | commits {self.commits} | "
+            f"journal lines {self.lines_written} | snapshots {self.snapshots}"
+        )
@@ -0,0 +1,100 @@
+"""
+Basic tests for SSM-AIM Mini lane analytics (:trend).
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import math
+import os
+import statistics
+import tempfile
+
+from aim_utils import append_session_entry
+from aim_analytics import HIST_BUCKETS, LaneAnalytics, lane_band
+
+
+def lane(i):
+    return round(math.sin(i / 7.0) * 0.9 + ((i * 13) % 7 - 3) / 30.0, 4)
+
+
+def grow(mem, stats, start, n, max_sessions):
+    listeners = (stats,) if stats is not None else ()
+    for i in range(start, start + n):
+        append_session_entry(mem, f"m{i}", "r", lane(i), "2025-01-01T00:00:00Z",
+                             max_sessions, listeners=listeners)
+
+
+def longest_runs(values):
+    longest = [0, 0, 0]
+    run, prev = 0, None
+    for v in values:
+        band = lane_band(v)
+        run = run + 1 if band == prev else 1
+        prev = band
+        longest[band] = max(longest[band], run)
+    return longest
+
+
+# -------------------------------------------
+# 1) Incremental values match a batch computation
+# -------------------------------------------
+
+print("Testing incremental lane statistics...\n")
+
+values = [lane(i) for i in range(500)]
+mem = {"sessions": [], "last_hash": ""}
+stats = LaneAnalytics(window=40, alpha=0.2)
+grow(mem, stats, 0, 500, 60)
+
+assert stats.count == 500 and (stats.first, stats.last) == (1, 500)
+assert math.isclose(stats.mean, statistics.fmean(values), abs_tol=1e-12)
+assert math.isclose(stats.stddev, statistics.pstdev(values), rel_tol=1e-9)
+assert stats.min == (min(values), values.index(min(values)) + 1)
+assert stats.max == (max(values), values.index(max(values)) + 1)
+assert math.isclose(stats.recent_mean, statistics.fmean(values[-40:]), abs_tol=1e-12)
+
+ewma = values[0]
+for v in values[1:]:
+    ewma += 0.2 * (v - ewma)
+assert math.isclose(stats.ewma, ewma, abs_tol=1e-12)
+
+assert sum(stats.hist) == 500 and len(stats.hist) == HIST_BUCKETS
+assert stats.longest == longest_runs(values)
+
+report = stats.format_report()
+assert "500 values" in report and report.count("\n") == 3 + HIST_BUCKETS
+
+print("incremental lane statistics OK\n")
+
+# -------------------------------------------
+# 2) Rebuild, catch-up and persistence
+# -------------------------------------------
+
+print("Testing rebuild / sync / save...\n")
+
+# Rebuild streams only what memory still holds (60 newest entries)
+rebuilt = LaneAnalytics(window=40)
+assert rebuilt.sync(mem) == 60
+assert rebuilt.count == 60 and rebuilt.first == 441 and rebuilt.last == 500
+assert math.isclose(rebuilt.mean, statistics.fmean(values[-60:]), abs_tol=1e-12)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.analytics.json")
+    stats.save(path)
+    assert not os.path.exists(path + ".tmp")  # written aside, then swapped in
+    loaded = LaneAnalytics.load(path, window=40)
+    assert loaded.to_dict() == stats.to_dict()
+
+    # Entries appended without the listener (journal replay) are caught up
+    grow(mem, None, 500, 5, 60)
+    assert loaded.sync(mem) == 5 and loaded.count == 505
+    grow(mem, stats, 505, 1, 60)
+    assert loaded.sync(mem) == 1 and loaded.last == stats.last == 506
+
+    # Other settings, a reset memory or a gap all start over
+    assert LaneAnalytics.load(path, window=10).count == 0
+    assert loaded.sync({"sessions": [], "last_hash": ""}) == 0 and loaded.count == 0
+    assert LaneAnalytics.load(os.path.join(tmp, "missing.json")).count == 0
+
+print("rebuild / sync / save OK\n")
+
+print("All analytics tests completed.")
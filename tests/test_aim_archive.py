@@ -0,0 +1,144 @@
+"""
+Basic tests for the SSM-AIM Mini session archive.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import append_session_entry, load_memory, save_memory, verify_chain
+from aim_archive import SessionArchive, iter_numbered_history, open_archive
+from aim_core import export_history, show_history, show_search
+from aim_index import SessionIndex
+
+
+def turn(mem, i, max_sessions, listeners=()):
+    append_session_entry(mem, f"note {i} " + ("plan" if i % 4 == 0 else "idea"), f"reply {i % 3}",
+                         ((i * 7) % 19 - 9) / 10.0, f"2025-01-{1 + i // 10:02d}T00:00:00Z",
+                         max_sessions, listeners=listeners)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    # -------------------------------------------
+    # 1) Pruned entries land in sealed segments
+    # -------------------------------------------
+
+    print("Testing archive segments...\n")
+
+    full = {"sessions": [], "last_hash": ""}
+    for i in range(205):
+        turn(full, i, 0)
+
+    adir = os.path.join(tmp, "memory.archive")
+    archive = SessionArchive(adir, "gzip", segment_size=30)
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(205):
+        turn(mem, i, 20, listeners=(archive,))
+
+    assert len(mem["sessions"]) == 20 and archive.count == 185 and archive.last == 185
+    assert len(archive.segments) == 6 and len(archive.pending) == 5
+    seg = archive.segments[1]
+    assert (seg["first"], seg["last"], seg["count"]) == (31, 60, 30)
+    assert seg["chain_base"] == archive.segments[0]["chain_head"]
+    assert os.path.exists(os.path.join(adir, seg["file"])) and seg["file"].endswith(".jsonl.gz")
+
+    assert [e for _, e in iter_numbered_history(mem, archive)] == full["sessions"]
+    assert archive.verify(mem) == []
+
+    reopened = SessionArchive.load(adir, "gzip", 30)
+    assert reopened.segments == archive.segments and reopened.pending == archive.pending
+    assert [e for _, e in reopened.tail(40)] == full["sessions"][145:185]
+    assert [e for _, e in reopened.tail(3)] == full["sessions"][182:185]
+
+    # Re-adding what is already archived (replay after a crash) is a no-op
+    assert archive.add(180, full["sessions"][179:185]) == 0
+
+    print("archive segments OK\n")
+
+    # -------------------------------------------
+    # 2) History, export and search span the archive
+    # -------------------------------------------
+
+    print("Testing history / export / search...\n")
+
+    with redirect_stdout(io.StringIO()) as out:
+        show_history(mem, 25, archive)
+    assert out.getvalue().count("User:") == 25 and "note 180 plan" in out.getvalue()
+
+    export_path = os.path.join(tmp, "export.md")
+    with redirect_stdout(io.StringIO()):
+        export_history(mem, export_path, archive)
+    with open(export_path, "r", encoding="utf-8") as f:
+        assert f.read().count("- Time:") == 205
+
+    expected = [i + 1 for i, e in enumerate(full["sessions"])
+                if "plan" in e["user"] and e["align"] > 0.2]
+    hits = archive.search(["plan"], align_min=0.2)
+    assert [s for s, _ in hits] == [s for s in expected if s <= 185]
+    recent = archive.search(["plan"], since="2025-01-18")
+    assert [s for s, _ in recent] == [s for s, _ in archive.search(["plan"]) if s > 170]
+
+    index = SessionIndex()
+    index.sync(mem)
+    with redirect_stdout(io.StringIO()) as out:
+        show_search(mem, index, ["plan", "align>0.2"], max_items=50, archive=archive)
+    assert f"{len(expected)} match(es)" in out.getvalue()
+    assert out.getvalue().count("User:") == len(expected)
+
+    print("history / export / search OK\n")
+
+    # -------------------------------------------
+    # 3) Tampering is detected
+    # -------------------------------------------
+
+    print("Testing archive verification...\n")
+
+    victim = os.path.join(adir, archive.segments[2]["file"])
+    with open(victim, "rb") as f:
+        original = f.read()
+    with open(victim, "wb") as f:
+        f.write(original[:-9] + bytes(9))
+    assert "file digest" in archive.verify()[0]
+    with open(victim, "wb") as f:
+        f.write(original)
+
+    with open(os.path.join(adir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    del manifest["segments"][3]
+    with open(os.path.join(adir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    problems = SessionArchive.load(adir).verify()
+    assert any("seal" in p for p in problems)
+
+    print("archive verification OK\n")
+
+    # -------------------------------------------
+    # 4) Load-time pruning, lzma, config
+    # -------------------------------------------
+
+    print("Testing catch_up / lzma / config...\n")
+
+    path = os.path.join(tmp, "big.json")
+    save_memory(full, path)
+    loaded = load_memory(path)
+    xz = SessionArchive(os.path.join(tmp, "xz.archive"), "lzma", segment_size=100)
+    assert xz.catch_up(loaded, 50) == 155
+    assert len(loaded["sessions"]) == 50 and verify_chain(loaded) == -1
+    assert xz.segments[0]["file"].endswith(".jsonl.xz") and len(xz.pending) == 55
+    assert xz.verify(loaded) == [] and [e for _, e in iter_numbered_history(loaded, xz)] == full["sessions"]
+    assert xz.seal() is not None and xz.pending == [] and xz.verify(loaded) == []
+
+    assert open_archive({"archive": "off"}) is None
+    cfg_archive = open_archive({"archive": "lzma", "archive_segment_size": 7}, path)
+    assert cfg_archive.codec == "lzma" and cfg_archive.segment_size == 7
+    assert cfg_archive.directory == os.path.join(tmp, "big.archive")
+
+    xz.clear()
+    assert not os.path.exists(xz.directory) and xz.count == 0
+
+    print("catch_up / lzma / config OK\n")
+
+print("All archive tests completed.")
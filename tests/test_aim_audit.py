@@ -0,0 +1,120 @@
+"""
+Basic tests for the SSM-AIM Mini fleet audit.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import append_session_entry, save_memory
+from aim_audit import audit_file, audit_files, find_memory_files, main, summarize
+
+
+def make_memory(n, seed=0):
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(n):
+        append_session_entry(mem, f"op {seed} msg {i}", "reply", ((i + seed) % 9 - 4) / 5,
+                             "2025-01-01T00:00:00Z", 0)
+    return mem
+
+
+def write_json(path, obj):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f)
+
+
+if __name__ == "__main__":  # worker processes re-import this module
+    with tempfile.TemporaryDirectory() as tmp:
+        # -------------------------------------------
+        # 1) A small fleet with known defects
+        # -------------------------------------------
+
+        print("Testing audit_file...\n")
+
+        for k in range(24):
+            d = os.path.join(tmp, f"team{k % 3}", f"op{k:02d}")
+            os.makedirs(d)
+            save_memory(make_memory(5 + k, seed=k), os.path.join(d, "memory.json"))
+
+        bad = {}
+        os.makedirs(os.path.join(tmp, "bad"))
+
+        # Edited text: the chain no longer matches
+        mem = make_memory(6)
+        mem["sessions"][2]["user"] = "edited"
+        bad["tampered"] = os.path.join(tmp, "bad", "tampered", "memory.json")
+        os.makedirs(os.path.dirname(bad["tampered"]))
+        save_memory(mem, bad["tampered"])
+
+        # Stored head differs from the chain
+        mem = make_memory(4)
+        mem["last_hash"] = "0" * 64
+        bad["head"] = os.path.join(tmp, "bad", "head", "memory.json")
+        os.makedirs(os.path.dirname(bad["head"]))
+        save_memory(mem, bad["head"])
+
+        # Alignment outside the lane
+        mem = make_memory(3)
+        mem["sessions"][1]["align"] = 3.5
+        bad["align"] = os.path.join(tmp, "bad", "align", "memory.json")
+        os.makedirs(os.path.dirname(bad["align"]))
+        write_json(bad["align"], mem)
+
+        # Not JSON at all
+        bad["json"] = os.path.join(tmp, "bad", "json", "memory.json")
+        os.makedirs(os.path.dirname(bad["json"]))
+        with open(bad["json"], "w", encoding="utf-8") as f:
+            f.write('{"sessions": [')
+
+        # Legacy file without per-entry hashes: passes with a warning
+        legacy = os.path.join(tmp, "legacy", "memory.json")
+        os.makedirs(os.path.dirname(legacy))
+        write_json(legacy, {"sessions": [{"ts": "t", "user": "u", "ai": "a", "align": 0.1}],
+                            "last_hash": "abc"})
+
+        assert "chain_broken" in audit_file(bad["tampered"])["errors"][0]
+        assert "head_mismatch" in audit_file(bad["head"])["errors"][0]
+        assert "align_range" in audit_file(bad["align"])["errors"][0]
+        assert "invalid_json" in audit_file(bad["json"])["errors"][0]
+        result = audit_file(legacy)
+        assert result["ok"] and result["warnings"][0].startswith("legacy")
+
+        good = audit_file(os.path.join(tmp, "team0", "op00", "memory.json"))
+        assert good["ok"] and good["entries"] == 5 and len(good["sha256"]) == 64
+
+        print("audit_file OK\n")
+
+        # -------------------------------------------
+        # 2) Pool results match the serial run; one report
+        # -------------------------------------------
+
+        print("Testing parallel audit...\n")
+
+        paths = list(find_memory_files([tmp]))
+        assert len(paths) == 24 + len(bad) + 1
+        serial = audit_files(paths, workers=1)
+        parallel = audit_files(paths, workers=2, chunksize=4)
+        assert serial == parallel
+
+        report = summarize(parallel)
+        assert report["files"] == 29 and report["failed"] == 4
+        assert report["errors_by_kind"] == {
+            "chain_broken": 1, "head_mismatch": 1, "align_range": 1, "invalid_json": 1,
+        }
+
+        out_json = os.path.join(tmp, "audit.json")
+        with redirect_stdout(io.StringIO()) as out:
+            status = main([tmp, "--workers", "2", "--json", out_json])
+        assert status == 1 and "failed 4" in out.getvalue()
+        with open(out_json, "r", encoding="utf-8") as f:
+            assert json.load(f)["ok"] == 25
+
+        with redirect_stdout(io.StringIO()):
+            assert main([os.path.join(tmp, "team1"), "--workers", "1"]) == 0
+
+        print("parallel audit OK\n")
+
+    print("All audit tests completed.")
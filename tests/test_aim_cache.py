@@ -0,0 +1,73 @@
+"""
+Basic tests for the SSM-AIM Mini reply cache.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+from aim_cache import ReplyCache
+from aim_core import REPLY_CACHE, cached_reply, generate_reply
+
+
+# -------------------------------------------
+# 1) LRU order, eviction and counters
+# -------------------------------------------
+
+print("Testing ReplyCache...\n")
+
+cache = ReplyCache(capacity=2)
+calls = []
+
+
+def compute(value):
+    def run():
+        calls.append(value)
+        return value
+    return run
+
+
+assert cache.get_or_compute("a", compute("A")) == "A"
+assert cache.get_or_compute("b", compute("B")) == "B"
+assert cache.get_or_compute("a", compute("X")) == "A"  # hit refreshes "a"
+assert cache.get_or_compute("c", compute("C")) == "C"  # evicts "b"
+assert cache.get_or_compute("b", compute("B2")) == "B2"
+
+assert calls == ["A", "B", "C", "B2"]
+assert cache.stats()["hits"] == 1
+assert cache.stats()["misses"] == 4
+assert cache.stats()["evictions"] == 2
+assert len(cache) == 2
+
+cache.resize(1)
+assert len(cache) == 1 and cache.stats()["evictions"] == 3
+
+off = ReplyCache(capacity=0)
+off.get_or_compute("a", compute("A"))
+off.get_or_compute("a", compute("A"))
+assert len(off) == 0 and off.stats()["misses"] == 2
+
+print("ReplyCache OK\n")
+
+
+# -------------------------------------------
+# 2) Cached replies are exactly the uncached ones
+# -------------------------------------------
+
+print("Testing cached_reply...\n")
+
+REPLY_CACHE.clear()
+texts = [
+    "plan", "PLAN", "  plan  ", "Plan?", "what now?", "What Now?", "",
+    "my journal", "My Journal", "idea", "just a note",
+]
+hints = [None, -0.9, -0.3, -0.2999, 0.0, 0.3, 0.3001, 0.9, "bad"]
+
+for _ in range(2):
+    for text in texts:
+        for hint in hints:
+            assert cached_reply(text, hint) == generate_reply(text, hint), (text, hint)
+
+assert REPLY_CACHE.stats()["hits"] > REPLY_CACHE.stats()["misses"]
+print(REPLY_CACHE.describe())
+
+print("cached_reply OK\n")
+
+print("All cache tests completed.")
@@ -0,0 +1,145 @@
+"""
+Basic tests for the SSM-AIM Mini compact memory layout.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import (
+    LANE_SUFFIXES,
+    StringTable,
+    append_session_entry,
+    compute_alignment_simple,
+    decode_entry,
+    journal_path_for,
+    load_memory,
+    save_memory,
+    verify_chain,
+)
+from aim_core import generate_reply, new_pipeline
+from aim_lazy import load_memory_lazy
+from aim_pipeline import Turn
+from aim_migrate import main as migrate_main
+
+
+TEXTS = ["plan for today", "tired again", "new idea?", "just a note", "plan for today"]
+
+
+def build_memory(n):
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(n):
+        text = TEXTS[i % len(TEXTS)] + ("" if i % 3 else f" #{i}")
+        align = compute_alignment_simple(text, i + 1)
+        append_session_entry(mem, text, generate_reply(text, align), align,
+                             f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z", 0)
+    return mem
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.json")
+
+    # -------------------------------------------
+    # 1) Rows: template + suffix ids, packed align
+    # -------------------------------------------
+
+    print("Testing compact rows...\n")
+
+    entry = {"ts": "t", "user": "u", "ai": "Base." + LANE_SUFFIXES[1], "align": 0.4321, "h": "ab"}
+    table = StringTable([entry])
+    row = table.encode(entry)
+    assert row[2] == table.ids["Base."] and table.strings[row[3]] == LANE_SUFFIXES[1]
+    assert row[4] == 4321 and decode_entry(row, table.strings) == entry
+
+    # Values that do not pack exactly stay as they are
+    for align in (0.123456789, -0.0, 1e-9):
+        e = dict(entry, align=align)
+        back = decode_entry(table.encode(e), table.strings)
+        assert back == e and repr(back["align"]) == repr(align)
+
+    # Extra keys ride along; odd entries are kept as plain objects
+    e = dict(entry, mood="calm")
+    assert decode_entry(table.encode(e), table.strings) == e
+    for odd in ({"ts": "t", "user": "u", "ai": "a", "align": 1},
+                {"ts": "t", "user": "u", "ai": "a", "align": 0.5, "h": None},
+                {"user": "u"}):
+        assert table.encode(odd) is odd and decode_entry(odd, table.strings) == odd
+
+    print("compact rows OK\n")
+
+    # -------------------------------------------
+    # 2) Round trip, chain, lazy view, smaller file
+    # -------------------------------------------
+
+    print("Testing compact round trip...\n")
+
+    mem = build_memory(400)
+    mem["sessions"][7]["ai"] = "A reply from no template."  # not from any template
+    mem["sessions"][7].pop("h")
+    save_memory(mem, path)
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    assert raw["layout"] == "compact-1" and isinstance(raw["sessions"][0], list)
+    assert "plan for today" in raw["strings"]  # repeated user text is interned
+    assert "just a note #3" not in raw["strings"]  # one-off text stays inline
+
+    eager = load_memory(path)
+    assert eager["sessions"] == mem["sessions"] and "strings" not in eager
+    lazy = load_memory_lazy(path)
+    assert list(lazy["sessions"]) == mem["sessions"]
+    assert lazy["sessions"][-3:] == mem["sessions"][-3:]
+
+    verified = build_memory(400)
+    save_memory(verified, path)
+    assert verify_chain(load_memory(path)) == -1
+
+    plain = sum(len(json.dumps(e, ensure_ascii=False)) + 2 for e in verified["sessions"])
+    assert os.path.getsize(path) < plain * 0.6
+
+    print("compact round trip OK\n")
+
+    # -------------------------------------------
+    # 3) Migration from older layouts and back
+    # -------------------------------------------
+
+    print("Testing migration...\n")
+
+    legacy = os.path.join(tmp, "legacy.json")
+    with open(legacy, "w", encoding="utf-8") as f:
+        json.dump(verified, f, indent=2)
+    extra = build_memory(401)["sessions"][-1]
+    with open(journal_path_for(legacy), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"seq": 401, "entry": extra}) + "\n")
+
+    with redirect_stdout(io.StringIO()) as out:
+        assert migrate_main([legacy]) == 0
+    assert "401 entries" in out.getvalue()
+    migrated = load_memory(legacy, journal_path_for(legacy))
+    assert migrated["sessions"] == verified["sessions"] + [extra]
+    assert os.path.getsize(journal_path_for(legacy)) == 0
+
+    expanded = os.path.join(tmp, "expanded.json")
+    with redirect_stdout(io.StringIO()):
+        assert migrate_main([legacy, "--expand", expanded]) == 0
+    with open(expanded, "r", encoding="utf-8") as f:
+        assert json.load(f)["sessions"] == migrated["sessions"]
+
+    # A file from before the hash chain is linked while migrating, so
+    # the console can load it lazily and append right away
+    baseline = os.path.join(tmp, "baseline.json")
+    unchained = [{k: v for k, v in e.items() if k != "h"} for e in verified["sessions"][:20]]
+    with open(baseline, "w", encoding="utf-8") as f:
+        json.dump({"sessions": unchained}, f, indent=2)
+    with redirect_stdout(io.StringIO()):
+        assert migrate_main([baseline]) == 0
+    mem = load_memory_lazy(baseline)
+    assert verify_chain(mem) == -1
+    turns = new_pipeline(mem, 0).run([Turn("plan after migrating")], stop="persist")
+    assert turns[0].seq == 21 and verify_chain(mem) == -1
+
+    print("migration OK\n")
+
+print("All compact layout tests completed.")
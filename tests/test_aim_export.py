@@ -0,0 +1,171 @@
+"""
+Basic tests for the SSM-AIM Mini export engine.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import append_session_entry, save_memory
+from aim_archive import SessionArchive, archive_dir_for
+from aim_core import export_history, parse_export
+from aim_export import (
+    export_file,
+    export_format_for,
+    export_memory,
+    load_mark,
+    main,
+    mark_path_for,
+)
+
+
+def turn(mem, i, max_sessions=0, listeners=()):
+    append_session_entry(mem, f"note {i}, \"quoted\"", f"reply {i % 3}", ((i * 7) % 19 - 9) / 10.0,
+                         f"2025-02-{1 + i // 50:02d}T00:00:00Z", max_sessions, listeners=listeners)
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    # -------------------------------------------
+    # 1) Three formats, full export
+    # -------------------------------------------
+
+    print("Testing formats...\n")
+
+    assert export_format_for("x.jsonl") == "jsonl" and export_format_for("x.CSV") == "csv"
+    assert export_format_for("x.txt") == "md" and export_format_for("x.txt", "csv") == "csv"
+    assert mark_path_for(os.path.join(tmp, "out.md")) == os.path.join(tmp, "out.md.mark.json")
+
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(120):
+        turn(mem, i)
+
+    md = os.path.join(tmp, "out.md")
+    result = export_memory(mem, md)
+    assert (result["mode"], result["count"], result["last"]) == ("full", 120, 120)
+    text = read(md)
+    assert text.startswith("# SSM-AIM Mini Export") and text.count("- Time:") == 120
+
+    jl = os.path.join(tmp, "out.jsonl")
+    export_memory(mem, jl)
+    rows = [json.loads(line) for line in read(jl).splitlines()]
+    assert [r["seq"] for r in rows] == list(range(1, 121))
+    assert rows[5]["user"] == mem["sessions"][5]["user"] and rows[-1]["h"] == mem["last_hash"]
+
+    cv = os.path.join(tmp, "out.csv")
+    export_memory(mem, cv)
+    with open(cv, "r", encoding="utf-8", newline="") as f:
+        table = list(csv.DictReader(f))
+    assert len(table) == 120 and table[7]["user"] == 'note 7, "quoted"'
+    assert float(table[7]["align"]) == mem["sessions"][7]["align"]
+
+    empty = os.path.join(tmp, "empty.md")
+    export_memory({"sessions": [], "last_hash": ""}, empty)
+    assert "_No sessions stored._" in read(empty)
+
+    print("formats OK\n")
+
+    # -------------------------------------------
+    # 2) Incremental export appends only the delta
+    # -------------------------------------------
+
+    print("Testing incremental export...\n")
+
+    for i in range(120, 150):
+        turn(mem, i)
+    for path in (md, jl, cv):
+        before = read(path)
+        result = export_memory(mem, path, incremental=True)
+        assert (result["mode"], result["count"], result["last"]) == ("incremental", 30, 150)
+        assert read(path).startswith(before)
+        again = export_memory(mem, path, incremental=True)
+        assert (again["mode"], again["count"]) == ("incremental", 0)
+
+    full_path = os.path.join(tmp, "full.jsonl")
+    export_memory(mem, full_path)
+    assert read(full_path) == read(jl)
+    assert read(cv).count("\n") == 151 and read(md).count("- Time:") == 150
+    assert load_mark(mark_path_for(jl))["seq"] == 150
+
+    print("incremental export OK\n")
+
+    # -------------------------------------------
+    # 3) Falls back to a full export when the mark does not hold
+    # -------------------------------------------
+
+    print("Testing fallbacks...\n")
+
+    with open(jl, "a", encoding="utf-8") as f:
+        f.write("edited by hand\n")
+    result = export_memory(mem, jl, incremental=True)
+    assert result["mode"] == "full" and "changed" in result["reason"]
+    assert read(jl) == read(full_path)
+
+    other = {"sessions": [], "last_hash": ""}
+    for i in range(160):
+        append_session_entry(other, f"other {i}", "ok", 0.0, "2025-03-01T00:00:00Z", 0)
+    result = export_memory(other, jl, incremental=True)
+    assert result["mode"] == "full" and "continue" in result["reason"] and result["count"] == 160
+
+    result = export_memory(other, jl, fmt="csv", incremental=True)
+    assert result["mode"] == "full" and "format" in result["reason"]
+
+    # Marked entry pruned without an archive: the next entry still links to it
+    window = {"sessions": [], "last_hash": ""}
+    win_path = os.path.join(tmp, "window.jsonl")
+    for i in range(20):
+        turn(window, i, max_sessions=10)
+    export_memory(window, win_path)
+    for i in range(20, 30):
+        turn(window, i, max_sessions=10)
+    assert window["sessions"][0]["user"].startswith("note 20")  # #20 is gone
+    result = export_memory(window, win_path, incremental=True)
+    assert (result["mode"], result["count"]) == ("incremental", 10)
+    assert [json.loads(line)["seq"] for line in read(win_path).splitlines()] == list(range(11, 31))
+
+    print("fallbacks OK\n")
+
+    # -------------------------------------------
+    # 4) Archive, CLI and console arguments
+    # -------------------------------------------
+
+    print("Testing archive / CLI / console...\n")
+
+    path = os.path.join(tmp, "memory.json")
+    archive = SessionArchive(archive_dir_for(path), "gzip", segment_size=40)
+    small = {"sessions": [], "last_hash": ""}
+    for i in range(200):
+        turn(small, i, max_sessions=25, listeners=(archive,))
+    save_memory(small, path)
+
+    out = os.path.join(tmp, "nightly.csv")
+    result = export_file(path, out, incremental=True)
+    assert (result["mode"], result["count"], result["format"]) == ("full", 200, "csv")
+    for i in range(200, 260):
+        turn(small, i, max_sessions=25, listeners=(archive,))
+    save_memory(small, path)
+    with redirect_stdout(io.StringIO()) as printed:
+        assert main([path, "--out", out, "--incremental"]) == 0
+    assert "60 new entries" in printed.getvalue() and read(out).count("\n") == 261
+
+    assert parse_export([]) == ("aim_export.md", None, False)
+    assert parse_export(["jsonl", "--incremental"]) == ("aim_export.jsonl", "jsonl", True)
+    assert parse_export(["nightly.csv", "incremental"]) == ("nightly.csv", None, True)
+
+    with redirect_stdout(io.StringIO()) as printed:
+        export_history(small, os.path.join(tmp, "console.md"), archive)
+        export_history(small, os.path.join(tmp, "no-such-dir", "x.md"))
+    assert "History written to" in printed.getvalue() and "Could not write" in printed.getvalue()
+    assert read(os.path.join(tmp, "console.md")).count("- Time:") == 260
+
+    print("archive / CLI / console OK\n")
+
+print("All export tests completed.")
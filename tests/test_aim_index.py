@@ -0,0 +1,135 @@
+"""
+Basic tests for the SSM-AIM Mini search index.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import json
+import os
+import tempfile
+
+from aim_utils import append_session_entry
+from aim_index import SessionIndex, parse_search, tokenize
+
+
+def brute_force(memory, terms, since=None, align_min=None, align_max=None):
+    """Reference: scan every stored entry."""
+    sessions = memory["sessions"]
+    first = memory["seq"] - len(sessions) + 1
+    out = []
+    for offset, e in enumerate(sessions):
+        words = tokenize(e["user"])
+        if not all(t in words for term in terms for t in tokenize(term)):
+            continue
+        if since and e["ts"] < since:
+            continue
+        if align_min is not None and not e["align"] > align_min:
+            continue
+        if align_max is not None and not e["align"] < align_max:
+            continue
+        out.append(first + offset)
+    return out
+
+
+# -------------------------------------------
+# 1) Incremental index matches a full scan, with pruning
+# -------------------------------------------
+
+print("Testing SessionIndex against a full scan...\n")
+
+words = ["plan", "tired", "idea", "note", "Plan", "math", "lane", "x"]
+mem = {"sessions": [], "last_hash": ""}
+index = SessionIndex()
+for i in range(400):
+    user = " ".join(words[(i * k) % len(words)] for k in range(1, 1 + i % 4))
+    ts = f"2025-01-{1 + i // 20:02d}T00:00:{i % 60:02d}Z"
+    align = ((i * 37) % 200 - 100) / 100.0
+    append_session_entry(mem, user, f"reply {i % 7}", align, ts, 150, listeners=(index,))
+
+queries = [
+    {"terms": ["plan"]},
+    {"terms": ["plan", "tired"]},
+    {"terms": ["PLAN", "tired"], "align_min": 0.0},
+    {"terms": ["reply"]},  # replies are not indexed
+    {"terms": ["missing"]},
+    {"terms": ["note"], "since": "2025-01-15"},
+    {"terms": [], "align_min": 0.5},
+    {"terms": ["idea"], "align_min": -0.2, "align_max": 0.2},
+    {"terms": [], "since": "2025-01-19", "align_max": 0.0},
+]
+for q in queries:
+    expected = brute_force(mem, **q)
+    assert index.search(**q) == expected, q
+
+assert index.base == mem["seq"] - len(mem["sessions"]) + 1
+assert index.search([], align_max=2.0)[0] == index.base
+assert index.search(["???"]) == []  # no word left after tokenizing
+assert index.by_align() == sorted(index.by_align()) and not index._unsorted
+
+print("SessionIndex OK\n")
+
+
+# -------------------------------------------
+# 2) Persistence and catch-up after load
+# -------------------------------------------
+
+print("Testing save / load / sync...\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.index.json")
+    index.save(path)
+    assert not os.path.exists(path + ".tmp")  # written aside, then swapped in
+    loaded = SessionIndex.load(path)
+    for q in queries:
+        assert loaded.search(**q) == index.search(**q)
+
+    # Entries appended while the index was not listening
+    append_session_entry(mem, "late plan", "r", 0.1, "2025-02-01T00:00:00Z", 150)
+    assert loaded.sync(mem) == 1
+    assert loaded.search(["late"]) == [mem["seq"]]
+
+    # A cleared memory forces a rebuild
+    cleared = {"sessions": [], "last_hash": ""}
+    loaded.sync(cleared)
+    assert loaded.search(["plan"]) == []
+
+    broken = os.path.join(tmp, "broken.json")
+    with open(broken, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert SessionIndex.load(broken).last == 0
+
+    # An index from another version (e.g. with reply tokens) is rebuilt
+    old = index.to_dict()
+    old["version"] = 1
+    with open(broken, "w", encoding="utf-8") as f:
+        json.dump(old, f)
+    assert SessionIndex.load(broken).last == 0
+
+print("persistence OK\n")
+
+
+# -------------------------------------------
+# 3) Query parsing
+# -------------------------------------------
+
+print("Testing parse_search...\n")
+
+q = parse_search(["plan", "since:2025-01-02", "align>-0.5", "align<0.5"])
+assert q == {"terms": ["plan"], "since": "2025-01-02", "align_min": -0.5, "align_max": 0.5}
+try:
+    parse_search(["align>abc"])
+except ValueError:
+    pass
+else:
+    raise AssertionError("bad align filter accepted")
+for args in (["???"], ["--", "align>0.1"]):
+    try:
+        parse_search(args)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("query without words accepted")
+assert parse_search(["???", "plan"])["terms"] == ["???", "plan"]
+
+print("parse_search OK\n")
+
+print("All index tests completed.")
@@ -0,0 +1,219 @@
+"""
+Basic tests for SSM-AIM Mini lazy memory loading.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import json
+import os
+import tempfile
+
+from aim_utils import (
+    append_session_entry,
+    chain_head,
+    compact_memory,
+    ensure_chain,
+    load_memory,
+    save_memory,
+    verify_chain,
+)
+import aim_lazy
+from aim_lazy import (
+    HeaderStrings,
+    LazySessions,
+    LazySidecar,
+    load_memory_lazy,
+    read_memory_header,
+)
+from aim_store import SessionStore
+from aim_index import SessionIndex
+from aim_merkle import SessionMerkle
+
+
+def build_memory(n, max_sessions=0):
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(n):
+        append_session_entry(
+            mem, f"msg {i}, with \"quotes\" and ü", f"reply {i}\nline 2",
+            ((i * 37) % 200 - 100) / 100.0, f"2025-01-01T00:00:{i % 60:02d}Z",
+            max_sessions,
+        )
+    return mem
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.json")
+
+    # -------------------------------------------
+    # 1) Line layout is plain JSON and round-trips
+    # -------------------------------------------
+
+    print("Testing memory.json line layout...\n")
+
+    mem = build_memory(300)
+    save_memory(mem, path)
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    assert raw["layout"] == "compact-1" and raw["count"] == 300
+    assert len(raw["sessions"]) == 300
+
+    eager = load_memory(path)
+    assert "layout" not in eager and "count" not in eager
+    assert eager["sessions"] == mem["sessions"]
+    assert eager["last_hash"] == mem["last_hash"] and eager["seq"] == 300
+
+    header, _ = read_memory_header(path)
+    assert header["count"] == 300 and header["last_hash"] == mem["last_hash"]
+
+    print("line layout OK\n")
+
+    # -------------------------------------------
+    # 2) Lazy view: header + tail without loading everything
+    # -------------------------------------------
+
+    print("Testing LazySessions...\n")
+
+    lazy = load_memory_lazy(path)
+    sessions = lazy["sessions"]
+    assert isinstance(sessions, LazySessions)
+    assert len(sessions) == 300 and lazy["seq"] == 300
+    assert sessions[-1] == mem["sessions"][-1]
+    assert sessions[-10:] == mem["sessions"][-10:]
+    assert sessions[295] == mem["sessions"][295]
+    assert chain_head(lazy) == mem["last_hash"]
+    assert ensure_chain(lazy) == 0
+    assert not sessions.loaded
+
+    # Streaming iteration and the full chain walk stay lazy
+    assert list(sessions) == mem["sessions"]
+    assert verify_chain(lazy) == -1
+    assert not sessions.loaded
+
+    # Appends are kept in memory and visible through the view
+    append_session_entry(lazy, "new one", "r", 0.5, "2025-01-02T00:00:00Z", 0)
+    append_session_entry(mem, "new one", "r", 0.5, "2025-01-02T00:00:00Z", 0)
+    assert len(sessions) == 301 and sessions[-1] == mem["sessions"][-1]
+    assert sessions[-3:] == mem["sessions"][-3:]
+    assert lazy["last_hash"] == mem["last_hash"]
+
+    # Random access deeper than TAIL_LIMIT falls back to a full load
+    aim_lazy.TAIL_LIMIT = 100
+    assert sessions[250] == mem["sessions"][250] and not sessions.loaded
+    assert sessions[0] == mem["sessions"][0]
+    assert sessions.loaded and sessions[:] == mem["sessions"]
+    aim_lazy.TAIL_LIMIT = 4096
+
+    print("LazySessions OK\n")
+
+    # -------------------------------------------
+    # 3) Pruning, journal replay and saving through the view
+    # -------------------------------------------
+
+    print("Testing lazy prune / journal / save...\n")
+
+    jpath = os.path.join(tmp, "memory.journal.jsonl")
+    mem = build_memory(200)
+    save_memory(mem, path)
+    for i in range(5):
+        append_session_entry(mem, f"j{i}", "r", 0.1, "2025-01-03T00:00:00Z", 0,
+                             journal_path=jpath)
+
+    lazy = load_memory_lazy(path, journal_path=jpath, max_sessions=50)
+    eager = load_memory(path, journal_path=jpath, max_sessions=50)
+    assert not lazy["sessions"].loaded
+    assert len(lazy["sessions"]) == 50 and lazy["seq"] == eager["seq"] == 205
+    assert list(lazy["sessions"]) == eager["sessions"]
+    assert lazy["chain_base"] == eager["chain_base"]
+    assert verify_chain(lazy) == -1
+
+    # Pruning while appending drops from the file head, not by copying
+    append_session_entry(lazy, "x", "r", 0.0, "2025-01-04T00:00:00Z", 50)
+    append_session_entry(eager, "x", "r", 0.0, "2025-01-04T00:00:00Z", 50)
+    assert list(lazy["sessions"]) == eager["sessions"]
+
+    compact_memory(lazy, path, jpath)
+    assert os.path.getsize(jpath) == 0
+    again = load_memory_lazy(path, journal_path=jpath)
+    assert list(again["sessions"]) == eager["sessions"]
+    assert again["last_hash"] == eager["last_hash"] and verify_chain(again) == -1
+
+    # Index and Merkle catch up from the tail; full rebuilds stream
+    index = SessionIndex()
+    assert index.sync(again) == 50
+    merkle = SessionMerkle()
+    assert merkle.sync(again) == 50
+    append_session_entry(again, "plan tail", "r", 0.0, "2025-01-05T00:00:00Z", 0)
+    assert index.sync(again) == 1 and merkle.sync(again) == 1
+    assert index.search(["tail"]) == [again["seq"]]
+    assert not again["sessions"].loaded
+
+    print("lazy prune / journal / save OK\n")
+
+    # -------------------------------------------
+    # 4) Older indented memory.json still loads
+    # -------------------------------------------
+
+    print("Testing legacy layout fallback...\n")
+
+    old = build_memory(20)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(old, f, ensure_ascii=False, indent=2)
+    assert read_memory_header(path) is None
+    legacy = load_memory_lazy(path, max_sessions=10)
+    assert isinstance(legacy["sessions"], SessionStore)
+    assert legacy["sessions"] == old["sessions"][-10:]
+
+    missing = load_memory_lazy(os.path.join(tmp, "none.json"))
+    assert missing["sessions"] == []
+
+    # Compact rows without hash links are loaded eagerly, so
+    # ensure_chain repairs real entries and the next append links on
+    unlinked = build_memory(20)
+    for entry in unlinked["sessions"]:
+        entry.pop("h")
+    save_memory(unlinked, path)
+    loaded = load_memory_lazy(path)
+    assert isinstance(loaded["sessions"], SessionStore)
+    assert ensure_chain(loaded) == 20 and verify_chain(loaded) == -1
+    append_session_entry(loaded, "linked", "r", 0.0, "2025-01-05T00:00:00Z", 0)
+    assert verify_chain(loaded) == -1
+
+    print("legacy fallback OK\n")
+
+    # -------------------------------------------
+    # 5) String table and sidecars are read on use
+    # -------------------------------------------
+
+    print("Testing on-use string table / sidecars...\n")
+
+    mem = {"sessions": [], "last_hash": ""}
+    for i in range(300):
+        user = f"again {i % 100}" if i < 200 else f"one-off {i}"
+        append_session_entry(mem, user, f"template {i % 3}", 0.1, "2025-01-06T00:00:00Z", 0)
+    save_memory(mem, path)
+
+    header, _ = read_memory_header(path)
+    strings = header["strings"]
+    assert isinstance(strings, HeaderStrings) and strings._items == []
+    lazy = load_memory_lazy(path)
+    assert lazy["sessions"][-1] == mem["sessions"][-1]
+    assert len(lazy["sessions"]._strings._items) < 10  # templates come first
+    assert list(lazy["sessions"]) == mem["sessions"]
+    assert len(strings) == 105 and strings[-1] == "again 99"
+
+    index_path = os.path.join(tmp, "memory.index.json")
+    SessionIndex().save(index_path)  # an old, empty index file
+    index = LazySidecar(SessionIndex.load, index_path)
+    index.on_append(lazy, lazy["sessions"][-1], [])
+    assert not index.loaded and index.sync(lazy) == 0
+    assert index.get(lazy).search(["again", "7"]) == [8, 108]
+    append_session_entry(lazy, "again 7", "r", 0.0, "2025-01-07T00:00:00Z", 0,
+                         listeners=(index,))
+    assert index.get(lazy).search(["again", "7"]) == [8, 108, 301]
+
+    merkle = LazySidecar(SessionMerkle.load, os.path.join(tmp, "memory.merkle.json"))
+    merkle.save(lazy)
+    assert SessionMerkle.load(merkle.path).stored_root == merkle.value.root()
+
+    print("on-use string table / sidecars OK\n")
+
+print("All lazy loading tests completed.")
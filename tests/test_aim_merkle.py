@@ -0,0 +1,170 @@
+"""
+Basic tests for the SSM-AIM Mini Merkle tree.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import append_session_entry
+from aim_core import show_merkle_verify
+from aim_merkle import (
+    SessionMerkle,
+    append_leaf,
+    build_levels,
+    diff_trees,
+    leaf_hash,
+    merkle_proof,
+    root_of,
+    verify_proof,
+)
+
+
+# -------------------------------------------
+# 1) Proofs for every leaf, odd and even sizes
+# -------------------------------------------
+
+print("Testing merkle proofs...\n")
+
+for n in (1, 2, 3, 7, 8, 33):
+    leaves = [leaf_hash({"user": f"m{i}"}) for i in range(n)]
+    levels = build_levels(leaves)
+    root = root_of(levels)
+    for i in range(n):
+        proof = merkle_proof(levels, i)
+        assert len(proof) <= n.bit_length()
+        assert verify_proof(leaves[i], proof, root)
+        assert not verify_proof(leaf_hash({"user": "other"}), proof, root)
+
+print("merkle proofs OK\n")
+
+
+# -------------------------------------------
+# 2) Tree diff descends only into changed subtrees
+# -------------------------------------------
+
+print("Testing diff_trees...\n")
+
+old = [leaf_hash({"user": f"m{i}"}) for i in range(21)]
+new = list(old)
+new[4] = leaf_hash({"user": "changed"})
+new[20] = leaf_hash({"user": "changed too"})
+
+assert diff_trees(build_levels(old), build_levels(old)) == []
+assert diff_trees(build_levels(old), build_levels(new)) == [4, 20]
+
+print("diff_trees OK\n")
+
+
+# -------------------------------------------
+# 3) Appending a leaf matches a full rebuild
+# -------------------------------------------
+
+print("Testing append_leaf...\n")
+
+levels = build_levels([])
+for n in range(1, 70):
+    append_leaf(levels, leaf_hash({"user": f"m{n}"}))
+    assert levels == build_levels(levels[0])
+
+print("append_leaf OK\n")
+
+
+# -------------------------------------------
+# 4) Session tree follows appends, pruning and reload
+# -------------------------------------------
+
+print("Testing SessionMerkle...\n")
+
+mem = {"sessions": [], "last_hash": ""}
+tree = SessionMerkle()
+for i in range(12):
+    append_session_entry(mem, f"turn {i}", "reply", 0.1, "T", 8)
+    tree.sync(mem)
+
+assert len(tree.leaves) == len(mem["sessions"]) == 8
+assert tree.base == 5
+assert tree.levels() == build_levels(tree.leaves)
+# Nothing saved yet: every proof uses the current root
+assert all(tree.prove_entry(mem, i) == (True, 3, False) for i in range(8))
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.merkle.json")
+    tree.save(path)
+    assert not os.path.exists(path + ".tmp")  # written aside, then swapped in
+    loaded = SessionMerkle.load(path)
+    assert loaded.root() == loaded.stored_root == tree.root()
+    assert loaded.sync(mem) == 0 and loaded.stored_intact()
+
+    # Later appends are proven against the current root, older
+    # entries against the root that was saved
+    for i in range(3):
+        append_session_entry(mem, f"more {i}", "reply", 0.1, "T", 8)
+        loaded.sync(mem)
+    assert loaded.levels() == build_levels(loaded.leaves)
+    assert loaded.root() != loaded.stored_root
+    assert [loaded.prove_entry(mem, i)[2] for i in range(8)] == [True] * 5 + [False] * 3
+    assert all(loaded.prove_entry(mem, i)[0] for i in range(8))
+
+    # A forged leaf no longer hashes to the stored root
+    with open(path, "r", encoding="utf-8") as fh:
+        raw = json.load(fh)
+    raw["leaves"][0] = leaf_hash({"user": "forged"})
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(raw, fh)
+    assert not SessionMerkle.load(path).stored_intact()
+
+tree = loaded
+mem["sessions"][3]["user"] = "edited"
+assert tree.prove_entry(mem, 3)[0] is False
+assert tree.diff_range(mem, 0, 7) == [3]
+assert tree.diff_range(mem, 4, 7) == []
+assert tree.diff_memory(mem) == [tree.base + 3]
+
+# Clearing memory resets the tree
+mem = {"sessions": [], "last_hash": ""}
+tree.sync(mem)
+assert tree.leaves == [] and tree.root() == ""
+
+print("SessionMerkle OK\n")
+
+
+# -------------------------------------------
+# 5) :verify entry / range take entry numbers (#seq)
+# -------------------------------------------
+
+print("Testing :verify entry / range...\n")
+
+
+def verify_output(memory, tree, *args):
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        show_merkle_verify(memory, tree, list(args))
+    return buf.getvalue()
+
+
+mem = {"sessions": [], "last_hash": ""}
+tree = SessionMerkle()
+for i in range(12):
+    append_session_entry(mem, f"turn {i}", "reply", 0.1, "T", 8)
+tree.sync(mem)  # live window is #5..#12
+
+assert "entry #5: OK" in verify_output(mem, tree, "entry", "5")
+assert "entry #12: OK" in verify_output(mem, tree, "entry", "#12")
+assert "not in memory.json (#5..#12)" in verify_output(mem, tree, "entry", "4")
+assert "usage" in verify_output(mem, tree, "entry", "x")
+
+mem["sessions"][2]["user"] = "edited"  # entry #7
+assert "entry #7: MISMATCH" in verify_output(mem, tree, "entry", "7")
+assert "changed entries #7\n" in verify_output(mem, tree, "range", "5..12")
+assert "not in memory.json (#5..#12)" in verify_output(mem, tree, "range", "1..6")
+assert "not in memory.json" in verify_output(mem, tree, "range", "1..4")
+assert "usage" in verify_output(mem, tree, "range", "9..8")
+assert "range #8..#12: OK" in verify_output(mem, tree, "range", "#8..#12")
+
+print(":verify entry / range OK\n")
+
+print("All merkle tests completed.")
@@ -0,0 +1,112 @@
+"""
+Basic tests for SSM-AIM Mini stage timing metrics.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import builtins
+import io
+import json
+import os
+import random
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_metrics import LatencyHistogram, Metrics
+import aim_core
+
+
+# -------------------------------------------
+# 1) Histogram percentiles stay within one bucket (10%)
+# -------------------------------------------
+
+print("Testing LatencyHistogram...\n")
+
+rng = random.Random(7)
+samples = [rng.lognormvariate(-9, 1.2) for _ in range(5000)]  # ~10 us .. ms
+hist = LatencyHistogram()
+for s in samples:
+    hist.record(s)
+
+ordered = sorted(samples)
+for q in (0.50, 0.95, 0.99):
+    exact = ordered[max(0, int(q * len(ordered) + 0.999999) - 1)]
+    approx = hist.percentile(q)
+    assert exact <= approx <= exact * 1.1 + 1e-12, (q, exact, approx)
+
+assert hist.count == 5000 and hist.max == max(samples)
+assert abs(hist.total - sum(samples)) < 1e-9
+assert LatencyHistogram().percentile(0.5) == 0.0
+
+print("LatencyHistogram OK\n")
+
+
+# -------------------------------------------
+# 2) Laps and the metrics file
+# -------------------------------------------
+
+print("Testing Metrics...\n")
+
+m = Metrics()
+lap = m.lap()
+sum(range(1000))
+lap("a")
+lap("b")
+lap("a")
+assert m.stages["a"].count == 2 and m.stages["b"].count == 1
+assert "p95" in m.format_table()
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "metrics.json")
+    m.save(path, {"extra": 1})
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["stages"]["a"]["count"] == 2 and data["extra"] == 1
+    assert "counters" not in data
+    assert set(data["stages"]["b"]) >= {"p50_us", "p95_us", "p99_us", "mean_us", "max_us"}
+
+m.reset()
+assert not m.stages and m.format_table().startswith("[stats]")
+
+print("Metrics OK\n")
+
+
+# -------------------------------------------
+# 3) Console records stages, writes metrics and profile
+# -------------------------------------------
+
+print("Testing console instrumentation...\n")
+
+cwd = os.getcwd()
+real_input = builtins.input
+with tempfile.TemporaryDirectory() as tmp:
+    os.chdir(tmp)
+    try:
+        lines = iter(["plan one", "idea two", ":stats"])
+
+        def fake_input(prompt=""):
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError
+
+        builtins.input = fake_input
+        aim_core.METRICS.reset()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            aim_core.main(["--metrics", "m.json", "--profile", "p.prof"])
+        text = out.getvalue()
+        assert "sanitize" in text and "p99" in text and "[profile]" in text
+
+        with open("m.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for stage in ("sanitize", "align", "reply", "persist", "verify", "emit", "turn", "write"):
+            assert stage in data["stages"], stage
+        assert data["stages"]["turn"]["count"] == 2
+        assert os.path.getsize("p.prof") > 0
+    finally:
+        builtins.input = real_input
+        os.chdir(cwd)
+
+print("console instrumentation OK\n")
+
+print("All metrics tests completed.")
@@ -0,0 +1,150 @@
+"""
+Basic tests for the SSM-AIM Mini turn pipeline.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+from contextlib import contextmanager
+
+from aim_utils import compute_alignment_simple, verify_chain
+from aim_metrics import Metrics
+from aim_core import generate_reply, new_pipeline
+from aim_pipeline import STAGE_NAMES, PassStage, Stage, Turn
+
+TEXTS = ["plan my week", "", "why is this hard?", "  \t ", "I feel tired",
+         "Let me describe the whole project in detail " * 6, "note", "ok?"]
+
+
+def strip_ts(memory):
+    return [{k: v for k, v in e.items() if k not in ("ts", "h")} for e in memory["sessions"]]
+
+
+# -------------------------------------------
+# 1) One turn at a time and whole batches agree
+# -------------------------------------------
+
+print("Testing single vs batch...\n")
+
+commits = {"single": [], "batch": []}
+single_mem = {"sessions": [], "last_hash": ""}
+batch_mem = {"sessions": [], "last_hash": ""}
+single = new_pipeline(single_mem, 5, commit=lambda ts: commits["single"].append(len(ts)),
+                      emit=lambda t: (t.turn, t.reply))
+batch = new_pipeline(batch_mem, 5, commit=lambda ts: commits["batch"].append(len(ts)),
+                     emit=lambda t: (t.turn, t.reply))
+assert [s.name for s in single.stages] == list(STAGE_NAMES)
+
+one_by_one = []
+for text in TEXTS * 3:
+    one_by_one += single.run([Turn(text)])
+together = batch.run([Turn(text) for text in TEXTS * 3])
+
+assert len(one_by_one) == len(together) == 18  # blank messages are dropped
+for a, b in zip(one_by_one, together):
+    assert (a.turn, a.text, a.align, a.reply, a.seq) == (b.turn, b.text, b.align, b.reply, b.seq)
+    assert a.align == compute_alignment_simple(a.text, a.turn)
+    assert a.reply == generate_reply(a.text, a.align) and a.out == (a.turn, a.reply)
+    assert len(a.hash) == 12 and a.entry["h"].startswith(a.hash)
+assert strip_ts(single_mem) == strip_ts(batch_mem) and len(single_mem["sessions"]) == 5
+assert verify_chain(single_mem) == -1 and verify_chain(batch_mem) == -1
+assert commits["single"] == [1] * 18 and commits["batch"] == [18]
+assert single.turn_index == batch.turn_index == 18
+
+print("single vs batch OK\n")
+
+# -------------------------------------------
+# 2) Partial runs and replaced stages
+# -------------------------------------------
+
+print("Testing partial runs / replaced stages...\n")
+
+memory = {"sessions": [], "last_hash": ""}
+pipe = new_pipeline(memory, 0)
+turns = pipe.run([Turn("  a schedule  ")], stop="sanitize")
+assert turns[0].text == "a schedule" and memory["sessions"] == []
+assert pipe.run([Turn("   ")], stop="sanitize") == []
+turns = pipe.run(turns, start="align", stop="reply")
+assert turns[0].turn == 1 and memory["sessions"] == [] and "plans" in turns[0].reply
+turns = pipe.run(turns, start="persist")
+assert turns[0].seq == 1 and memory["seq"] == 1 and turns[0].hash
+
+old = pipe.replace("verify", PassStage("verify"))
+assert old.name == "verify" and pipe.run([Turn("bulk")])[0].hash == ""
+
+
+class Shout(Stage):
+    name = "emit"
+
+    def process(self, turn, pipe):
+        turn.out = turn.reply.upper()
+        return turn
+
+
+pipe.replace("emit", Shout())
+assert pipe.run([Turn("idea")])[0].out.startswith("NICE")
+try:
+    pipe.stage("nope")
+except KeyError:
+    pass
+else:
+    raise AssertionError("unknown stage name accepted")
+
+pipe.reset({"sessions": [], "last_hash": ""})
+assert pipe.turn_index == 0 and pipe.run([Turn("again")])[0].seq == 1
+
+print("partial runs / replaced stages OK\n")
+
+# -------------------------------------------
+# 3) Guard: numbering after merged entries, released before the commit
+# -------------------------------------------
+
+print("Testing the guard...\n")
+
+events = []
+
+
+@contextmanager
+def guard():
+    events.append("enter")
+    try:
+        yield 2  # two entries merged from another writer
+    finally:
+        events.append("exit")
+
+
+memory = {"sessions": [], "last_hash": ""}
+guarded = new_pipeline(memory, 0, commit=lambda ts: events.append("commit"),
+                       emit=lambda t: events.append("emit"), guard=guard)
+turns = guarded.run([Turn("first"), Turn(""), Turn("second")])
+assert [t.turn for t in turns] == [3, 4]
+assert events == ["enter", "exit", "commit", "emit", "emit"]
+
+events.clear()
+assert guarded.run([Turn("   ")]) == [] and events == []  # dropped before align
+guarded.run([Turn("third")], stop="reply")
+assert events == ["enter", "exit"]
+
+print("guard OK\n")
+
+# -------------------------------------------
+# 4) Stage timings
+# -------------------------------------------
+
+print("Testing stage timings...\n")
+
+metrics = Metrics()
+memory = {"sessions": [], "last_hash": ""}
+timed = new_pipeline(memory, 0)
+timed.metrics = metrics
+timed.run([Turn("plan")])
+timed.run([Turn(t) for t in ("a", "b", "c")])
+stages = metrics.to_dict()["stages"]
+assert all(stages[name]["count"] == 2 for name in STAGE_NAMES), stages
+
+lap = metrics.lap()
+lap("lock")
+timed.run([Turn("plan")], lap=lap)
+assert metrics.to_dict()["stages"]["persist"]["count"] == 3
+
+print("stage timings OK\n")
+
+print("All pipeline tests completed.")
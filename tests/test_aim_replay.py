@@ -0,0 +1,153 @@
+"""
+Basic tests for the SSM-AIM Mini replay verifier.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import load_memory, save_memory
+from aim_core import new_pipeline
+from aim_pipeline import Turn
+from aim_archive import SessionArchive, archive_dir_for, iter_numbered_history
+from aim_replay import format_report, main, replay_file, replay_path_for
+
+TEXTS = ["I want to plan my week", "why is this hard?", "hello", "I feel stuck today",
+         "Let me think about the long road ahead and what it takes " * 3, "ok"]
+
+
+def grow(mem, start, n, max_sessions=0, listeners=()):
+    texts = [f"{TEXTS[i % len(TEXTS)]} {i}" for i in range(start, start + n)]
+    pipe = new_pipeline(mem, max_sessions, listeners)
+    pipe.reset(mem, start)
+    pipe.run([Turn(text) for text in texts], stop="persist")
+
+
+if __name__ == "__main__":  # worker processes re-import this module
+    with tempfile.TemporaryDirectory() as tmp:
+        # -------------------------------------------
+        # 1) A history written by the pipeline reproduces
+        # -------------------------------------------
+
+        print("Testing clean replay...\n")
+
+        path = os.path.join(tmp, "memory.json")
+        mem = {"sessions": [], "last_hash": ""}
+        grow(mem, 0, 300)
+        save_memory(mem, path)
+
+        single = replay_file(path, workers=1, chunk_size=64)
+        pooled = replay_file(path, workers=3, chunk_size=40)
+        for state in (single, pooled):
+            assert state["checked"] == 300 and (state["first"], state["done"]) == (1, 300)
+            assert state["by_kind"] == {} and state["ranges"] == []
+        assert "mismatches 0" in format_report(single)
+
+        print("clean replay OK\n")
+
+        # -------------------------------------------
+        # 2) Edited entries are reported
+        # -------------------------------------------
+
+        print("Testing mismatch report...\n")
+
+        bad = load_memory(path)
+        bad["sessions"][56]["ai"] = "something else"
+        bad["sessions"][57]["align"] = 0.5
+        bad["sessions"][119]["align"] = -0.25
+        bad_path = os.path.join(tmp, "bad.json")
+        save_memory(bad, bad_path)
+
+        state = replay_file(bad_path, workers=2, chunk_size=50)
+        assert state["by_kind"] == {"reply": 1, "align": 2}
+        assert state["ranges"] == [[57, 58], [120, 120]]
+        assert [e[0] for e in state["examples"]] == [57, 58, 120]
+        report = format_report(state)
+        assert "at 57..58, 120" in report and "#57 reply: stored something else" in report
+
+        with redirect_stdout(io.StringIO()):
+            assert main([bad_path, "--workers", "1", "--restart"]) == 1
+            assert main([path, "--workers", "1", "--restart"]) == 0
+
+        print("mismatch report OK\n")
+
+        # -------------------------------------------
+        # 3) Checkpoint / resume
+        # -------------------------------------------
+
+        print("Testing checkpoint / resume...\n")
+
+        ckpt = replay_path_for(path)
+        assert ckpt == os.path.join(tmp, "memory.replay.json")
+        first = replay_file(path, workers=1, chunk_size=64, checkpoint_path=ckpt)
+        assert first["done"] == 300 and os.path.exists(ckpt)
+
+        # New turns: only the tail is replayed, the totals carry over
+        grow(mem, 300, 40)
+        mem["sessions"][9]["ai"] = "edited before the checkpoint"
+        save_memory(mem, path)
+        resumed = replay_file(path, workers=1, chunk_size=64, checkpoint_path=ckpt)
+        assert resumed["checked"] == 340 and resumed["done"] == 340
+        assert resumed["by_kind"] == {}  # entry 10 was already checked
+
+        full = replay_file(path, workers=1, checkpoint_path=ckpt, resume=False)
+        assert full["checked"] == 340 and full["ranges"] == [[10, 10]]
+
+        # The checked entry itself changed: start over
+        mem["sessions"][339]["user"] = "rewritten"
+        save_memory(mem, path)
+        again = replay_file(path, workers=1, checkpoint_path=ckpt)
+        assert again["checked"] == 340 and again["ranges"] == [[10, 10], [340, 340]]
+
+        print("checkpoint / resume OK\n")
+
+        # -------------------------------------------
+        # 4) Archived history is replayed too
+        # -------------------------------------------
+
+        print("Testing replay across the archive...\n")
+
+        arch_path = os.path.join(tmp, "arch", "memory.json")
+        os.makedirs(os.path.dirname(arch_path))
+        archive = SessionArchive(archive_dir_for(arch_path), "gzip", segment_size=70)
+        small = {"sessions": [], "last_hash": ""}
+        grow(small, 0, 260, max_sessions=30, listeners=(archive,))
+        save_memory(small, arch_path)
+        assert len(archive.segments) == 3 and len(small["sessions"]) == 30
+
+        state = replay_file(arch_path, workers=2, chunk_size=25)
+        assert state["checked"] == 260 and state["by_kind"] == {}
+
+        print("replay across the archive OK\n")
+
+        # -------------------------------------------
+        # 5) Turns numbered from a small retained window
+        # -------------------------------------------
+
+        print("Testing replay with max_sessions=5...\n")
+
+        win_path = os.path.join(tmp, "win", "memory.json")
+        os.makedirs(os.path.dirname(win_path))
+        archive = SessionArchive(archive_dir_for(win_path), "gzip", segment_size=8)
+        window = {"sessions": [], "last_hash": ""}
+        pipe = new_pipeline(window, 5, listeners=(archive,))
+        for run in range(4):
+            # Each console start numbers turns from the 5 retained entries
+            pipe.reset(window)
+            for i in range(7):
+                pipe.run([Turn(f"{TEXTS[i % len(TEXTS)]} {run}")])
+        save_memory(window, win_path)
+        assert window["seq"] == 28 and len(window["sessions"]) == 5
+
+        stored = [e for _, e in iter_numbered_history(window, archive)]
+        assert [e.get("turn") for e in stored[7:14]] == [6, 7, 8, 9, 10, 11, 12]
+        assert all("turn" not in e for e in stored[:7])  # turn == seq
+
+        state = replay_file(win_path, workers=2, chunk_size=6)
+        assert state["checked"] == 28 and state["by_kind"] == {}, format_report(state)
+
+        print("replay with max_sessions=5 OK\n")
+
+    print("All replay tests completed.")
@@ -0,0 +1,282 @@
+"""
+Equivalence tests for the compiled reply rule engine.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from aim_core import MANIFEST, add_alignment_suffix, generate_reply, parse_args
+from aim_rules import (
+    BUILTIN_RULES,
+    BUILTIN_TEXTS,
+    DEFAULT_CACHE_FILE,
+    DEFAULT_TEXTS_FILE,
+    CompiledRules,
+    RuleError,
+    compile_texts,
+    find_rules_path,
+    load_manifest,
+    load_rules,
+)
+
+
+# -------------------------------------------
+# Reference: the if-chain generate_reply used before the rule table
+# -------------------------------------------
+
+def legacy_generate_reply(user_text, align_hint=None):
+    """The original if-chain, kept verbatim as the reference."""
+    text = (user_text or "").strip()
+
+    if not text:
+        base = "I did not receive any content. Try typing a question, idea, or plan."
+        return add_alignment_suffix(base, align_hint)
+
+    lower = text.lower()
+
+    # Very small patterns to keep behavior readable and deterministic
+
+    if "plan" in lower or "schedule" in lower:
+        base = (
+            "I hear you are thinking in terms of plans or schedules. "
+            "Try breaking it into 3 small steps you can start soon. "
+            "If you like, describe Step 1 and I will help you refine it."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    if "stress" in lower or "tired" in lower or "overwhelmed" in lower:
+        base = (
+            "It sounds like you may be under some stress. "
+            "One option is to list just one small thing you can do next, "
+            "not everything at once. I can help you think through that next step."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    if "idea" in lower or "project" in lower:
+        base = (
+            "Nice, you are in idea or project mode. "
+            "Try stating the core goal in one sentence. "
+            "From there, we can outline support, risks, and next moves."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    # Symbolic / math / formula thinking
+    if (
+        "math" in lower
+        or "symbolic" in lower
+        or "equation" in lower
+        or "formula" in lower
+    ):
+        base = (
+            "You are thinking in a symbolic or mathematical way. "
+            "It can help to name your key variables, write a simple equation, "
+            "and separate assumptions from results. I can mirror that structure "
+            "with you in plain text."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    # Curiosity about alignment lane or score
+    if "alignment" in lower or "lane" in lower or "score" in lower:
+        base = (
+            "You mentioned alignment or a lane. In this mini console, each message "
+            "gets a tiny lane value a in (-1,+1) as a posture hint, not a judgment. "
+            "You can type :lane to see a brief tutorial on how it is computed."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    # Journaling or notes
+    if "journal" in lower or "diary" in lower or "note" in lower:
+        base = (
+            "Treat this like a tiny journal if you wish. "
+            "You can write short notes about what happened, what you feel, "
+            "and one small thing you might try next. I will reflect it back "
+            "and keep a compact local memory for you."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    if text.endswith("?"):
+        base = (
+            "You asked a question. I cannot see the full world, but I can help you "
+            "think through it step by step. Try telling me what you already know, "
+            "and what is uncertain. We can separate facts, options, and next actions."
+        )
+        return add_alignment_suffix(base, align_hint)
+
+    # Default: reflective mirror with gentle nudge
+    base = (
+        "Thank you for sharing. I have recorded this in the mini memory. "
+        "If you want, you can now ask a question about it, or say :history "
+        "to see recent interactions."
+    )
+    return add_alignment_suffix(base, align_hint)
+
+
+# -------------------------------------------
+# 1) Shipped manifest matches the built-in table
+# -------------------------------------------
+
+print("Testing manifest/rules.json...\n")
+
+path = find_rules_path()
+assert path is not None
+with open(path, "r", encoding="utf-8") as f:
+    assert json.load(f) == BUILTIN_RULES
+assert load_rules().error == ""
+with open(find_rules_path(DEFAULT_TEXTS_FILE), "r", encoding="utf-8") as f:
+    assert compile_texts(json.load(f)) == BUILTIN_TEXTS
+
+print("manifest OK\n")
+
+
+# -------------------------------------------
+# 2) Same reply as the if-chain, including overlaps and priorities
+# -------------------------------------------
+
+print("Testing equivalence with the if-chain...\n")
+
+cases = [
+    "", "   ", "hello", "?", "what now?", "plan", "PLANET", "a schedule?",
+    "I am tired of this project", "journalignment", "notebook of math",
+    "scoreplan", "my diary idea", "lanes and notes?", "Formula 1 schedule",
+    "overwhelmed by symbolic stuff", "equation?", "idea?  ", "ünïcödé plan",
+    "İstanbul note", "no keywords here.",
+]
+
+words = [
+    "plan", "sched", "schedule", "stress", "tired", "overwhelmed", "idea",
+    "project", "math", "symbolic", "equation", "formula", "alignment",
+    "lane", "score", "journal", "diary", "note", "not", "align", "?", " ",
+    "x", "PLAN", "Note", "ideal", "scores",
+]
+rng = random.Random(42)
+for _ in range(5000):
+    cases.append("".join(rng.choice(words) for _ in range(rng.randint(0, 6))))
+
+for text in cases:
+    for hint in (None, -0.5, 0.0, 0.5):
+        assert generate_reply(text, hint) == legacy_generate_reply(text, hint), text
+
+print(f"{len(cases)} messages OK\n")
+
+
+# -------------------------------------------
+# 3) Priority is table order, not position in the message
+# -------------------------------------------
+
+print("Testing priority and validation...\n")
+
+table = {
+    "empty": "E",
+    "default": "D",
+    "rules": [
+        {"id": "long", "any": ["notebook"], "reply": "first"},
+        {"id": "q", "endswith": "?", "reply": "question"},
+        {"id": "short", "any": ["note", "zz"], "reply": "third"},
+    ],
+}
+rules = CompiledRules(table)
+assert rules.match("zz note") == ("short", "third")
+assert rules.match("zz notebook?") == ("long", "first")
+assert rules.match("zz note?") == ("q", "question")
+assert rules.match("nothing") == ("default", "D")
+assert rules.match("  ") == ("empty", "E")
+
+# Suffixes match case-insensitively, like keywords (the reply cache keys on lowercase)
+cased = CompiledRules(dict(table, rules=[{"id": "x", "endswith": "ok", "reply": "X"}]))
+assert cased.match("all OK") == cased.match("all ok") == ("x", "X")
+
+# Hundreds of rules still compile into one matcher
+many = dict(table, rules=[
+    {"id": f"r{i}", "any": [f"kw{i}x", f"alt{i}"], "reply": str(i)} for i in range(500)
+])
+big = CompiledRules(many)
+assert big.reply_for("text with kw499x and kw250x") == "250"
+# Substring semantics: "alt4" is inside "alt499"
+assert big.reply_for("alt499") == "4"
+
+for bad in (
+    {},
+    dict(table, rules=[{"id": "a", "reply": "r"}]),
+    dict(table, rules=[{"id": "a", "any": ["UPPER"], "reply": "r"}]),
+    dict(table, rules=[{"id": "a", "endswith": "OK", "reply": "r"}]),
+    dict(table, rules=[{"id": "a", "any": ["x"], "reply": "r"}] * 2),
+):
+    try:
+        CompiledRules(bad)
+    except RuleError:
+        pass
+    else:
+        raise AssertionError(f"accepted invalid table: {bad}")
+
+print("priority + validation OK\n")
+
+
+# -------------------------------------------
+# 4) Compiled manifest cache
+# -------------------------------------------
+
+print("Testing the compiled manifest cache...\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    rules_path = os.path.join(tmp, "rules.json")
+    texts_path = os.path.join(tmp, "texts.json")
+    cache_path = os.path.join(tmp, "manifest.cache.json")
+    shutil.copy(find_rules_path(), rules_path)
+    shutil.copy(find_rules_path(DEFAULT_TEXTS_FILE), texts_path)
+
+    def load(**kw):
+        return load_manifest(rules_path, texts_path, cache_path, **kw)
+
+    # Loading alone never writes the cache
+    assert not load().from_cache and not os.path.exists(cache_path)
+
+    start = time.perf_counter()
+    compiled = load(save=True)
+    compile_time = time.perf_counter() - start
+    assert not compiled.from_cache and compiled.error == "" and os.path.exists(cache_path)
+
+    start = time.perf_counter()
+    cached = load()
+    cache_time = time.perf_counter() - start
+    assert cached.from_cache and cached.key == compiled.key
+    assert cached.texts == compiled.texts == BUILTIN_TEXTS
+    assert "cache" in cached.describe()
+    for text in cases:
+        assert cached.rules.match(text) == compiled.rules.match(text), text
+
+    assert not load(rebuild=True).from_cache and load().from_cache
+
+    # Any change to a source changes the key
+    with open(texts_path, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+    texts["banner"] = ["", "custom banner"]
+    with open(texts_path, "w", encoding="utf-8") as f:
+        json.dump(texts, f)
+    changed = load(save=True)
+    assert not changed.from_cache and changed.texts["banner"] == "\ncustom banner"
+    assert load().from_cache and load().texts["banner"] == "\ncustom banner"
+
+    # A broken cache is recompiled; a broken manifest falls back and is not cached
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert not load(save=True).from_cache and load().from_cache
+    with open(rules_path, "w", encoding="utf-8") as f:
+        f.write('{"rules": 3}')
+    broken = load(save=True)
+    assert "rules.json" in broken.error and broken.rules.reply_for("plan") == generate_reply("plan")
+    assert not load().from_cache
+
+    assert parse_args(["--rebuild-manifest"]).rebuild_manifest
+    print(f"compile {compile_time * 1000:.2f} ms | from cache {cache_time * 1000:.2f} ms")
+
+# The default cache goes to the data directory, not next to the sources
+assert MANIFEST.cache_path == DEFAULT_CACHE_FILE
+
+print("compiled manifest cache OK\n")
+
+print("All rule tests completed.")
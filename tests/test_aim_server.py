@@ -0,0 +1,160 @@
+"""
+Basic tests for the SSM-AIM Mini asyncio server.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+from aim_utils import load_memory, verify_chain
+from aim_core import generate_reply
+from aim_lazy import LazySessions
+from aim_server import AimServer
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+
+    async def call(self, req) -> dict:
+        line = req if isinstance(req, bytes) else (json.dumps(req) + "\n").encode("utf-8")
+        self.writer.write(line)
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    def close(self):
+        self.writer.close()
+
+
+async def scenario(tmp: str, storage: str) -> None:
+    server = AimServer(tmp, {"storage": storage, "max_sessions": 50, "compact_every": 3})
+    listener = await server.start("127.0.0.1", 0)
+    host, port = listener.sockets[0].getsockname()[:2]
+
+    async def connect():
+        return Client(*await asyncio.open_connection(host, port))
+
+    # -------------------------------------------
+    # Many concurrent clients, separate memories
+    # -------------------------------------------
+
+    texts = ["plan for today", "tired again", "idea?", "note", "what now?"]
+
+    async def user(i):
+        c = await connect()
+        hello = await c.call({"op": "hello", "client": f"user{i}", "id": 1})
+        assert hello == {"ok": True, "client": f"user{i}", "entries": 0, "id": 1}
+        for t, text in enumerate(texts):
+            resp = await c.call({"op": "turn", "text": text})
+            assert resp["ok"] and resp["seq"] == t + 1
+            assert resp["reply"] == generate_reply(text, resp["align"])
+        await c.call({"op": "quit"})
+        c.close()
+
+    await asyncio.gather(*(user(i) for i in range(40)))
+
+    # -------------------------------------------
+    # Two connections of one client share its memory
+    # -------------------------------------------
+
+    a, b = await connect(), await connect()
+    await a.call({"op": "hello", "client": "shared"})
+    await b.call({"op": "hello", "client": "shared"})
+    r1 = await a.call({"op": "turn", "text": "one"})
+    r2 = await b.call({"op": "turn", "text": "two"})
+    assert (r1["seq"], r2["seq"]) == (1, 2)
+    hist = await a.call({"op": "history", "n": 5})
+    assert [e["user"] for e in hist["entries"]] == ["one", "two"]
+    ver = await b.call({"op": "verify"})
+    assert ver["ok"] and ver["matches"]
+
+    # Errors do not drop the connection
+    assert not (await a.call(b"{not json\n"))["ok"]
+    assert not (await a.call({"op": "nope"}))["ok"]
+    assert not (await a.call({"op": "hello", "client": "../etc"}))["ok"]
+    assert not (await a.call({"op": "turn", "text": "   "}))["ok"]
+    stats = await a.call({"op": "stats"})
+    assert stats["stages"]["turn"]["count"] >= 202
+    a.close()
+    b.close()
+
+    # Anonymous connection gets its own memory
+    c = await connect()
+    assert (await c.call({"op": "turn", "text": "hi"}))["seq"] == 1
+    c.close()
+
+    await server.close()
+
+    for i in range(40):
+        mem = load_memory(os.path.join(tmp, f"user{i}", "memory.json"))
+        assert [e["user"] for e in mem["sessions"]] == texts
+        assert verify_chain(mem) == -1
+    assert len(load_memory(os.path.join(tmp, "shared", "memory.json"))["sessions"]) == 2
+
+
+async def unix_scenario(tmp: str) -> None:
+    server = AimServer(tmp, {"storage": "json"})
+    path = os.path.join(tmp, "aim.sock")
+    await server.start(unix_path=path)
+    c = Client(*await asyncio.open_unix_connection(path))
+    await c.call({"op": "hello", "client": "sock"})
+    assert (await c.call({"op": "turn", "text": "plan"}))["ok"]
+    c.close()
+    await server.close()
+    assert len(load_memory(os.path.join(tmp, "sock", "memory.json"))["sessions"]) == 1
+
+
+async def reload_scenario(tmp: str) -> None:
+    server = AimServer(tmp, {"storage": "journal", "max_sessions": 5, "compact_every": 100})
+    session = await server.acquire("again")
+    for i in range(8):
+        assert (await server.handle_turn(session, f"turn {i}"))["seq"] == i + 1
+    await server.release(session)
+    # A reloaded client is held in memory, so appends on the loop never read the file
+    session = await server.acquire("again")
+    assert not isinstance(session.memory["sessions"], LazySessions)
+    assert (await server.handle_turn(session, "after reload"))["seq"] == 9
+    assert verify_chain(session.memory) == -1
+    await server.release(session)
+
+    # A memory that cannot be loaded gets an error reply and is not kept
+    blocker = os.path.join(tmp, "broken")
+    with open(blocker, "w", encoding="utf-8") as f:
+        f.write("not a directory")
+    state = {"session": None}
+    resp = await server.dispatch(state, {"op": "hello", "client": "broken"})
+    assert not resp["ok"] and "broken" in resp["error"]
+    assert "broken" not in server.sessions and state["session"] is None
+    os.remove(blocker)
+    assert (await server.dispatch(state, {"op": "hello", "client": "broken"}))["ok"]
+    assert (await server.dispatch(state, {"op": "turn", "text": "works now"}))["seq"] == 1
+    await server.release(state["session"])
+    await server.close()
+
+
+for storage in ("json", "journal"):
+    print(f"Testing server ({storage} storage)...\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(tmp, storage))
+    print(f"server ({storage}) OK\n")
+
+if hasattr(asyncio, "open_unix_connection") and os.name != "nt":
+    print("Testing Unix socket...\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(unix_scenario(tmp))
+    print("Unix socket OK\n")
+
+print("Testing reload and storage modes...\n")
+with tempfile.TemporaryDirectory() as tmp:
+    asyncio.run(reload_scenario(tmp))
+try:
+    AimServer(tmp, {"storage": "shared"})
+except ValueError:
+    pass
+else:
+    raise AssertionError("shared storage must be refused")
+print("reload and storage modes OK\n")
+
+print("All server tests completed.")
@@ -0,0 +1,150 @@
+"""
+Basic tests for the SSM-AIM Mini shared storage mode.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aim_utils import (
+    append_session_entry,
+    journal_path_for,
+    load_config,
+    load_memory,
+    session_seq_range,
+    verify_chain,
+)
+from aim_archive import SessionArchive, iter_numbered_history
+from aim_core import run_batch
+from aim_shared import SharedJournal, lock_path_for, open_shared, shared_available
+
+WRITERS = 4
+PER_WRITER = 150
+
+
+def say(shared, mem, text, max_sessions=0):
+    """One turn the way the console does it: merge, then append under the lock."""
+    with shared.locked(mem, max_sessions) as merged:
+        append_session_entry(mem, text, "ok", 0.1, "2025-01-01T00:00:00Z",
+                             max_sessions, listeners=(shared,))
+    return merged
+
+
+def batch_writer(task):
+    """Worker process: run one batch job in the shared directory."""
+    directory, name = task
+    os.chdir(directory)
+    cfg = load_config()
+    source = io.StringIO("".join(f"{name} msg {i}\n" for i in range(PER_WRITER)))
+    return run_batch(source, io.StringIO(), batch_size=10, cfg=cfg)
+
+
+if __name__ == "__main__":  # worker processes re-import this module
+    if not shared_available():
+        print("fcntl is not available here; skipping shared storage tests.")
+        raise SystemExit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # -------------------------------------------
+        # 1) Two writers interleave into one chain
+        # -------------------------------------------
+
+        print("Testing interleaved writers...\n")
+
+        path = os.path.join(tmp, "memory.json")
+        journal = journal_path_for(path)
+        assert lock_path_for(path) == os.path.join(tmp, "memory.lock")
+        a, b = SharedJournal(path), SharedJournal(path)
+        mem_a, mem_b = load_memory(path, journal), load_memory(path, journal)
+
+        for i in range(10):
+            assert say(a, mem_a, f"a {i}") == (1 if i else 0)
+            assert say(b, mem_b, f"b {i}") == 1
+        assert session_seq_range(mem_a) == (1, 19) and session_seq_range(mem_b) == (1, 20)
+        assert verify_chain(mem_b) == -1
+
+        on_disk = load_memory(path, journal)
+        assert list(on_disk["sessions"]) == list(mem_b["sessions"])
+        assert [e["user"] for e in on_disk["sessions"]][:4] == ["a 0", "b 0", "a 1", "b 1"]
+        assert (a.appended, b.appended, b.merged) == (10, 10, 10)
+
+        print("interleaved writers OK\n")
+
+        # -------------------------------------------
+        # 2) Compaction rotates the journal for everyone
+        # -------------------------------------------
+
+        print("Testing compaction / rotation...\n")
+
+        assert say(a, mem_a, "a 10") == 1
+        assert a.compact(mem_a) is True
+        assert os.path.getsize(journal) == 0
+        with open(lock_path_for(path), "rb") as f:
+            assert int(f.read()) == 1  # rotation counter
+
+        # b's view of the journal is stale; the missed turn comes from memory.json
+        assert say(b, mem_b, "b 10") == 1
+        assert session_seq_range(mem_b)[1] == 22 and verify_chain(mem_b) == -1
+
+        # A snapshot older than the stored one is dropped
+        assert SharedJournal(path).compact(load_memory(path)) is False
+        assert load_memory(path, journal)["seq"] == 22
+
+        print("compaction / rotation OK\n")
+
+        # -------------------------------------------
+        # 3) A writer far behind reloads
+        # -------------------------------------------
+
+        print("Testing reload when far behind...\n")
+
+        for i in range(40):
+            say(a, mem_a, f"a burst {i}", max_sessions=10)
+        a.compact(mem_a)
+        assert len(load_memory(path)["sessions"]) == 10
+
+        assert say(b, mem_b, "b back", max_sessions=10) > 10
+        assert b.reloads == 1 and session_seq_range(mem_b) == (54, 63)
+        assert verify_chain(mem_b) == -1
+        assert "reloads 1" in b.describe() and "lock wait" in b.describe()
+
+        assert open_shared({"storage": "journal"}, path) is None
+        assert open_shared({"storage": "shared", "fsync": "turn"}, path).fsync is True
+        for s in (a, b):
+            s.close()
+
+        print("reload when far behind OK\n")
+
+    # -------------------------------------------
+    # 4) Several processes, no lost turns
+    # -------------------------------------------
+
+    print("Testing concurrent batch writers...\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "config.json"), "w", encoding="utf-8") as f:
+            f.write('{"storage": "shared", "max_sessions": 20, "archive": "gzip", "archive_segment_size": 50}')
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=WRITERS) as pool:
+            tasks = [(tmp, f"w{k}") for k in range(WRITERS)]
+            counts = list(pool.map(batch_writer, tasks))
+        elapsed = time.perf_counter() - start
+        total = WRITERS * PER_WRITER
+        assert counts == [PER_WRITER] * WRITERS
+
+        path = os.path.join(tmp, "memory.json")
+        mem = load_memory(path, journal_path_for(path))
+        archive = SessionArchive.load(os.path.join(tmp, "memory.archive"))
+        rows = list(iter_numbered_history(mem, archive))
+        assert mem["seq"] == total and [s for s, _ in rows] == list(range(1, total + 1))
+        assert len({e["user"] for _, e in rows}) == total
+        assert verify_chain(mem) == -1 and archive.verify(mem) == []
+
+        print(f"{WRITERS} writers x {PER_WRITER} messages: {total / elapsed:.0f} msg/s")
+        print("concurrent batch writers OK\n")
+
+    print("All shared storage tests completed.")
@@ -0,0 +1,119 @@
+"""
+Basic tests for the SSM-AIM Mini columnar session store.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+
+from aim_utils import (
+    append_session_entry,
+    ensure_chain,
+    load_memory,
+    save_memory,
+    verify_chain,
+)
+from aim_core import export_history, show_history
+from aim_store import SessionEntry, SessionStore, pack_ts, unpack_ts
+
+
+def build(sessions, n, max_sessions):
+    mem = {"sessions": sessions, "last_hash": ""}
+    for i in range(n):
+        append_session_entry(mem, f"msg {i}", f"reply {i % 3}", (i % 21 - 10) / 10.0,
+                             f"2025-03-{1 + i % 28:02d}T12:{i % 60:02d}:05Z", max_sessions)
+    return mem
+
+
+# -------------------------------------------
+# 1) Same history as the list of dicts
+# -------------------------------------------
+
+print("Testing SessionStore against a list...\n")
+
+assert unpack_ts(pack_ts("2025-01-31T23:59:59Z")) == "2025-01-31T23:59:59Z"
+assert pack_ts("2025-01-31T23:59:59+00:00") is None and pack_ts("2025-02-30T00:00:00Z") is None
+
+plain = build([], 300, 40)
+store = build(SessionStore(capacity=40), 300, 40)
+assert isinstance(store["sessions"], SessionStore)
+assert len(store["sessions"]) == 40 and store["sessions"]._size == 41  # never grew
+assert store["sessions"] == plain["sessions"] and plain["sessions"] == store["sessions"]
+assert store["chain_base"] == plain["chain_base"] and store["seq"] == 300
+assert verify_chain(store) == -1
+
+entry = store["sessions"][-1]
+assert isinstance(entry, SessionEntry) and entry == plain["sessions"][-1]
+assert entry["ai"] == "reply 2" and entry.get("mood") is None and "h" in entry
+assert dict(entry) == plain["sessions"][-1] and sorted(entry) == sorted(plain["sessions"][-1])
+assert store["sessions"][-5:] == plain["sessions"][-5:]
+assert type(store["sessions"][-5:][0]) is dict
+
+# Unbounded store grows; pruning returns detached dicts
+grow = SessionStore(plain["sessions"])
+dropped = grow.trim_front(3)
+assert dropped == plain["sessions"][:3] and type(dropped[0]) is dict
+grow.extend(plain["sessions"][:50])
+assert list(grow) == plain["sessions"][3:] + plain["sessions"][:50]
+
+print("SessionStore OK\n")
+
+# -------------------------------------------
+# 2) Entries that do not fit the columns
+# -------------------------------------------
+
+print("Testing odd entries...\n")
+
+odd = [
+    {"ts": "yesterday", "user": "u", "ai": "a", "align": 0.1},
+    {"ts": "2025-01-01T00:00:00Z", "user": "u", "ai": "a", "align": 1},
+    {"ts": "2025-01-01T00:00:00Z", "user": "u", "ai": "a", "align": 0.5, "mood": "calm"},
+]
+mixed = {"sessions": SessionStore(odd), "last_hash": ""}
+assert list(mixed["sessions"]) == odd
+assert ensure_chain(mixed) == 3 and verify_chain(mixed) == -1
+
+# Writing through a view keeps the column layout when it can
+mem = build(SessionStore(), 5, 0)
+mem["sessions"][2]["user"] = "edited"
+assert mem["sessions"][2]["user"] == "edited" and verify_chain(mem) == 2
+mem["sessions"][2]["extra"] = 1
+assert mem["sessions"][2] == dict(mem["sessions"][2]) and "extra" in mem["sessions"][2]
+
+print("odd entries OK\n")
+
+# -------------------------------------------
+# 3) load_memory, history and export
+# -------------------------------------------
+
+print("Testing load / history / export...\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.json")
+    save_memory(plain, path)
+    loaded = load_memory(path, max_sessions=40)
+    assert isinstance(loaded["sessions"], SessionStore) and loaded["sessions"].capacity == 40
+    assert loaded["sessions"] == plain["sessions"]
+
+    append_session_entry(loaded, "one more", "ok", 0.2, "2025-04-01T00:00:00Z", 40)
+    assert len(loaded["sessions"]) == 40 and verify_chain(loaded) == -1
+
+    with redirect_stdout(io.StringIO()) as out:
+        show_history(loaded, 3)
+        export_path = os.path.join(tmp, "export.md")
+        export_history(loaded, export_path)
+    assert "one more" in out.getvalue()
+    with open(export_path, "r", encoding="utf-8") as f:
+        assert f.read().count("- Time:") == 40
+
+    save_memory(loaded, path)
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["count"] == 40
+    assert load_memory(path)["sessions"] == loaded["sessions"]
+
+print("load / history / export OK\n")
+
+print("All session store tests completed.")
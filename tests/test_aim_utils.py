@@ -3,6 +3,13 @@ Basic tests for SSM-AIM Mini utilities.
 This file is intentionally tiny and runs without any external deps.
 """
 
+import os
+import random
+import sys
+import tempfile
+import time
+import unicodedata
+
 from aim_utils import (
     compute_alignment_simple,
     format_align,
@@ -11,6 +18,17 @@ from aim_utils import (
     file_sha256_full,
     load_config,
     detect_hash_change,
+    load_memory,
+    compact_memory,
+    journal_path_for,
+    append_session_entry,
+    chain_head,
+    ensure_chain,
+    verify_chain,
+    compute_alignment_batch,
+    check_memory_file,
+    save_verify_record,
+    verify_path_for,
 )
 
 
@@ -107,4 +125,184 @@ assert warn2 == ""
 
 print("detect_hash_change OK\n")
 
+
+# -------------------------------------------
+# 6) Test journal storage
+# -------------------------------------------
+
+print("Testing journal append + compaction...\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    mem_path = os.path.join(tmp, "memory.json")
+    jpath = journal_path_for(mem_path)
+
+    mem = load_memory(mem_path, journal_path=jpath)
+    for i in range(5):
+        append_session_entry(mem, f"msg {i}", "ok", 0.1, "T", 3, journal_path=jpath)
+
+    # Nothing rewritten yet: only the journal exists
+    assert not os.path.exists(mem_path)
+    reloaded = load_memory(mem_path, journal_path=jpath, max_sessions=3)
+    assert [e["user"] for e in reloaded["sessions"]] == ["msg 2", "msg 3", "msg 4"]
+
+    compact_memory(mem, mem_path, jpath)
+    assert os.path.getsize(jpath) == 0
+    append_session_entry(mem, "msg 5", "ok", 0.1, "T", 3, journal_path=jpath)
+
+    reloaded = load_memory(mem_path, journal_path=jpath, max_sessions=3)
+    assert [e["user"] for e in reloaded["sessions"]] == ["msg 3", "msg 4", "msg 5"]
+    assert reloaded["seq"] == 6
+
+    # Stale journal lines (crash before truncation) are not replayed twice
+    compact_memory(mem, mem_path, None)
+    reloaded = load_memory(mem_path, journal_path=jpath, max_sessions=3)
+    assert [e["user"] for e in reloaded["sessions"]] == ["msg 3", "msg 4", "msg 5"]
+
+print("journal storage OK\n")
+
+
+# -------------------------------------------
+# 7) Test hash chain
+# -------------------------------------------
+
+print("Testing hash chain...\n")
+
+mem = {"sessions": [], "last_hash": ""}
+for i in range(6):
+    append_session_entry(mem, f"turn {i}", "reply", 0.2, "T", 4)
+
+assert len(mem["sessions"]) == 4
+assert chain_head(mem) == mem["last_hash"] == mem["sessions"][-1]["h"]
+assert verify_chain(mem) == -1  # pruned chain still verifies from chain_base
+
+mem["sessions"][1]["user"] = "edited"
+assert verify_chain(mem) == 1
+mem["sessions"][1]["user"] = "turn 3"
+assert verify_chain(mem) == -1
+
+mem["sessions"][-1]["ai"] = "edited"
+assert detect_hash_change(mem, chain_head(mem)) != ""
+
+# Older memory files without per-entry hashes are linked once
+legacy = {"sessions": [{"ts": "T", "user": "u", "ai": "a", "align": 0.1}], "last_hash": "abcd"}
+assert chain_head(legacy) == "abcd"
+assert ensure_chain(legacy) == 1
+assert verify_chain(legacy) == -1
+
+print("hash chain OK\n")
+
+
+# -------------------------------------------
+# 8) Test batched alignment lane
+# -------------------------------------------
+
+print("Testing compute_alignment_batch...\n")
+
+texts = [t for t, _ in tests] + ["", "  ?  ", "x" * 900, "why?"] * 3
+expected = [compute_alignment_simple(t, 7 + k) for k, t in enumerate(texts)]
+
+lanes = compute_alignment_batch(texts, start_turn=7, use_numpy=False)
+assert list(lanes) == expected  # same operations, same bits
+assert "numpy" not in sys.modules  # only imported when the NumPy path runs
+
+lanes_np = compute_alignment_batch(texts, start_turn=7, use_numpy=True)
+assert all(abs(a - b) <= 1e-12 for a, b in zip(lanes_np, expected))
+assert len(compute_alignment_batch([], 1)) == 0
+
+print("compute_alignment_batch OK\n")
+
+
+# -------------------------------------------
+# 9) sanitize_text fast paths match the original
+# -------------------------------------------
+
+print("Testing sanitize_text equivalence...\n")
+
+
+def reference_sanitize(text):
+    """The original character-by-character sanitize_text."""
+    t = unicodedata.normalize("NFC", text)
+    cleaned = []
+    for ch in t:
+        if ch.isprintable() or ch in ("\n", "\t", " "):
+            cleaned.append(ch)
+    return "".join(cleaned)[:4000]
+
+
+pieces = [
+    "a", "e", "?", " ", "\n", "\t", "\r", "\x00", "\x07", "\x7f", "\x85",
+    "\u00ad", "\u200b", "\ufeff", "\u2028", "\u0301", "\u0327", "\u0344",
+    "\u1100", "\u1161", "\u11a8", "\uac00", "\u0915\u093c", "\u0b47\u0b3e",
+    "\u4e00", "\uf900", "\U0001f600", "\ue000", "\u0378",
+]
+rng = random.Random(7)
+samples = ["", "plain ascii", "tab\tand\nnewline", "x" * 5000, "\x00" * 9000 + "y" * 5000]
+for _ in range(300):
+    n = rng.choice([10, 300, 3990, 4000, 4070, 9000])
+    samples.append("".join(rng.choice(pieces) for _ in range(n)))
+for _ in range(50):
+    samples.append("".join(chr(rng.randrange(0, 0x30000)) for _ in range(4100)))
+
+for sample in samples:
+    assert sanitize_text(sample) == reference_sanitize(sample)
+assert sanitize_text(12345) == "12345"
+
+# Multi-MB walls with no normalization-safe cut point are cut hard
+# near the limit instead of normalizing everything (a run of combining
+# marks is quadratic to reorder in full)
+walls = {
+    "thai": "\u0e01\u0e32\u0e23" * 1_000_000,
+    "emoji": "\U0001f600\u200d" * 1_500_000,
+    "marks": "a" + "\u0316\u0301" * 1_000_000,
+}
+for name, wall in walls.items():
+    began = time.perf_counter()
+    out = sanitize_text(wall)
+    assert time.perf_counter() - began < 2.0, name
+    assert len(out) == 4000
+    if name != "marks":
+        assert out == reference_sanitize(wall[:8000])
+
+print(f"sanitize_text equivalence OK ({len(samples)} samples, {len(walls)} walls)\n")
+
+
+# -------------------------------------------
+# 10) Verification record: stat fast path
+# -------------------------------------------
+
+print("Testing check_memory_file / save_verify_record...\n")
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.json")
+    record = verify_path_for(path)
+    assert check_memory_file(path, record) == ("missing", "")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"sessions": []}')
+    digest = file_sha256_full(path)
+    assert check_memory_file(path, record) == ("hashed", digest)
+
+    assert save_verify_record(path, record) == digest
+    assert check_memory_file(path, record) == ("cached", digest)
+    assert check_memory_file(path, record, force=True) == ("hashed", digest)
+
+    # The record is trusted while the stat matches, so a forged record is
+    # only caught by forcing a full check
+    with open(record, "r", encoding="utf-8") as f:
+        forged = f.read().replace(digest, "0" * 64)
+    with open(record, "w", encoding="utf-8") as f:
+        f.write(forged)
+    assert check_memory_file(path, record) == ("cached", "0" * 64)
+    assert check_memory_file(path, record, force=True) == ("changed", digest)
+    assert save_verify_record(path, record, digest) == digest
+    assert check_memory_file(path, record) == ("cached", digest)
+
+    # Edited outside the console: new stat, new digest
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(" ")
+    status, new_digest = check_memory_file(path, record)
+    assert status == "changed" and new_digest == file_sha256_full(path) != digest
+
+print("verification record OK\n")
+
 print("All tests completed.")
@@ -0,0 +1,169 @@
+"""
+Basic tests for the SSM-AIM Mini background writer.
+Runs without any external deps (PYTHONPATH=core).
+"""
+
+import builtins
+import io
+import json
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from aim_utils import append_session_entry, load_memory, save_memory, verify_chain
+from aim_writer import MemoryWriter, fsync_interval
+import aim_core
+
+
+def add_turns(memory, writer, n, start=0):
+    for i in range(start, start + n):
+        with writer.lock:
+            append_session_entry(memory, f"msg {i}", f"reply {i}", 0.1, "2025-01-01T00:00:00Z",
+                                 0, listeners=(writer,))
+
+
+# -------------------------------------------
+# 1) fsync policy values
+# -------------------------------------------
+
+print("Testing fsync_interval...\n")
+
+assert fsync_interval("turn") == 0.0
+assert fsync_interval("exit") is None
+assert fsync_interval(250) == 0.25
+assert fsync_interval("bad") is None
+
+print("fsync_interval OK\n")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "memory.json")
+    jpath = os.path.join(tmp, "memory.journal.jsonl")
+
+    # -------------------------------------------
+    # 2) Inline and background writers produce the same files
+    # -------------------------------------------
+
+    print("Testing inline vs background writer...\n")
+
+    for background in (False, True):
+        for p in (path, jpath):
+            if os.path.exists(p):
+                os.remove(p)
+        memory = {"sessions": [], "last_hash": ""}
+        writer = MemoryWriter(path, jpath, fsync="turn", background=background)
+        saved = []
+        add_turns(memory, writer, 30)
+        writer.snapshot(memory, after=[lambda: saved.append(1)])
+        add_turns(memory, writer, 5, start=30)
+        writer.close()
+
+        reloaded = load_memory(path, journal_path=jpath)
+        assert reloaded["sessions"] == memory["sessions"], background
+        assert reloaded["last_hash"] == memory["last_hash"]
+        assert verify_chain(reloaded) == -1
+        assert saved == [1]
+        assert writer.lines_written == 35
+        print(writer.describe())
+
+    print("\ninline vs background OK\n")
+
+    # -------------------------------------------
+    # 3) Group commit: queued requests are merged
+    # -------------------------------------------
+
+    print("Testing group commit...\n")
+
+    os.remove(jpath)
+    memory = {"sessions": [], "last_hash": ""}
+    writer = MemoryWriter(path, jpath, fsync="exit")
+    with writer.lock:
+        # The writer cannot take a snapshot while we hold the lock,
+        # so everything below piles up behind the first commit
+        add_turns(memory, writer, 200)
+        for _ in range(50):
+            writer.snapshot(memory)
+    writer.flush()
+    assert writer.snapshots <= 2 and writer.commits < 250
+    assert load_memory(path, journal_path=jpath)["sessions"] == memory["sessions"]
+    writer.close()
+    try:
+        writer.snapshot(memory)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("closed writer accepted a request")
+
+    print("group commit OK\n")
+
+    # -------------------------------------------
+    # 4) Timed fsync runs without further requests
+    # -------------------------------------------
+
+    print("Testing timed fsync...\n")
+
+    writer = MemoryWriter(path, jpath, fsync=20)
+    add_turns(memory, writer, 3, start=200)
+    writer.flush()
+    deadline = time.monotonic() + 2.0
+    while writer._unsynced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not writer._unsynced
+    writer.close()
+
+    print("timed fsync OK\n")
+
+    # -------------------------------------------
+    # 5) A failed snapshot leaves the previous file intact
+    # -------------------------------------------
+
+    print("Testing atomic snapshot...\n")
+
+    good = {"sessions": memory["sessions"][:3], "last_hash": "x"}
+    save_memory(good, path)
+    with open(path, "rb") as f:
+        before = f.read()
+    bad = {"sessions": good["sessions"] + [{"ts": object()}], "last_hash": "y"}
+    save_memory(bad, path)
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert not os.path.exists(path + ".tmp")
+
+    print("atomic snapshot OK\n")
+
+    # -------------------------------------------
+    # 6) Console flushes background writes on EOF
+    # -------------------------------------------
+
+    print("Testing console exit flush...\n")
+
+    cwd = os.getcwd()
+    console = os.path.join(tmp, "console")
+    os.mkdir(console)
+    os.chdir(console)
+    real_input = builtins.input
+    try:
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"storage": "journal", "background_writes": True, "max_sessions": 100}, f)
+        lines = iter(["plan one", "idea two", "note three"])
+
+        def fake_input(prompt=""):
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError
+
+        builtins.input = fake_input
+        with redirect_stdout(io.StringIO()):
+            aim_core.main([])
+        stored = load_memory("memory.json")
+        assert [e["user"] for e in stored["sessions"]] == ["plan one", "idea two", "note three"]
+        assert os.path.getsize("memory.journal.jsonl") == 0
+    finally:
+        builtins.input = real_input
+        os.chdir(cwd)
+
+    print("console exit flush OK\n")
+
+print("All writer tests completed.")